@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Capture the wallet page's JSON API responses and extract PnL from them.
+The wallet page is a Next.js app that loads its figures as JSON before
+rendering them. A hook wrapping fetch() and XMLHttpRequest records the JSON
+bodies of wallet API calls. In Chrome the hook is installed through CDP before
+any page script runs. Elsewhere the API URLs are taken from Resource Timing
+and fetched again from inside the page, with the page's cookies. The numbers
+are then read structurally from the decoded payloads, by field name, instead
+of by running regex heuristics over the serialized DOM. The HTML heuristics
+stay the fallback.
+
+Captured responses can be saved as JSONL and replayed, either offline
+(``python api_capture.py recorded.jsonl``, HAR files work too) or through
+``stub_server.py --api DIR``, which serves them behind a client-rendered page.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from gmgn_scrape import HEADLINE_METRICS, _realized_pnl_fields, best_field, build_result, format_money
+
+
+# Wallet data requests, as matched by READY_PROBE_SCRIPT in gmgn_scrape.py
+API_URL_PATTERN = r"/(api|defi)/.*(wallet|smartmoney)"
+
+# Bodies kept per page; a wallet page makes a handful of API calls
+MAX_CAPTURED = 50
+MAX_BODY_CHARS = 2_000_000
+
+# Wraps fetch() and XMLHttpRequest so matching JSON bodies land in window.__gmgnCapture
+CAPTURE_HOOK_SCRIPT = """
+(function () {
+    if (window.__gmgnCapture) { return; }
+    var pattern = new RegExp(%(pattern)s, 'i');
+    var store = window.__gmgnCapture = [];
+    function keep(url, status, text) {
+        if (store.length < %(max_captured)d && typeof text === 'string' && text.length < %(max_body)d) {
+            store.push({url: String(url), status: status, body: text});
+        }
+    }
+    var originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (input) {
+            var url = (input && input.url) || String(input);
+            return originalFetch.apply(this, arguments).then(function (response) {
+                if (pattern.test(url)) {
+                    response.clone().text().then(function (text) { keep(response.url || url, response.status, text); }, function () {});
+                }
+                return response;
+            });
+        };
+    }
+    var open = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__gmgnUrl = String(url);
+        return open.apply(this, arguments);
+    };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this;
+        if (pattern.test(xhr.__gmgnUrl || '')) {
+            xhr.addEventListener('load', function () {
+                try {
+                    var text = (xhr.responseType === '' || xhr.responseType === 'text') ? xhr.responseText : JSON.stringify(xhr.response);
+                    keep(xhr.responseURL || xhr.__gmgnUrl, xhr.status, text);
+                } catch (e) {}
+            });
+        }
+        return send.apply(this, arguments);
+    };
+})();
+""" % {"pattern": json.dumps(API_URL_PATTERN), "max_captured": MAX_CAPTURED, "max_body": MAX_BODY_CHARS}
+
+# execute_async_script body: hooked responses if the hook ran from the start,
+# else re-fetch the API calls Resource Timing saw (same origin, page cookies)
+COLLECT_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var pattern = new RegExp(arguments[0], 'i');
+var captured = window.__gmgnCapture;
+if (captured && captured.length) { done({source: 'hook', responses: captured.slice()}); return; }
+var urls = [];
+performance.getEntriesByType('resource').forEach(function (e) {
+    if ((e.initiatorType === 'fetch' || e.initiatorType === 'xmlhttprequest') && pattern.test(e.name) && urls.indexOf(e.name) < 0) {
+        urls.push(e.name);
+    }
+});
+if (!urls.length) { done({source: 'none', responses: []}); return; }
+Promise.all(urls.slice(0, 10).map(function (url) {
+    return fetch(url, {credentials: 'include', cache: 'force-cache'}).then(function (response) {
+        return response.text().then(function (text) { return {url: url, status: response.status, body: text}; });
+    }, function (err) { return {url: url, status: 0, body: null, error: String(err)}; });
+})).then(function (responses) { done({source: 'refetch', responses: responses}); });
+"""
+
+
+def install_capture_hook(driver) -> bool:
+    """
+    Register the hook to run before page scripts on every document the driver loads.
+
+    Only Chromium drivers expose CDP for this; returns False elsewhere, and
+    collect_api_responses() then falls back to the in-page re-fetch.
+    """
+    if getattr(driver, "_gmgn_capture_hook", False):
+        return True
+    execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+    if execute_cdp_cmd is None:
+        return False
+    try:
+        execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": CAPTURE_HOOK_SCRIPT})
+    except Exception:
+        return False
+    driver._gmgn_capture_hook = True
+    return True
+
+
+def collect_api_responses(driver, timeout: float = 5.0) -> Dict[str, Any]:
+    """{"source": hook | refetch | none, "responses": [{url, status, body}, ...]} for the loaded page"""
+    driver.set_script_timeout(timeout)
+    result = driver.execute_async_script(COLLECT_SCRIPT, API_URL_PATTERN)
+    return result or {"source": "none", "responses": []}
+
+
+def extract_from_api_responses(responses: List[Dict[str, Any]], debug: bool = False) -> Tuple[Optional[float], Dict[str, Any]]:
+    """
+    7D realized PnL and the other headline metrics from captured JSON bodies.
+
+    Fields are matched by name (REALIZED_PNL_7D_KEY, METRIC_FIELD_KEYS) anywhere
+    in each decoded payload. The most specific name wins across all responses
+    (realized_profit_7d over a bare pnl_7d), the first response among equals.
+
+    Returns:
+        (value, info) shaped like the HTML engine's, with strategy "api_capture"
+    """
+    info: Dict[str, Any] = {"strategy": None, "context": None}
+    metrics: Dict[str, Optional[float]] = {m: None for m in HEADLINE_METRICS}
+    fields: Dict[str, float] = {}
+    urls: Dict[str, Optional[str]] = {}
+    value: Optional[float] = None
+    decoded = 0
+    for response in responses:
+        body = response.get("body")
+        if not body or (response.get("status") or 200) >= 400:
+            continue
+        try:
+            data = json.loads(body)
+        except ValueError:
+            continue
+        decoded += 1
+        found: Dict[str, float] = {}
+        _realized_pnl_fields(data, found)
+        for key, num in found.items():
+            if key not in fields:
+                fields[key] = num
+                urls[key] = response.get("url")
+    best = best_field(fields, "pnl_7d")
+    if best:
+        key, value = best
+        info["strategy"] = "api_capture"
+        info["context"] = f"{urls[key]} field {key}"
+        info["api_url"] = urls[key]
+    for metric in metrics:
+        best = best_field(fields, metric)
+        if best:
+            metrics[metric] = best[1]
+    info["metrics"] = metrics
+    if fields:
+        info["fields"] = fields
+    info["api_responses"] = {"captured": len(responses), "decoded": decoded}
+    if debug:
+        info["raw_money"] = format_money(value) if value is not None else None
+    return value, info
+
+
+def capture_from_driver(driver, debug: bool = False, timeout: float = 5.0) -> Tuple[Optional[float], Dict[str, Any], List[Dict[str, Any]]]:
+    """Collect the loaded page's API responses and extract from them; (value, info, responses)"""
+    try:
+        collected = collect_api_responses(driver, timeout=timeout)
+    except Exception as e:
+        return None, {"strategy": None, "context": None, "api_capture": f"error: {e}"}, []
+    responses = collected.get("responses") or []
+    value, info = extract_from_api_responses(responses, debug=debug)
+    info["api_capture"] = collected.get("source")
+    return value, info, responses
+
+
+def save_responses(responses: List[Dict[str, Any]], path: Path) -> None:
+    """Write captured responses as JSONL (one {url, status, body} per line) for replay"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for response in responses:
+            f.write(json.dumps({k: response.get(k) for k in ("url", "status", "body")}, ensure_ascii=False) + "\n")
+
+
+def load_recorded_responses(path: Path) -> List[Dict[str, Any]]:
+    """
+    Responses from a capture JSONL file, a HAR export (browser devtools
+    "Save all as HAR") or a single JSON payload.
+    """
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    stripped = text.lstrip()
+    if path.suffix.lower() == ".jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    data = json.loads(stripped) if stripped else None
+    if isinstance(data, dict) and isinstance(data.get("log"), dict):
+        responses = []
+        for entry in data["log"].get("entries", []):
+            content = entry.get("response", {}).get("content", {})
+            body = content.get("text")
+            if body and content.get("encoding") == "base64":
+                import base64
+                body = base64.b64decode(body).decode("utf-8", errors="ignore")
+            responses.append({"url": entry.get("request", {}).get("url"), "status": entry.get("response", {}).get("status"), "body": body})
+        return responses
+    return [{"url": str(path), "status": 200, "body": stripped}]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract 7D Realized PnL from recorded wallet API responses (capture JSONL, HAR or JSON)")
+    parser.add_argument("files", nargs="+", help="Recorded responses: --capture-dir JSONL files, HAR exports or raw JSON payloads")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    for name in args.files:
+        path = Path(name)
+        value, info = extract_from_api_responses(load_recorded_responses(path), debug=args.debug)
+        result = build_result(path.stem, value, info, file=str(path), url=info.get("api_url"), debug=args.debug)
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    main()
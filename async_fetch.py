@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Asyncio HTTP fetch mode for many wallets.
+Wallet pages are fetched concurrently over one pooled keep-alive session, so
+connections (and TLS handshakes) are reused across wallets; results stream out
+as each page is extracted. Blocking requests calls run on a bounded executor,
+since requests is the HTTP client this project already depends on.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from gmgn_scrape import GMGN_BASE_URL, build_result, fetch_live_wallet_pnl_simple
+
+
+WalletResult = Tuple[Optional[str], Optional[float], Dict[str, Any]]
+
+
+def make_session(concurrency: int) -> requests.Session:
+    """Session whose connection pool holds one keep-alive connection per concurrent request"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=concurrency, pool_block=True, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def connection_stats(session: requests.Session) -> Dict[str, int]:
+    """Connections opened vs requests sent, summed over the session's urllib3 pools"""
+    opened = sent = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            opened += pool.num_connections
+            sent += pool.num_requests
+    return {"connections_opened": opened, "requests_sent": sent}
+
+
+async def stream_wallets(
+    addresses: List[str],
+    chain: str = "sol",
+    concurrency: int = 8,
+    base_url: str = GMGN_BASE_URL,
+    timeout: float = 30,
+    debug: bool = False,
+    page_cache=None,
+    cache_max_age: float = 0,
+    scheduler=None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[Tuple[str, Optional[float], Dict[str, Any]]]:
+    """
+    Fetch and extract many wallets concurrently, yielding results as they finish.
+
+    Args:
+        addresses: Wallet addresses
+        chain: Blockchain chain (sol, eth, etc.)
+        concurrency: Requests in flight at once (and pooled connections kept open)
+        base_url: Site root; point it at stub_server.py to test without gmgn.ai
+        timeout: Per-request timeout in seconds
+        debug: Whether to print debug information
+        page_cache: Optional page_cache.PageCache, as for fetch_live_wallet_pnl_simple
+        cache_max_age: Serve from page_cache without a request if a page this fresh exists
+        scheduler: Optional fetch_scheduler.FetchScheduler; requests then also obey its per-host rate
+        stats: Optional dict filled with throughput and connection reuse figures at the end
+
+    Yields:
+        (wallet_address, pnl_value, info) in completion order
+    """
+    loop = asyncio.get_running_loop()
+    session = make_session(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="gmgn-http")
+    start = time.perf_counter()
+    found = errors = 0
+
+    def fetch(address: str):
+        return fetch_live_wallet_pnl_simple(
+            address, chain=chain, debug=debug, page_cache=page_cache, cache_max_age=cache_max_age,
+            session=session, base_url=base_url, timeout=timeout, scheduler=scheduler,
+        )
+
+    async def one(address: str):
+        value, info = await loop.run_in_executor(executor, fetch, address)
+        return address, value, info
+
+    pending = iter(addresses)
+    in_flight = set()
+    try:
+        # Keep the executor busy without creating a task per wallet up front
+        for address in pending:
+            in_flight.add(asyncio.ensure_future(one(address)))
+            if len(in_flight) >= concurrency * 2:
+                break
+        while in_flight:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                address, value, info = task.result()
+                found += value is not None
+                errors += "error" in info
+                yield address, value, info
+                nxt = next(pending, None)
+                if nxt is not None:
+                    in_flight.add(asyncio.ensure_future(one(nxt)))
+    finally:
+        for task in in_flight:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if stats is not None:
+            elapsed = time.perf_counter() - start
+            stats.update({
+                "wallets": len(addresses),
+                "found": found,
+                "errors": errors,
+                "concurrency": concurrency,
+                "seconds": round(elapsed, 3),
+                "wallets_per_sec": round(len(addresses) / elapsed, 2) if elapsed > 0 else 0.0,
+                **connection_stats(session),
+            })
+        session.close()
+
+
+def fetch_wallet_list_async(addresses: List[str], **kwargs: Any) -> Iterator[WalletResult]:
+    """
+    Blocking wrapper around stream_wallets() for synchronous callers.
+
+    Yields (address, value, info) per wallet and finally (None, None, stats),
+    the same shape as gmgn_scrape.fetch_wallet_list_with_pool().
+    """
+    stats: Dict[str, Any] = {}
+    loop = asyncio.new_event_loop()
+    agen = stream_wallets(addresses, stats=stats, **kwargs)
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+            yield item
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
+    yield None, None, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fetch many wallets concurrently over pooled HTTP connections")
+    parser.add_argument("wallet_list", help="File with one wallet address per line")
+    parser.add_argument("--chain", default="sol", help="Blockchain chain (default: sol)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once (default: 8)")
+    parser.add_argument("--base-url", default=GMGN_BASE_URL, help=f"Site root (default: {GMGN_BASE_URL}; e.g. http://127.0.0.1:8765 for stub_server.py)")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds (default: 30)")
+    parser.add_argument("--rate", type=float, help="Max requests per second to the host; 429/5xx are retried with backoff (default: unlimited)")
+    parser.add_argument("--burst", type=float, default=1.0, help="Requests allowed back to back with --rate (default: 1)")
+    parser.add_argument("--max-retries", type=int, default=4, help="Retries per request with --rate (default: 4)")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    scheduler = None
+    if args.rate:
+        from fetch_scheduler import FetchScheduler
+        scheduler = FetchScheduler(rate=args.rate, burst=args.burst, concurrency=args.concurrency, max_retries=args.max_retries)
+
+    with open(args.wallet_list, "r", encoding="utf-8") as f:
+        addresses = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    for address, value, info in fetch_wallet_list_async(
+        addresses, chain=args.chain, concurrency=args.concurrency, base_url=args.base_url, timeout=args.timeout, debug=args.debug, scheduler=scheduler
+    ):
+        if address is None:
+            if scheduler is not None:
+                info["scheduler"] = scheduler.stats()
+            print(json.dumps({"http": info}), file=sys.stderr)
+            break
+        print(json.dumps(build_result(address, value, info, url=info.get("url"), debug=args.debug), ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    main()
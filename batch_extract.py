@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Batch extraction of saved GMGN.ai wallet pages.
+Takes a directory, glob pattern or manifest file of saved pages and fans
+extraction out across a process pool, streaming one JSON result per page.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from gmgn_scrape import ExtractionProfile, extract_html_file, strategies_by_name
+from pnl_history import record_results
+from results_store import append_result, export_excel, utc_timestamp
+from strategy_stats import STRATEGY_ORDER_MODES, apply_strategy_order
+
+
+PAGE_SUFFIXES = (".htm", ".html")
+
+
+def collect_pages(source: str) -> List[Path]:
+    """Resolve a directory, glob pattern or manifest (one path per line, or JSONL with "file") to page paths"""
+    path = Path(source)
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in PAGE_SUFFIXES)
+    if path.is_file() and path.suffix.lower() not in PAGE_SUFFIXES:
+        pages: List[Path] = []
+        with path.open("r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("{"):
+                    line = json.loads(line).get("file") or ""
+                if line:
+                    entry = Path(line)
+                    # Relative manifest entries are resolved against the manifest's folder
+                    pages.append(entry if entry.is_absolute() else path.parent / entry)
+        return pages
+    if path.is_file():
+        return [path]
+    return sorted(Path(p) for p in glob.glob(source, recursive=True) if Path(p).is_file())
+
+
+def _extract_chunk(paths: List[str], debug: bool, profile: bool = False, order: Optional[List[str]] = None, stream: bool = False, memo: Optional[str] = None) -> List[Dict[str, Any]]:
+    # Runs inside a worker process; one failed page must not sink the whole chunk
+    strategies = strategies_by_name(order) if order else None
+    page_memo = None
+    if memo and not stream:
+        from extract_memo import shared_memo
+        page_memo = shared_memo(memo)
+    results = []
+    for p in paths:
+        try:
+            results.append(extract_html_file(Path(p), debug=debug, profile=profile, strategies=strategies, stream=stream, memo=page_memo))
+        except Exception as e:
+            results.append({"file": p, "pnl_7d": None, "strategy": None, "error": str(e)})
+    if page_memo is not None:
+        page_memo.flush()
+    return results
+
+
+def run_batch(pages: List[Path], workers: int = 0, chunk_size: int = 8, debug: bool = False, stats: Optional[Dict[str, Any]] = None, profile: bool = False, order: Optional[List[str]] = None, stream: bool = False, memo: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Extract pages in a process pool and yield results as they complete.
+
+    Args:
+        pages: Saved page paths
+        workers: Worker processes (0 = one per CPU, 1 = run inline without a pool)
+        chunk_size: Pages handed to a worker per task, amortizing IPC for fast pages
+        debug: Include debug fields in each result
+        stats: Optional dict filled with throughput figures once the batch finishes
+        profile: Attach per-strategy profile records to each result
+        order: Strategy names in the order workers should try them (default: the engine's order)
+        stream: Read pages incrementally and stop once the result is decided (stream_extract.py)
+        memo: extract_memo.py database; pages the current extractor already processed are served from it
+
+    Yields:
+        One result dict per page, in completion order
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [[str(p) for p in pages[i : i + chunk_size]] for i in range(0, len(pages), chunk_size)]
+    start = time.perf_counter()
+    found = memo_hits = 0
+
+    if workers == 1:
+        for chunk in chunks:
+            for result in _extract_chunk(chunk, debug, profile, order, stream, memo):
+                found += result.get("pnl_7d") is not None
+                memo_hits += result.get("memo") == "hit"
+                yield result
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_chunk, chunk, debug, profile, order, stream, memo) for chunk in chunks]
+            for future in as_completed(futures):
+                for result in future.result():
+                    found += result.get("pnl_7d") is not None
+                    memo_hits += result.get("memo") == "hit"
+                    yield result
+
+    elapsed = time.perf_counter() - start
+    if stats is not None:
+        pages_per_sec = len(pages) / elapsed if elapsed > 0 else 0.0
+        stats.update({
+            "pages": len(pages),
+            "found": found,
+            "workers": workers,
+            "seconds": round(elapsed, 3),
+            "pages_per_sec": round(pages_per_sec, 2),
+            "pages_per_sec_per_worker": round(pages_per_sec / workers, 2),
+        })
+        if memo:
+            stats["memo_hits"] = memo_hits
+
+
+def measure_scaling(pages: List[Path], max_workers: int, chunk_size: int = 8) -> List[Dict[str, Any]]:
+    """Run the batch at 1, 2, 4, ... max_workers and report speedup and per-core efficiency"""
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+
+    rows: List[Dict[str, Any]] = []
+    baseline: Optional[float] = None
+    for count in counts:
+        stats: Dict[str, Any] = {}
+        for _ in run_batch(pages, workers=count, chunk_size=chunk_size, stats=stats):
+            pass
+        if baseline is None:
+            baseline = stats["pages_per_sec"] or 1e-9
+        stats["speedup"] = round(stats["pages_per_sec"] / baseline, 2)
+        stats["efficiency"] = round(stats["speedup"] / count, 2)
+        rows.append(stats)
+    return rows
+
+
+def write_batch(source: str, workers: int = 0, chunk_size: int = 8, debug: bool = False, scaling: bool = False, excel: bool = False, profile: bool = False, strategy_order: str = "fixed", strategy_stats: Optional[str] = None, stream: bool = False, memo: Optional[str] = None) -> Dict[str, Any]:
+    """CLI driver shared by this script and gmgn_scrape.py --batch"""
+    pages = collect_pages(source)
+    if not pages:
+        raise SystemExit(f"No saved pages found for: {source}")
+
+    stats: Dict[str, Any] = {}
+    recorded: List[Dict[str, Any]] = []
+    profiler = ExtractionProfile()
+    learned, order = apply_strategy_order(strategy_order, strategy_stats)
+    # Adaptive runs need every page's profile records, printed or not
+    collect = profile or learned is not None
+    for result in run_batch(pages, workers=workers, chunk_size=chunk_size, debug=debug, stats=stats, profile=collect, order=order, stream=stream, memo=memo):
+        records = result.get("profile") if profile else result.pop("profile", None)
+        if records:
+            profiler.add(records)
+            if learned is not None:
+                learned.add(records)
+        if excel:
+            result["captured_at"] = utc_timestamp()
+            append_result(result, durable=False)
+            recorded.append(result)
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    if excel:
+        # One history transaction and one Excel export for the whole batch
+        record_results(recorded)
+        export_excel()
+
+    if learned is not None:
+        learned.save()
+
+    summary: Dict[str, Any] = {"summary": stats}
+    if strategy_order != "fixed":
+        summary["strategy_order"] = order
+    if profile:
+        summary["profile"] = profiler.summary()
+    if scaling:
+        summary["scaling"] = measure_scaling(pages, stats["workers"], chunk_size=chunk_size)
+    # Keep stdout a clean JSONL stream of results; throughput goes to stderr
+    print(json.dumps(summary), file=sys.stderr)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract 7D Realized PnL from many saved GMGN wallet pages in parallel")
+    parser.add_argument("source", help="Directory, glob pattern (quote it) or manifest file of saved pages")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=8, help="Pages per worker task (default: 8)")
+    parser.add_argument("--scaling", action="store_true", help="Also measure pages/sec at 1..N workers")
+    parser.add_argument("--excel", action="store_true", help="Also record results in profit.jsonl and export profit.xlsx at the end")
+    parser.add_argument("--profile", action="store_true", help="Per-strategy time, nodes visited and regex calls, per page and totalled in the summary")
+    parser.add_argument("--strategy-order", choices=STRATEGY_ORDER_MODES, default="fixed", help="fixed (default), adaptive (learned from saved stats, updated after the run) or frozen (learned, not updated)")
+    parser.add_argument("--strategy-stats", help="Stats file for --strategy-order (default: ~/.cache/gmgn_scrape/strategy_stats.json)")
+    parser.add_argument("--stream", action="store_true", help="Read pages incrementally and stop once the result is decided (bounded memory for huge pages)")
+    parser.add_argument("--memo", nargs="?", const="", metavar="DB", help="Reuse results for pages the current extractor version already processed (default DB: ~/.cache/gmgn_scrape/extract_memo.db)")
+    parser.add_argument("--debug", action="store_true", help="Include debug info in each result")
+    args = parser.parse_args()
+
+    memo = args.memo
+    if memo == "":
+        from extract_memo import EXTRACT_MEMO_DB
+        memo = str(EXTRACT_MEMO_DB)
+
+    write_batch(args.source, workers=args.workers, chunk_size=args.chunk_size, debug=args.debug, scaling=args.scaling, excel=args.excel, profile=args.profile, strategy_order=args.strategy_order, strategy_stats=args.strategy_stats, stream=args.stream, memo=memo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the 7D Realized PnL extraction heuristics.
+Times every extraction strategy, the full engine, the embedded-JSON and the
+plain-text extractors on debug_wallet_page.html and on synthetic pages scaled
+from tens of KB to tens of MB, including pages built so that each fallback is
+the one that fires. Results are written as JSON so two commits can be compared.
+``--stream-check`` instead extracts the same pages, plus pages carrying several
+strategies' values at once, with stream_extract.py and with the full engine,
+and exits 1 if any value or winning strategy differs.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from gmgn_scrape import (
+    EXTRACTION_STRATEGIES,
+    PageDocument,
+    _extract_money_from_embedded_json,
+    extract_7d_realized_pnl_from_html,
+    extract_from_plain_text,
+)
+
+
+BASE_PAGE = Path(__file__).with_name("debug_wallet_page.html")
+
+# Target sizes for the scaled pages, in KB (the saved page itself is ~40 KB).
+# A full run takes about an hour on one core; --quick stops at 256 KB.
+DEFAULT_SIZES_KB = [40, 256, 2048, 16384]
+QUICK_SIZES_KB = [40, 256]
+
+# Injected before the chakra env span, i.e. inside <body> after the app root
+INJECT_MARKER = '<span id="__chakra_env"'
+
+# One snippet per fallback; each is only found by the strategy it is named after
+# (next_data_fast is injected into __NEXT_DATA__ instead, see build_page)
+FALLBACK_SNIPPETS: Dict[str, str] = {
+    "targeted_css_selector": '<div class="card"><span>7D Realized PnL</span><div class="flex items-center font-medium text-[12px] ml-[4px]">-$284.68</div></div>',
+    "red_color_style_selector": '<div class="card"><span>7D Realized PnL</span><div style="color: rgb(242, 102, 130)">-$1,284.68</div></div>',
+    "analysis_card_keywords": '<div class="bg-card p-4 rounded-lg"><div>Analysis</div><div>7D Realized PnL</div><div>+$31.5</div></div>',
+    "raw_text_vicinity_7d": "<p>stats 7 D window</p><p>$55.10</p>",
+    "label_global": "<p>Realized Profit</p><p>unrelated</p><i>$9.99</i>",
+    "embedded_json_7d": '<script type="application/json">{"stats":{"sevenDayRealized":"-$77.50"}}</script>',
+}
+
+NEXT_DATA_PAGE_PROPS = '"pageProps":{"walletStat":{"realized_profit_7d":-123.45,"realized_profit_30d":-189.52,"winrate":0.42}}'
+
+# Pages with several strategies' values at once, each listed in document order; the
+# streamed pick must still follow strategy order (e.g. the CSS div beats an earlier red div)
+MIXED_TARGETS = [
+    "next_data_fast+red_color_style_selector",
+    "red_color_style_selector+targeted_css_selector",
+    "label_global+targeted_css_selector",
+    "raw_text_vicinity_7d+analysis_card_keywords",
+    "label_global+raw_text_vicinity_7d",
+    "embedded_json_7d+label_global",
+]
+
+# Label lines the streamed label_global must read exactly as the full engine does:
+# an amount far along a minified line, and a first label whose line has no whole
+# amount, which settles label_global without a value even though a later one has
+LABEL_LINE_SNIPPETS: Dict[str, str] = {
+    "label_long_line": "<p>Realized PnL <span>" + "no amount here " * 200 + "</span><i>$9.99</i></p>",
+    "label_first_decides": "<p>Realized PnL $-5\n</p><p>unrelated</p><p>Realized Profit $7.25</p>",
+}
+
+PLAIN_TEXT_SAMPLE = "Wallet overview\nBalance $12,004.10\n7D Realized PnL -$284.68\n30D Realized PnL +$1,020.00\n"
+
+
+# Amount-free header/footer rows keep filler amounts out of raw_text_vicinity's window
+# (200 chars before, 400 after) around the injected "7 D" and around the "#6E727D"
+# colour in the saved page, which that heuristic also reads as "7D"
+SPACER = '<div class="token-header"><span>Token</span><span>Price</span><span>Change</span></div>' * 6
+
+
+def _filler(size: int) -> str:
+    # Token-table rows with money amounts but no 7D/PnL wording, so every scan has to walk them
+    rows = []
+    total = 0
+    i = 0
+    while total < size:
+        row = f'<div class="flex row-{i % 7}"><span>TKN{i:07d}</span><span>${i % 9973:,}.{i % 100:02d}</span><span>{i % 97}.{i % 10}%</span></div>'
+        rows.append(row)
+        total += len(row)
+        i += 1
+    return '<div class="token-list">' + SPACER + "".join(rows) + SPACER + "</div>"
+
+
+def build_page(target: str, size_kb: int, base: str) -> str:
+    """Saved page plus filler up to ``size_kb``, with the value placed where ``target`` finds it
+    ("none" = no value; "a+b" = values for both strategies, in that document order)"""
+    pad = max(0, size_kb * 1024 - len(base))
+    page = base
+    targets = target.split("+")
+    if "next_data_fast" in targets:
+        page = page.replace('"pageProps":{}', NEXT_DATA_PAGE_PROPS, 1)
+    snippet = "".join(FALLBACK_SNIPPETS.get(t, "") for t in targets)
+    # Filler sits in front of the value so strategies cannot stop early
+    return page.replace(INJECT_MARKER, (_filler(pad) if pad else "") + snippet + INJECT_MARKER, 1)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BASE_PAGE.parent, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def measure(fn: Callable[[], Any], repeat: int, memory: bool = True) -> Dict[str, Any]:
+    """Median/min wall time over ``repeat`` runs, then one traced run for peak Python memory"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        # Traced separately: tracemalloc slows allocation-heavy parses several times over
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1) if peak is not None else None,
+        "result": result,
+    }
+
+
+def _strategy_runner(fn, html: str) -> Callable[[], Any]:
+    # Each strategy on a fresh document, so its timing includes any parse it triggers
+    def run():
+        found = fn(PageDocument(html))
+        return found[0] if found else None
+    return run
+
+
+def bench_page(name: str, target: str, html: str, repeat: int, memory: bool = True) -> List[Dict[str, Any]]:
+    cases: List[Tuple[str, Callable[[], Any]]] = [("engine", lambda: extract_7d_realized_pnl_from_html(html))]
+    cases += [(f"strategy:{n}", _strategy_runner(fn, html)) for n, fn in EXTRACTION_STRATEGIES]
+    cases.append(("embedded_json", lambda: _extract_money_from_embedded_json(html)))
+
+    rows = []
+    for case, fn in cases:
+        m = measure(fn, repeat, memory)
+        result = m.pop("result")
+        if case == "engine":
+            value, info = result
+            m["value"] = value
+            m["strategy"] = info.get("strategy")
+        else:
+            m["value"] = result
+        rows.append({"page": name, "target": target, "bytes": len(html.encode("utf-8")), "case": case, **m})
+    return rows
+
+
+def bench_plain_text(size_kb: int, repeat: int, memory: bool = True) -> Dict[str, Any]:
+    filler = "".join(f"TKN{i:07d} ${i % 9973:,}.{i % 100:02d}\n" for i in range(max(1, size_kb * 1024 // 22)))
+    text = filler + PLAIN_TEXT_SAMPLE
+    m = measure(lambda: extract_from_plain_text(text), repeat, memory)
+    m["value"] = m.pop("result")
+    return {"page": f"plain_text_{size_kb}kb", "target": "plain_text", "bytes": len(text), "case": "plain_text", **m}
+
+
+def run_suite(sizes_kb: List[int], targets: List[str], repeat: int, memory: bool = True, progress: bool = True) -> Dict[str, Any]:
+    base = BASE_PAGE.read_text(encoding="utf-8", errors="ignore")
+    rows: List[Dict[str, Any]] = []
+    pages = [("debug_wallet_page", "none", base)]
+    for size in sizes_kb:
+        for target in targets:
+            pages.append((f"{target}_{size}kb", target, build_page(target, size, base)))
+
+    for name, target, html in pages:
+        started = time.perf_counter()
+        # Big pages get fewer repeats; a 16 MB parse alone takes seconds
+        reps = repeat if len(html) < 4 * 1024 * 1024 else 1
+        rows.extend(bench_page(name, target, html, reps, memory))
+        if progress:
+            print(f"  {name}: {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    for size in sizes_kb:
+        rows.append(bench_plain_text(size, repeat, memory))
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "repeat": repeat,
+            "memory": memory,
+            "sizes_kb": sizes_kb,
+        },
+        "results": rows,
+    }
+
+
+def stream_check(sizes_kb: List[int], targets: List[str], chunk_sizes: Tuple[int, ...] = (32 * 1024, 1024)) -> List[Dict[str, Any]]:
+    """Streamed vs full-engine value and strategy on every bench page, at each chunk size; returns the mismatches"""
+    from stream_extract import extract_stream
+
+    base = BASE_PAGE.read_text(encoding="utf-8", errors="ignore")
+    pages = [("debug_wallet_page", base)]
+    pages += [(name, base.replace(INJECT_MARKER, SPACER + snippet + INJECT_MARKER, 1)) for name, snippet in LABEL_LINE_SNIPPETS.items()]
+    for size in sizes_kb:
+        for target in targets + MIXED_TARGETS:
+            pages.append((f"{target}_{size}kb", build_page(target, size, base)))
+
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, html in pages:
+            path = Path(tmp) / f"{name}.html"
+            path.write_text(html, encoding="utf-8")
+            value, info = extract_7d_realized_pnl_from_html(path.read_bytes())
+            for chunk_size in chunk_sizes:
+                s_value, s_info = extract_stream(path, chunk_size=chunk_size)
+                if (s_value, s_info["strategy"]) != (value, info["strategy"]):
+                    mismatches.append({
+                        "page": name,
+                        "chunk_size": chunk_size,
+                        "full": [value, info["strategy"]],
+                        "stream": [s_value, s_info["strategy"]],
+                    })
+    print(f"Stream check: {len(pages)} pages x {len(chunk_sizes)} chunk sizes, {len(mismatches)} mismatches", file=sys.stderr)
+    return mismatches
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Pair rows by (page, case) and flag slowdowns above ``threshold`` (e.g. 1.2 = 20% slower)"""
+    old = {(r["page"], r["case"]): r for r in baseline.get("results", [])}
+    diffs = []
+    for r in current["results"]:
+        prev = old.get((r["page"], r["case"]))
+        if not prev or not prev.get("median_ms"):
+            continue
+        ratio = r["median_ms"] / prev["median_ms"]
+        diffs.append({
+            "page": r["page"],
+            "case": r["case"],
+            "before_ms": prev["median_ms"],
+            "after_ms": r["median_ms"],
+            "ratio": round(ratio, 2),
+            "regression": ratio > threshold and r["median_ms"] - prev["median_ms"] > 0.5,
+            "value_changed": prev.get("value") != r.get("value"),
+        })
+    return diffs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the extraction heuristics on real and synthetic wallet pages")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Synthetic page sizes in KB (default: 40 256 2048 16384)")
+    parser.add_argument("--quick", action="store_true", help="Only the 40 KB and 256 KB pages")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced peak-memory runs (about halves the run time)")
+    parser.add_argument("--targets", nargs="+", default=[n for n, _ in EXTRACTION_STRATEGIES] + ["none"], help="Which strategy each synthetic page is built for (default: all, plus 'none')")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: 5)")
+    parser.add_argument("--output", "-o", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio counted as a regression (default: 1.2)")
+    parser.add_argument("--stream-check", action="store_true", help="Check --stream against the full engine on the bench pages instead of timing; exits 1 on any difference")
+    args = parser.parse_args()
+
+    sizes = args.sizes or (QUICK_SIZES_KB if args.quick else DEFAULT_SIZES_KB)
+    if args.stream_check:
+        mismatches = stream_check(sizes, args.targets)
+        for m in mismatches:
+            print(json.dumps(m), file=sys.stderr)
+        if mismatches:
+            sys.exit(1)
+        return
+    report = run_suite(sizes, args.targets, args.repeat, memory=not args.no_memory)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"Wrote {len(report['results'])} results to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        diffs = compare(baseline, report, args.threshold)
+        for d in diffs:
+            if d["regression"] or d["value_changed"]:
+                print(json.dumps(d), file=sys.stderr)
+        regressions = sum(d["regression"] for d in diffs)
+        changed = sum(d["value_changed"] for d in diffs)
+        print(f"Compared {len(diffs)} cases against {baseline.get('meta', {}).get('commit')}: {regressions} regressions, {changed} changed values", file=sys.stderr)
+        if regressions or changed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for gmgn_scrape.py.
+Runs each mode in a fresh interpreter under ``python -X importtime`` and
+reports wall time, total import time, the slowest top-level imports and which
+heavy stacks (selenium, requests, bs4, pandas, ...) were loaded. Offline modes
+are expected to stay clear of the browser, HTTP and spreadsheet stacks; a mode
+that loads one it should not is reported and fails the run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+HERE = Path(__file__).resolve().parent
+SCRIPT = str(HERE / "gmgn_scrape.py")
+BASE_PAGE = str(HERE / "debug_wallet_page.html")
+
+# Third-party stacks whose import cost is tracked per mode
+HEAVY_STACKS = ["selenium", "webdriver_manager", "requests", "urllib3", "bs4", "lxml", "pandas", "numpy", "openpyxl"]
+
+# mode -> (interpreter arguments, stacks the mode must not load)
+MODES: Dict[str, Tuple[List[str], List[str]]] = {
+    "import": (["-c", "import gmgn_scrape"], ["selenium", "requests", "bs4", "pandas"]),
+    "api": (["-c", f"from gmgn_scrape import extract_7d_realized_pnl_from_html as f; f(open({BASE_PAGE!r}, encoding='utf-8').read())"], ["selenium", "requests", "pandas"]),
+    "html": ([SCRIPT, "--html", BASE_PAGE, "--no-excel"], ["selenium", "requests", "pandas"]),
+    "html-stream": ([SCRIPT, "--html", BASE_PAGE, "--stream", "--no-excel"], ["selenium", "requests", "pandas"]),
+    "html-excel": ([SCRIPT, "--html", BASE_PAGE], ["selenium", "requests", "pandas"]),
+    "batch": ([SCRIPT, "--batch", BASE_PAGE, "--workers", "1", "--no-excel"], ["selenium", "requests", "pandas"]),
+    "help": ([SCRIPT, "--help"], ["selenium", "requests", "bs4", "pandas"]),
+    "live-setup": (["-c", "import gmgn_scrape, async_fetch; gmgn_scrape.build_firefox_options()"], []),
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=HERE, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self_us, cumulative_us) for every ``-X importtime`` line"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_part, cumulative, name = line[len("import time:"):].split("|", 2)
+            self_us, cumulative_us = int(self_part), int(cumulative)
+        except ValueError:
+            continue
+        stripped = name.lstrip()
+        # One leading space after the bar, then two per nesting level
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append((stripped.rstrip(), depth, self_us, cumulative_us))
+    return entries
+
+
+def run_mode(name: str, argv: List[str], cwd: str) -> Dict[str, Any]:
+    """One fresh interpreter run of ``argv`` under -X importtime"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(HERE), os.environ.get("PYTHONPATH")])))
+    # Bytecode is written on the first run; later runs measure the warm-cache startup users see
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv], capture_output=True, text=True, cwd=cwd, env=env)
+    wall = time.perf_counter() - start
+    entries = parse_importtime(proc.stderr)
+    top = [e for e in entries if e[1] == 0]
+    stacks = {}
+    for stack in HEAVY_STACKS:
+        cumulative = [e[3] for e in entries if e[0] == stack]
+        if cumulative:
+            stacks[stack] = round(max(cumulative) / 1000, 1)
+    return {
+        "returncode": proc.returncode,
+        "wall_ms": wall * 1000,
+        "import_ms": sum(e[3] for e in top) / 1000,
+        "modules": len(entries),
+        "top": sorted(top, key=lambda e: -e[3]),
+        "stacks_ms": stacks,
+    }
+
+
+def bench_mode(name: str, repeat: int, cwd: str, top_n: int) -> Dict[str, Any]:
+    """Median over ``repeat`` runs of one mode, after one discarded warm-up run"""
+    argv, forbidden = MODES[name]
+    run_mode(name, argv, cwd)
+    runs = [run_mode(name, argv, cwd) for _ in range(repeat)]
+    last = runs[-1]
+    loaded = set(last["stacks_ms"])
+    return {
+        "mode": name,
+        "returncode": last["returncode"],
+        "wall_ms": round(statistics.median(r["wall_ms"] for r in runs), 1),
+        "import_ms": round(statistics.median(r["import_ms"] for r in runs), 1),
+        "modules": last["modules"],
+        "stacks_ms": last["stacks_ms"],
+        "top_imports": [{"module": m, "cumulative_ms": round(c / 1000, 1)} for m, _, _, c in last["top"][:top_n]],
+        "unexpected": sorted(loaded.intersection(forbidden)),
+    }
+
+
+def run_suite(modes: List[str], repeat: int, top_n: int, progress: bool = True) -> Dict[str, Any]:
+    results = []
+    # A scratch working directory keeps profit.jsonl / profit.xlsx writes out of the checkout
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as cwd:
+        for name in modes:
+            if progress:
+                print(f"{name}...", file=sys.stderr)
+            results.append(bench_mode(name, repeat, cwd, top_n))
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Pair modes and flag import-time slowdowns above ``threshold`` (e.g. 1.2 = 20% slower)"""
+    old = {r["mode"]: r for r in baseline.get("results", [])}
+    diffs = []
+    for r in current["results"]:
+        prev = old.get(r["mode"])
+        if not prev or not prev.get("import_ms"):
+            continue
+        ratio = r["import_ms"] / prev["import_ms"]
+        diffs.append({
+            "mode": r["mode"],
+            "before_ms": prev["import_ms"],
+            "after_ms": r["import_ms"],
+            "ratio": round(ratio, 2),
+            "regression": ratio > threshold and r["import_ms"] - prev["import_ms"] > 5,
+            "new_stacks": sorted(set(r["stacks_ms"]) - set(prev.get("stacks_ms", {}))),
+        })
+    return diffs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure gmgn_scrape.py startup and import cost per mode with python -X importtime")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES), help="Modes to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per mode (default: 5)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest top-level imports listed per mode (default: 8)")
+    parser.add_argument("--output", "-o", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio counted as a regression (default: 1.2)")
+    args = parser.parse_args()
+
+    report = run_suite(args.modes, args.repeat, args.top)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"Wrote {len(report['results'])} results to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    failed = False
+    for r in report["results"]:
+        print(json.dumps({"mode": r["mode"], "wall_ms": r["wall_ms"], "import_ms": r["import_ms"], "stacks": sorted(r["stacks_ms"])}), file=sys.stderr)
+        if r["unexpected"] or r["returncode"]:
+            print(json.dumps({"mode": r["mode"], "returncode": r["returncode"], "unexpected": r["unexpected"]}), file=sys.stderr)
+            failed = True
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        diffs = compare(baseline, report, args.threshold)
+        for d in diffs:
+            if d["regression"] or d["new_stacks"]:
+                print(json.dumps(d), file=sys.stderr)
+        regressions = sum(d["regression"] for d in diffs)
+        print(f"Compared {len(diffs)} modes against {baseline.get('meta', {}).get('commit')}: {regressions} regressions", file=sys.stderr)
+        failed = failed or bool(regressions)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
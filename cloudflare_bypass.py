@@ -12,9 +12,10 @@ from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.firefox.service import Service as FirefoxService
 
+from driver_resolver import resolve_driver
+
 def create_stealth_firefox():
     """Create a highly stealth Firefox instance"""
     options = FirefoxOptions()
@@ -162,7 +163,7 @@ def main():
     
     # Create stealth Firefox
     options = create_stealth_firefox()
-    service = FirefoxService(GeckoDriverManager().install())
+    service = FirefoxService(resolve_driver("firefox"))
     driver = webdriver.Firefox(service=service, options=options)
     
     try:
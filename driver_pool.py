@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Pool of warm, authenticated browser sessions for live wallet fetches.
+Launching Firefox, loading the homepage and applying cookies costs seconds,
+so sessions are kept open and handed to successive fetches instead.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class PooledSession:
+    """A pooled driver plus the bookkeeping needed to decide when to recycle it"""
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.pages = 0
+        self.failed = False
+        self.created_at = time.monotonic()
+        self.leased_at = 0.0
+
+
+class DriverPool:
+    """
+    Hands out up to ``size`` warm sessions; a session is recycled after
+    ``max_pages`` fetches or as soon as a fetch using it fails.
+
+    Args:
+        factory: Callable that returns a ready-to-use (authenticated) driver
+        size: Maximum number of concurrent browser sessions
+        max_pages: Pages served by one session before it is restarted (0 = never)
+        debug: Print pool events
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_pages: int = 50, debug: bool = False):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.debug = debug
+        self._idle: List[PooledSession] = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._started = time.monotonic()
+        self._stats: Dict[str, float] = {
+            "sessions_created": 0,
+            "sessions_recycled": 0,
+            "acquisitions": 0,
+            "pages_served": 0,
+            "errors": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "busy_seconds": 0.0,
+            "startup_seconds": 0.0,
+        }
+
+    def _create(self) -> PooledSession:
+        start = time.perf_counter()
+        driver = self.factory()
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self._stats["sessions_created"] += 1
+            self._stats["startup_seconds"] += elapsed
+        if self.debug:
+            print(f"Driver pool: started session in {elapsed:.1f}s")
+        return PooledSession(driver)
+
+    def _destroy(self, session: PooledSession) -> None:
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    def prewarm(self, count: Optional[int] = None) -> None:
+        """Start sessions up front so the first fetches do not pay the launch cost"""
+        target = min(self.size, count if count is not None else self.size)
+        while True:
+            with self._cond:
+                if self._live >= target or self._closed:
+                    return
+                self._live += 1
+            try:
+                session = self._create()
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledSession:
+        """Take an idle session, start a new one if below ``size``, or wait for one to be released"""
+        start = time.perf_counter()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    session = self._idle.pop()
+                    break
+                if self._live < self.size:
+                    self._live += 1
+                    session = None
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a browser session")
+                self._cond.wait(remaining)
+        # Queue wait only; launching a new session is counted in startup_seconds
+        waited = time.perf_counter() - start
+
+        if session is None:
+            try:
+                session = self._create()
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+
+        with self._cond:
+            self._stats["acquisitions"] += 1
+            self._stats["wait_seconds"] += waited
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+        session.failed = False
+        session.leased_at = time.perf_counter()
+        return session
+
+    def release(self, session: PooledSession) -> None:
+        """Return a session; failed or worn-out sessions are quit instead of reused"""
+        session.pages += 1
+        recycle = session.failed or (self.max_pages and session.pages >= self.max_pages)
+        with self._cond:
+            self._stats["pages_served"] += 1
+            self._stats["busy_seconds"] += time.perf_counter() - session.leased_at
+            if session.failed:
+                self._stats["errors"] += 1
+            if recycle or self._closed:
+                self._live -= 1
+                if recycle:
+                    self._stats["sessions_recycled"] += 1
+            else:
+                self._idle.append(session)
+            self._cond.notify()
+        if recycle or self._closed:
+            if self.debug:
+                reason = "error" if session.failed else f"{session.pages} pages"
+                print(f"Driver pool: recycling session after {reason}")
+            self._destroy(session)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[PooledSession]:
+        """``with pool.session() as s: s.driver.get(...)`` - exceptions mark the session failed"""
+        session = self.acquire(timeout)
+        try:
+            yield session
+        except BaseException:
+            session.failed = True
+            raise
+        finally:
+            self.release(session)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            self._destroy(session)
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Utilization is busy time over (pool size x pool lifetime)"""
+        with self._cond:
+            stats: Dict[str, Any] = dict(self._stats)
+            live, idle = self._live, len(self._idle)
+        elapsed = time.monotonic() - self._started
+        acquisitions = stats["acquisitions"] or 1
+        stats.update({
+            "size": self.size,
+            "live_sessions": live,
+            "idle_sessions": idle,
+            "elapsed_seconds": elapsed,
+            "avg_wait_seconds": stats["wait_seconds"] / acquisitions,
+            "utilization": stats["busy_seconds"] / (self.size * elapsed) if elapsed > 0 else 0.0,
+        })
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}
+
+
+def gmgn_driver_pool(size: int = 2, max_pages: int = 50, headless: bool = True, browser: str = "firefox", cookies_file: Optional[str] = None, debug: bool = False, scheduler=None, base_url: Optional[str] = None, block_resources: bool = True) -> DriverPool:
+    """Pool whose sessions are launched and authenticated the same way as fetch_live_wallet_pnl"""
+    from gmgn_scrape import create_live_driver, open_gmgn_session
+
+    def factory() -> Any:
+        driver = create_live_driver(headless=headless, browser=browser, block_resources=block_resources)
+        try:
+            open_gmgn_session(driver, cookies_file=cookies_file, debug=debug, scheduler=scheduler, base_url=base_url)
+        except Exception:
+            driver.quit()
+            raise
+        return driver
+
+    return DriverPool(factory, size=size, max_pages=max_pages, debug=debug)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Cached browser-driver resolution shared by every live entry point.
+webdriver_manager checks versions (and may hit the network) on every
+install() call; this resolves a driver once, records its path and version
+on disk and serves later lookups from that record, fully offline.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+DRIVER_CACHE_FILE = Path(os.environ.get("GMGN_DRIVER_CACHE", str(Path.home() / ".cache" / "gmgn_scrape" / "drivers.json")))
+
+# Re-check for a newer driver after this long; a stale entry is still used if the check fails
+DRIVER_CACHE_MAX_AGE = 7 * 24 * 3600
+
+# After a failed re-check the stale entry is served without retrying for this long,
+# so an offline machine does not wait on the install timeout at every launch
+DRIVER_RETRY_BACKOFF = 3600
+
+DRIVER_BINARIES = {"firefox": "geckodriver", "chrome": "chromedriver"}
+
+# Latency of the most recent lookups in this process, by kind ("cold" / "warm")
+RESOLVE_TIMINGS: Dict[str, Dict[str, float]] = {}
+
+
+def _load_cache() -> Dict[str, Any]:
+    try:
+        with DRIVER_CACHE_FILE.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache: Dict[str, Any]) -> None:
+    DRIVER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    # A temp file per writer, so concurrent resolvers never write into each other's file
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=DRIVER_CACHE_FILE.parent, prefix=DRIVER_CACHE_FILE.stem + ".", suffix=".tmp", delete=False) as f:
+        json.dump(cache, f, indent=2)
+    try:
+        # Atomic replace so concurrent entry points never read a half-written file
+        os.replace(f.name, DRIVER_CACHE_FILE)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
+
+def _driver_version(path: str) -> Optional[str]:
+    try:
+        out = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10)
+        return (out.stdout or out.stderr).strip().splitlines()[0]
+    except Exception:
+        return None
+
+
+def _install(browser: str) -> str:
+    # Only the cold path imports webdriver_manager
+    if browser == "chrome":
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    from webdriver_manager.firefox import GeckoDriverManager
+    return GeckoDriverManager().install()
+
+
+def _record_timing(browser: str, kind: str, started: float) -> None:
+    RESOLVE_TIMINGS.setdefault(browser, {})[kind] = round((time.perf_counter() - started) * 1000, 3)
+
+
+def resolve_driver(browser: str = "firefox", refresh: bool = False, max_age: float = DRIVER_CACHE_MAX_AGE) -> str:
+    """
+    Return the path of the geckodriver (firefox) or chromedriver (chrome) binary.
+
+    Args:
+        browser: "firefox" or "chrome"
+        refresh: Ignore the cache and resolve through webdriver_manager
+        max_age: Seconds before a cached entry is re-checked
+
+    Returns:
+        Path to the driver executable
+    """
+    started = time.perf_counter()
+    cache = _load_cache()
+    entry = cache.get(browser)
+    usable = bool(entry) and Path(entry.get("path", "")).exists()
+
+    if usable and not refresh:
+        now = time.time()
+        fresh = now - entry.get("resolved_at", 0) < max_age
+        backing_off = now - entry.get("check_failed_at", 0) < DRIVER_RETRY_BACKOFF
+        if fresh or backing_off:
+            _record_timing(browser, "warm", started)
+            return entry["path"]
+
+    try:
+        path = _install(browser)
+    except Exception:
+        # Offline or rate-limited: an older driver beats no driver
+        if usable:
+            entry["check_failed_at"] = time.time()
+            _save_cache(cache)
+            _record_timing(browser, "warm", started)
+            return entry["path"]
+        # Last resort: a driver already installed on PATH
+        path = shutil.which(DRIVER_BINARIES.get(browser, ""))
+        if not path:
+            raise
+
+    cache[browser] = {
+        "path": path,
+        "version": _driver_version(path),
+        "resolved_at": time.time(),
+    }
+    _record_timing(browser, "cold", started)
+    cache[browser]["cold_ms"] = RESOLVE_TIMINGS[browser]["cold"]
+    _save_cache(cache)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resolve and cache browser drivers; report cold vs warm lookup latency")
+    parser.add_argument("browsers", nargs="*", default=["firefox"], help="Drivers to resolve: firefox and/or chrome (default: firefox)")
+    parser.add_argument("--refresh", action="store_true", help="Force a cold resolution through webdriver_manager")
+    args = parser.parse_args()
+    for browser in args.browsers:
+        if browser not in ("firefox", "chrome"):
+            parser.error(f"unknown browser: {browser}")
+
+    report: Dict[str, Any] = {}
+    for browser in args.browsers:
+        try:
+            resolve_driver(browser, refresh=args.refresh)
+            # Second lookup is always served from the on-disk cache
+            resolve_driver(browser)
+        except Exception as e:
+            report[browser] = {"error": str(e)}
+            continue
+        entry = _load_cache().get(browser, {})
+        report[browser] = {
+            "path": entry.get("path"),
+            "version": entry.get("version"),
+            "cold_ms": RESOLVE_TIMINGS[browser].get("cold", entry.get("cold_ms")),
+            "warm_ms": RESOLVE_TIMINGS[browser].get("warm"),
+        }
+    print(json.dumps({"cache_file": str(DRIVER_CACHE_FILE), "drivers": report}, indent=2))
+    if any("error" in r for r in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Persistent memo of extraction results, keyed by page content and extractor version.
+A page's SHA-256 maps to the (value, info) the engine produced for it, together
+with the version of the engine and of every strategy the engine tried on it.
+Versions are hashes of the source of each strategy and of the helpers, regexes
+and constants it reaches, so editing one heuristic only invalidates the pages
+whose result depended on it. Re-running an unchanged corpus costs one hash and
+one index lookup per page.
+"""
+
+import argparse
+import functools
+import hashlib
+import inspect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import types
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import gmgn_scrape
+from gmgn_scrape import EXTRACTION_STRATEGIES, StrategyFn, run_extraction_engine, PageDocument
+
+
+EXTRACT_MEMO_DB = Path(os.environ.get("GMGN_EXTRACT_MEMO", str(Path.home() / ".cache" / "gmgn_scrape" / "extract_memo.db")))
+
+# Runtime registries rather than extraction logic; their contents vary from run to run
+UNVERSIONED_GLOBALS = {"PROFILE_HOOKS", "_default_strategies", "EXTRACTION_STRATEGIES"}
+# Classes whose methods strategies call (doc.soup, tokens.first_money); resolved by attribute name
+VERSIONED_CLASSES = ("PageDocument", "TextTokens")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memo (
+    sha256 TEXT PRIMARY KEY,
+    engine TEXT NOT NULL,
+    attempted TEXT NOT NULL,
+    winner TEXT,
+    value REAL,
+    info TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _code_names(code: types.CodeType) -> Iterator[str]:
+    # Global and attribute names used by a function, its lambdas, comprehensions and nested functions
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_names(const)
+
+
+def _const_repr(value: Any) -> Optional[str]:
+    # Stable text for constants (regexes included, also inside containers); None for anything else
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        return repr(value)
+    if isinstance(value, re.Pattern):
+        return f"re({value.pattern!r}, {value.flags})"
+    if isinstance(value, (tuple, list, frozenset, set)):
+        parts = [_const_repr(v) for v in value]
+        if None in parts:
+            return None
+        return "[" + ", ".join(sorted(parts) if isinstance(value, (set, frozenset)) else parts) + "]"
+    if isinstance(value, dict):
+        items = [(_const_repr(k), _const_repr(v)) for k, v in value.items()]
+        if any(None in item for item in items):
+            return None
+        return "{" + ", ".join(f"{k}: {v}" for k, v in items) + "}"
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _class_members() -> Dict[str, List[types.FunctionType]]:
+    # Methods and properties of VERSIONED_CLASSES by name
+    members: Dict[str, List[types.FunctionType]] = {}
+    for cls in VERSIONED_CLASSES:
+        for name, member in vars(getattr(gmgn_scrape, cls)).items():
+            fn = member.fget if isinstance(member, property) else getattr(member, "__func__", member)
+            if inspect.isfunction(fn):
+                members.setdefault(name, []).append(fn)
+    return members
+
+
+def _reachable(root: types.FunctionType) -> Dict[str, str]:
+    """Source of ``root`` and of every gmgn_scrape function, method, regex and constant it can reach"""
+    module = vars(gmgn_scrape)
+    pieces: Dict[str, str] = {}
+    stack = [root]
+    seen: Set[types.FunctionType] = set()
+    while stack:
+        fn = stack.pop()
+        if fn in seen:
+            continue
+        seen.add(fn)
+        try:
+            pieces[f"{fn.__module__}.{fn.__qualname__}"] = inspect.getsource(fn)
+        except (OSError, TypeError):
+            pieces[f"{fn.__module__}.{fn.__qualname__}"] = fn.__code__.co_code.hex()
+        for name in set(_code_names(fn.__code__)):
+            if name in UNVERSIONED_GLOBALS:
+                continue
+            obj = module.get(name)
+            if inspect.isfunction(obj) and obj.__module__ == gmgn_scrape.__name__:
+                stack.append(obj)
+            elif inspect.isclass(obj) and obj.__module__ == gmgn_scrape.__name__:
+                if inspect.isfunction(vars(obj).get("__init__")):
+                    stack.append(vars(obj)["__init__"])
+            elif name in module and _const_repr(obj) is not None:
+                pieces[f"const:{name}"] = _const_repr(obj)
+            stack.extend(_class_members().get(name, ()))
+    return pieces
+
+
+def _digest(pieces: Dict[str, str]) -> str:
+    h = hashlib.sha256()
+    for key in sorted(pieces):
+        h.update(key.encode())
+        h.update(b"\0")
+        h.update(pieces[key].encode())
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def strategy_version(fn: StrategyFn) -> str:
+    """Hash of a strategy's code and everything it reaches in gmgn_scrape"""
+    return _digest(_reachable(fn))
+
+
+@functools.lru_cache(maxsize=None)
+def engine_version() -> str:
+    """Hash of the engine loop, the metrics pass and the parser libraries every strategy shares"""
+    import bs4
+    from lxml import etree
+
+    pieces = _reachable(run_extraction_engine)
+    pieces.update(_reachable(PageDocument.__init__))
+    pieces["lib:bs4"] = bs4.__version__
+    pieces["lib:lxml"] = ".".join(map(str, etree.LXML_VERSION))
+    pieces["lib:libxml2"] = ".".join(map(str, etree.LIBXML_VERSION))
+    return _digest(pieces)
+
+
+def extractor_versions(strategies: Optional[List[Tuple[str, StrategyFn]]] = None) -> Dict[str, str]:
+    """{"engine": ..., <strategy name>: ...} for the given (default: all) strategies"""
+    versions = {"engine": engine_version()}
+    for name, fn in strategies if strategies is not None else EXTRACTION_STRATEGIES:
+        versions[name] = strategy_version(fn)
+    return versions
+
+
+def _still_valid(attempted: Dict[str, str], winner: Optional[str], strategies: List[Tuple[str, StrategyFn]]) -> bool:
+    # The engine would try the same strategies with the same code and stop at the same winner
+    tried = 0
+    for name, fn in strategies:
+        if attempted.get(name) != strategy_version(fn):
+            return False
+        tried += 1
+        if name == winner:
+            break
+    return tried == len(attempted)
+
+
+class ExtractMemo:
+    """
+    Args:
+        path: SQLite file holding the memo (created on first use)
+    """
+
+    def __init__(self, path: Union[str, Path] = EXTRACT_MEMO_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # timeout: batch workers in other processes may be writing at the same moment
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # A lost tail of entries after a crash only costs re-extraction, so skip the per-commit fsync
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.counts = {"hits": 0, "misses": 0, "stale": 0}
+        self._unflushed = dict.fromkeys(self.counts, 0)
+        self.hash_seconds = 0.0
+
+    def _bump(self, name: str) -> None:
+        # Hits must not pay for a write; counters reach the database in flush()
+        with self._lock:
+            self.counts[name] += 1
+            self._unflushed[name] += 1
+
+    def flush(self) -> None:
+        """Add this process's unsaved hit / miss counts to the all-time counters"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                [(name, n) for name, n in self._unflushed.items() if n],
+            )
+            self._unflushed = dict.fromkeys(self.counts, 0)
+
+    def extract(self, html: Union[str, bytes], strategies: Optional[List[Tuple[str, StrategyFn]]] = None, debug: bool = False, profile: bool = False) -> Tuple[Optional[float], Dict[str, Any]]:
+        """
+        Same as gmgn_scrape.extract_7d_realized_pnl_from_html(), served from the
+        memo when this page was already extracted by the current code.
+        ``info["memo"]`` is "hit", "miss" or "stale" (extracted again after a code change).
+        A hit still reports every strategy the engine tried on the page, as profile
+        records marked ``"memo": True`` (a hit flag, no timings), so PROFILE_HOOKS
+        and ``profile`` see served pages as well as extracted ones.
+        """
+        if strategies is None:
+            strategies = gmgn_scrape._default_strategies
+        start = time.perf_counter()
+        raw = html.encode("utf-8") if isinstance(html, str) else html
+        sha = hashlib.sha256(raw).hexdigest()
+        self.hash_seconds += time.perf_counter() - start
+        engine = engine_version()
+
+        with self._lock:
+            row = self._conn.execute("SELECT engine, attempted, winner, value, info FROM memo WHERE sha256 = ?", (sha,)).fetchone()
+        status = "miss"
+        if row is not None:
+            if row[0] == engine and _still_valid(json.loads(row[1]), row[2], strategies):
+                self._bump("hits")
+                info = self._shape(json.loads(row[4]), "hit", debug)
+                records = {name: {"hit": name == row[2], "memo": True} for name in info["engine"]["strategies_attempted"]}
+                for name, record in records.items():
+                    for hook in gmgn_scrape.PROFILE_HOOKS:
+                        hook(name, record)
+                if profile:
+                    info["profile"] = records
+                return row[3], info
+            status = "stale"
+        self._bump("misses" if status == "miss" else "stale")
+
+        # Always keep the matched text, so a later --debug run can be served from the memo too
+        value, info = run_extraction_engine(PageDocument(html), strategies=strategies, debug=True, profile=profile)
+        tried = info["engine"]["strategies_attempted"]
+        attempted = {name: strategy_version(fn) for name, fn in strategies if name in tried}
+        stored = {key: v for key, v in info.items() if key != "profile"}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO memo (sha256, engine, attempted, winner, value, info, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (sha, engine, json.dumps(attempted), info.get("strategy"), value, json.dumps(stored, ensure_ascii=False), time.time()),
+            )
+        return value, self._shape(info, status, debug)
+
+    @staticmethod
+    def _shape(info: Dict[str, Any], status: str, debug: bool) -> Dict[str, Any]:
+        info = dict(info)
+        if not debug:
+            info.pop("raw_money", None)
+        info["memo"] = status
+        return info
+
+    def prune(self) -> int:
+        """Delete entries the current code (in the default strategy order) would not serve; returns how many"""
+        engine = engine_version()
+        with self._lock:
+            rows = self._conn.execute("SELECT sha256, engine, attempted, winner FROM memo").fetchall()
+            stale = [(sha,) for sha, e, attempted, winner in rows if e != engine or not _still_valid(json.loads(attempted), winner, gmgn_scrape._default_strategies)]
+            with self._conn:
+                self._conn.executemany("DELETE FROM memo WHERE sha256 = ?", stale)
+        return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        self.flush()
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM memo").fetchone()[0]
+            totals = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        lookups = sum(self.counts.values())
+        return {
+            "entries": entries,
+            "run": {**self.counts, "hit_rate": round(self.counts["hits"] / lookups, 3) if lookups else None, "hash_ms": round(self.hash_seconds * 1000, 3)},
+            "all_time": {name: totals.get(name, 0) for name in self.counts},
+        }
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+
+@functools.lru_cache(maxsize=None)
+def shared_memo(path: str) -> ExtractMemo:
+    """One ExtractMemo per path per process, for batch workers"""
+    return ExtractMemo(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect or prune the extraction memo")
+    parser.add_argument("--db", default=str(EXTRACT_MEMO_DB), help=f"Memo database (default: {EXTRACT_MEMO_DB}; or set GMGN_EXTRACT_MEMO)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entries and all-time hits / misses / stale re-extractions")
+    sub.add_parser("versions", help="Current engine and per-strategy code versions")
+    sub.add_parser("prune", help="Delete entries invalidated by code changes")
+    sub.add_parser("clear", help="Delete every entry")
+    args = parser.parse_args()
+
+    if args.command == "versions":
+        print(json.dumps(extractor_versions(), indent=2))
+        return
+    memo = ExtractMemo(args.db)
+    try:
+        if args.command == "stats":
+            stats = memo.stats()
+            print(json.dumps({"entries": stats["entries"], **stats["all_time"]}, indent=2))
+        elif args.command == "prune":
+            print(json.dumps({"pruned": memo.prune()}))
+        else:
+            with memo._conn:
+                cleared = memo._conn.execute("DELETE FROM memo").rowcount
+            print(json.dumps({"cleared": cleared}))
+    finally:
+        memo.close()
+
+
+if __name__ == "__main__":
+    main()
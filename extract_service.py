@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Resident extraction service with a local HTTP/JSON API.
+Imports, compiled heuristics, the extraction memo, the page cache, pooled HTTP
+connections and (with --selenium) warm browser sessions are set up once and
+shared by every request, instead of paying a fresh gmgn_scrape.py process per
+page. Responses use the same result schema as gmgn_scrape.py's main().
+
+    POST /extract   {"html": "<html>..."} | {"file": "page.html"} | {"wallet_address": "4eK5..."}
+                    optional: "wallet" (label), "chain", "debug", "selenium"
+                    (a text/html body is taken as {"html": <body>})
+    GET  /stats     request counts, latency percentiles, memo / cache / pool figures
+    GET  /health
+"""
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from gmgn_scrape import (
+    GMGN_BASE_URL,
+    build_result,
+    extract_7d_realized_pnl_from_html,
+    extract_html_file,
+    fetch_live_wallet_pnl,
+    fetch_live_wallet_pnl_simple,
+    wallet_label_from_address,
+    wallet_label_from_path,
+)
+
+
+SERVICE_PORT = 8766
+
+# Latencies kept per request kind for the percentiles (a sliding window, not the whole uptime)
+LATENCY_WINDOW = 10000
+
+REQUEST_KINDS = ("html", "file", "wallet")
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def percentiles(samples: List[float], points: Tuple[int, ...] = (50, 90, 99)) -> Dict[str, Optional[float]]:
+    """Nearest-rank percentiles of latencies in seconds, reported in ms"""
+    if not samples:
+        return {**{f"p{p}": None for p in points}, "max": None}
+    ordered = sorted(samples)
+    out: Dict[str, Optional[float]] = {}
+    for p in points:
+        rank = max(0, min(len(ordered) - 1, -(-p * len(ordered) // 100) - 1))
+        out[f"p{p}"] = round(ordered[rank] * 1000, 3)
+    out["max"] = round(ordered[-1] * 1000, 3)
+    return out
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"ok": True, "uptime_seconds": round(time.monotonic() - self.server.started, 3)})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.stats())
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/extract":
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        start = time.perf_counter()
+        kind = None
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > self.server.max_body:
+                raise RequestError(413, f"body larger than {self.server.max_body} bytes")
+            body = self.rfile.read(length)
+            if (self.headers.get("Content-Type") or "").startswith("text/html"):
+                request: Dict[str, Any] = {"html": body}
+            else:
+                try:
+                    request = json.loads(body or b"{}")
+                except ValueError as e:
+                    raise RequestError(400, f"invalid JSON: {e}")
+                if not isinstance(request, dict):
+                    raise RequestError(400, "expected a JSON object")
+            kind, result = self.server.extract(request)
+            status = 200
+        except RequestError as e:
+            status, result = e.status, {"error": str(e)}
+        except Exception as e:
+            status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+        self.server.observe(kind, status, time.perf_counter() - start)
+        self._send_json(status, result)
+
+
+class ExtractionService(ThreadingHTTPServer):
+    """
+    Args:
+        address: (host, port); port 0 picks a free port
+        memo: Optional extract_memo.ExtractMemo for html / file requests
+        page_cache: Optional page_cache.PageCache for wallet requests
+        cache_max_age: Serve wallet requests from page_cache if a page this fresh exists
+        scheduler: Optional fetch_scheduler.FetchScheduler for wallet requests
+        pool: Optional driver_pool.DriverPool; wallet requests with "selenium" use its warm sessions
+        base_url: Site root for plain-HTTP wallet requests
+        concurrency: Pooled keep-alive connections for plain-HTTP wallet requests
+        files_root: Directory "file" requests must resolve inside (default: the current directory);
+            relative names are taken from it
+        record: Append every result to profit.jsonl / pnl_history.db (profit.xlsx is exported at shutdown)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, memo=None, page_cache=None, cache_max_age: float = 0, scheduler=None, pool=None, base_url: str = GMGN_BASE_URL, concurrency: int = 8, files_root: Optional[str] = None, record: bool = False, max_body: int = 64 * 1024 * 1024, verbose: bool = False):
+        super().__init__(address, ServiceHandler)
+        from async_fetch import make_session
+
+        self.memo = memo
+        self.page_cache = page_cache
+        self.cache_max_age = cache_max_age
+        self.scheduler = scheduler
+        self.pool = pool
+        self.base_url = base_url
+        self.session = make_session(concurrency)
+        self.files_root = Path(files_root or ".").resolve()
+        self.record = record
+        self.max_body = max_body
+        self.verbose = verbose
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {kind: deque(maxlen=LATENCY_WINDOW) for kind in REQUEST_KINDS}
+        self._counts = {"requests": 0, "errors": 0, **{kind: 0 for kind in REQUEST_KINDS}}
+        self._recorded: List[Dict[str, Any]] = []
+
+    def warm_up(self, page: Optional[str] = None) -> float:
+        """Run one extraction (and compute memo versions) before the first request; returns seconds taken"""
+        start = time.perf_counter()
+        sample = Path(page) if page else Path(__file__).with_name("debug_wallet_page.html")
+        if sample.exists():
+            extract_7d_realized_pnl_from_html(sample.read_bytes())
+        if self.memo is not None:
+            from extract_memo import extractor_versions
+            extractor_versions()
+        return time.perf_counter() - start
+
+    def _file_path(self, name: str) -> Path:
+        # Symlinks and ".." are resolved first, so neither can step outside the root
+        path = (self.files_root / Path(name).expanduser()).resolve()
+        if self.files_root not in path.parents:
+            raise RequestError(403, f"{name} is outside {self.files_root}")
+        if not path.is_file():
+            raise RequestError(404, f"file not found: {name}")
+        return path
+
+    def extract(self, request: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Handle one /extract request; returns (kind, result record)"""
+        debug = bool(request.get("debug"))
+        label = request.get("wallet")
+        if request.get("html") is not None:
+            html = request["html"]
+            if self.memo is not None:
+                value, info = self.memo.extract(html, debug=debug)
+            else:
+                value, info = extract_7d_realized_pnl_from_html(html, debug=debug)
+            kind, result = "html", build_result(label or "Unknown", value, info, debug=debug)
+        elif request.get("file"):
+            path = self._file_path(request["file"])
+            kind, result = "file", extract_html_file(path, label or wallet_label_from_path(path), debug=debug, memo=self.memo)
+        elif request.get("wallet_address"):
+            address = request["wallet_address"]
+            chain = request.get("chain") or "sol"
+            if request.get("selenium"):
+                if self.pool is None:
+                    raise RequestError(400, "browser sessions are disabled; start the service with --selenium")
+                value, info = fetch_live_wallet_pnl(address, chain=chain, debug=debug, pool=self.pool, page_cache=self.page_cache, cache_max_age=self.cache_max_age, scheduler=self.scheduler)
+            else:
+                value, info = fetch_live_wallet_pnl_simple(address, chain=chain, debug=debug, page_cache=self.page_cache, cache_max_age=self.cache_max_age, session=self.session, base_url=self.base_url, scheduler=self.scheduler)
+            kind, result = "wallet", build_result(label or wallet_label_from_address(address), value, info, url=info.get("url"), debug=debug)
+            if info.get("error"):
+                result["error"] = info["error"]
+        else:
+            raise RequestError(400, 'expected one of "html", "file" or "wallet_address"')
+        if self.record and "error" not in result:
+            self._record(result)
+        return kind, result
+
+    def _record(self, result: Dict[str, Any]) -> None:
+        from pnl_history import record_results
+        from results_store import append_result, utc_timestamp
+
+        result = dict(result, captured_at=utc_timestamp())
+        with self._lock:
+            append_result(result)
+            record_results([result])
+            self._recorded.append(result)
+
+    def observe(self, kind: Optional[str], status: int, seconds: float) -> None:
+        with self._lock:
+            self._counts["requests"] += 1
+            if status >= 400:
+                self._counts["errors"] += 1
+            elif kind is not None:
+                self._counts[kind] += 1
+                self._latencies[kind].append(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            samples = {kind: list(values) for kind, values in self._latencies.items()}
+        out: Dict[str, Any] = {
+            "uptime_seconds": round(time.monotonic() - self.started, 3),
+            **counts,
+            "latency_ms": {kind: percentiles(values) for kind, values in samples.items() if values},
+        }
+        everything = [v for values in samples.values() for v in values]
+        if everything:
+            out["latency_ms"]["all"] = percentiles(everything)
+        if self.memo is not None:
+            out["memo"] = self.memo.stats()
+        if self.page_cache is not None:
+            out["page_cache"] = self.page_cache.stats()
+        if self.scheduler is not None:
+            out["scheduler"] = self.scheduler.stats()
+        if self.pool is not None:
+            out["pool"] = self.pool.stats()
+        return out
+
+    @property
+    def base(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def close(self) -> None:
+        """Export profit.xlsx if anything was recorded and release the shared resources"""
+        self.server_close()
+        if self._recorded:
+            from results_store import export_excel
+            export_excel()
+        self.session.close()
+        if self.pool is not None:
+            self.pool.close()
+        if self.memo is not None:
+            self.memo.close()
+        if self.page_cache is not None:
+            self.page_cache.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve PnL extraction over a local HTTP/JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help=f"Port (default: {SERVICE_PORT})")
+    parser.add_argument("--memo", nargs="?", const="", metavar="DB", help="Serve html / file requests from the extraction memo (default DB: ~/.cache/gmgn_scrape/extract_memo.db)")
+    parser.add_argument("--page-cache", help="Directory of the compressed page cache used by wallet requests")
+    parser.add_argument("--cache-max-age", type=float, default=0, help="Serve wallet requests from the page cache if a page this many seconds old exists (default: 0)")
+    parser.add_argument("--base-url", default=GMGN_BASE_URL, help=f"Site root for plain-HTTP wallet requests (default: {GMGN_BASE_URL})")
+    parser.add_argument("--concurrency", type=int, default=8, help="Pooled connections for plain-HTTP wallet requests (default: 8)")
+    parser.add_argument("--rate", type=float, help="Max requests per second to the site for wallet requests (default: unlimited)")
+    parser.add_argument("--selenium", action="store_true", help="Keep a pool of warm browser sessions for wallet requests with \"selenium\": true")
+    parser.add_argument("--pool-size", type=int, default=2, help="Browser sessions with --selenium (default: 2)")
+    parser.add_argument("--prewarm", action="store_true", help="Launch the browser sessions at startup instead of on first use")
+    parser.add_argument("--browser", choices=["firefox", "chrome"], default="firefox")
+    parser.add_argument("--cookies", help="Cookies file for the browser sessions")
+    parser.add_argument("--files-root", help="Only serve file requests inside this directory (default: the current directory)")
+    parser.add_argument("--record", action="store_true", help="Append results to profit.jsonl / pnl_history.db; profit.xlsx is exported at shutdown")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    memo = None
+    if args.memo is not None:
+        from extract_memo import EXTRACT_MEMO_DB, ExtractMemo
+        memo = ExtractMemo(args.memo or EXTRACT_MEMO_DB)
+    page_cache = None
+    if args.page_cache:
+        from page_cache import PageCache
+        page_cache = PageCache(args.page_cache)
+    scheduler = None
+    if args.rate:
+        from fetch_scheduler import FetchScheduler
+        scheduler = FetchScheduler(rate=args.rate, concurrency=max(args.concurrency, args.pool_size))
+    pool = None
+    if args.selenium:
+        from driver_pool import gmgn_driver_pool
+        pool = gmgn_driver_pool(size=args.pool_size, browser=args.browser, cookies_file=args.cookies, scheduler=scheduler)
+        if args.prewarm:
+            pool.prewarm()
+
+    service = ExtractionService(
+        (args.host, args.port), memo=memo, page_cache=page_cache, cache_max_age=args.cache_max_age, scheduler=scheduler,
+        pool=pool, base_url=args.base_url, concurrency=args.concurrency, files_root=args.files_root, record=args.record, verbose=args.verbose,
+    )
+    # Stop cleanly (final stats, Excel export) on SIGTERM too, and on SIGINT even when started in the background
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, signal.default_int_handler)
+    warm = service.warm_up()
+    print(f"Serving extraction at {service.base}/extract (stats at /stats); warm-up took {warm * 1000:.0f} ms", file=sys.stderr)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps({"service": service.stats()}), file=sys.stderr)
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
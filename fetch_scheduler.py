@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Central per-host request scheduler for polite high-volume fetching.
+Every request to a host takes a token from that host's bucket (the configured
+rate) and a slot from its concurrency ceiling. HTTP 429 and 5xx responses are
+retried with jittered exponential backoff; a 429 also pauses the host and
+lowers its rate, which then creeps back up, so sustained throughput settles
+just under whatever the site actually allows.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+
+# Responses worth retrying; anything else is returned to the caller as-is
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Args:
+        rate: Tokens added per second
+        burst: Bucket capacity (requests allowed back to back after idling)
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return False
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+                else:
+                    delay = self._paused_until - now
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds`` and drop any saved-up burst"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+
+class _Host:
+    def __init__(self, rate: float, burst: float, concurrency: int):
+        self.max_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.counts = {"requests": 0, "retries": 0, "throttled": 0, "server_errors": 0, "failures": 0}
+        self.wait_seconds = 0.0
+        self.first = self.last = None
+
+
+class FetchScheduler:
+    """
+    Args:
+        rate: Requests per second allowed per host
+        burst: Requests a host may receive back to back after idling (default: 1)
+        concurrency: Requests in flight per host at once
+        max_retries: Retries after a 429/5xx or a connection error
+        backoff_base: First backoff ceiling in seconds; doubles per retry
+        backoff_max: Upper bound on a single backoff
+    """
+
+    def __init__(self, rate: float = 2.0, burst: float = 1.0, concurrency: int = 4, max_retries: int = 4, backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> _Host:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _Host(self.rate, self.burst, self.concurrency)
+            return self._hosts[host]
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold one of the host's concurrency slots and one rate token for a request"""
+        host = self._host(url)
+        with host.slots:
+            waited = host.bucket.acquire()
+            with self._lock:
+                host.wait_seconds += waited
+                host.counts["requests"] += 1
+                host.last = time.monotonic()
+                if host.first is None:
+                    host.first = host.last
+            yield
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than a server's Retry-After"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    def _throttled(self, host: _Host, delay: float) -> None:
+        # Multiplicative decrease on 429; _succeeded() adds the rate back a little at a time
+        host.bucket.rate = max(host.max_rate * 0.1, host.bucket.rate * 0.7)
+        host.bucket.pause(delay)
+
+    def _succeeded(self, host: _Host) -> None:
+        if host.bucket.rate < host.max_rate:
+            host.bucket.rate = min(host.max_rate, host.bucket.rate + host.max_rate * 0.02)
+
+    def call(self, url: str, fn: Callable[[], Any], status_of: Callable[[Any], Optional[int]] = lambda r: None, retry_exceptions: tuple = ()) -> Any:
+        """
+        Run ``fn`` (one request to ``url``) under the host's rate and concurrency
+        limits, retrying while ``status_of(result)`` is a retryable status or
+        ``fn`` raises one of ``retry_exceptions``. Returns the last result.
+        """
+        host = self._host(url)
+        attempt = 0
+        while True:
+            try:
+                with self.slot(url):
+                    result = fn()
+            except retry_exceptions:
+                if attempt >= self.max_retries:
+                    with self._lock:
+                        host.counts["failures"] += 1
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                status = status_of(result)
+                if status not in RETRY_STATUSES:
+                    self._succeeded(host)
+                    return result
+                if attempt >= self.max_retries:
+                    with self._lock:
+                        host.counts["failures"] += 1
+                    return result
+                delay = self.backoff(attempt, _retry_after(result))
+                with self._lock:
+                    host.counts["throttled" if status == 429 else "server_errors"] += 1
+                if status == 429:
+                    self._throttled(host, delay)
+            with self._lock:
+                host.counts["retries"] += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, client: Any, url: str, **kwargs: Any) -> Any:
+        """``client.get(url, **kwargs)`` (a requests.Session or the requests module) with scheduling and retries"""
+        import requests
+
+        return self.call(
+            url,
+            lambda: client.get(url, **kwargs),
+            status_of=lambda r: r.status_code,
+            retry_exceptions=(requests.ConnectionError, requests.Timeout),
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for name, host in self._hosts.items():
+                span = (host.last - host.first) if host.first is not None else 0.0
+                out[name] = {
+                    **host.counts,
+                    "configured_rate": host.max_rate,
+                    "current_rate": round(host.bucket.rate, 3),
+                    # Request starts per second over the run; the first request opens the window
+                    "achieved_rate": round((host.counts["requests"] - 1) / span, 3) if span > 0 else None,
+                    "wait_seconds": round(host.wait_seconds, 3),
+                }
+        return out
+
+
+def _retry_after(response: Any) -> Optional[float]:
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
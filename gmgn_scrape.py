@@ -1,23 +1,21 @@
 import argparse
 import json
 import re
+import sys
 import time
+from bisect import bisect_left
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
-
-from bs4 import BeautifulSoup  # type: ignore
-import pandas as pd  # type: ignore
-import requests
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from results_store import utc_timestamp
+
+# selenium, requests and bs4 are imported where a live fetch or a soup parse
+# actually happens, so offline extraction only loads what it uses
+# (see bench_startup.py)
+if TYPE_CHECKING:
+    import requests
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
 
 
 MONEY_REGEX = re.compile(r"-?\$\s?\d{1,3}(?:,\d{3})*(?:\.\d+)?|-?\$\s?\d+(?:\.\d+)?")
@@ -28,6 +26,11 @@ def read_file_text(path: Path) -> str:
         return f.read()
 
 
+def read_file_bytes(path: Path) -> bytes:
+    with path.open("rb") as f:
+        return f.read()
+
+
 
 
 def normalize_money_to_float(text: str) -> Optional[float]:
@@ -43,59 +46,497 @@ def normalize_money_to_float(text: str) -> Optional[float]:
         return None
 
 
-def extract_7d_realized_pnl_from_html(html: str, debug: bool = False) -> Tuple[Optional[float], Dict[str, Any]]:
-    info: Dict[str, Any] = {"strategy": None, "context": None}
+def format_money(value: float) -> str:
+    """Render a number the way the page shows money, e.g. -$1,284.68."""
+    sign = "-" if value < 0 else ""
+    return f"{sign}${abs(value):,.2f}"
+
+
+# Field names GMGN uses for 7D realized PnL in __NEXT_DATA__ / API payloads
+REALIZED_PNL_7D_KEY = re.compile(r"^(realized_?(profit|pnl)_?7d|pnl_?7d|7d_?realized_?(profit|pnl))$", re.IGNORECASE)
+
+# Field names of the other headline metrics, by result key. Win rate is kept as a fraction (0.42).
+METRIC_FIELD_KEYS = {
+    "pnl_30d": re.compile(r"^(realized_?(profit|pnl)_?30d|pnl_?30d|30d_?realized_?(profit|pnl))$", re.IGNORECASE),
+    "winrate": re.compile(r"^win_?rate(_?7d)?$", re.IGNORECASE),
+    "unrealized_pnl": re.compile(r"^unrealized_?(profit|pnl)$", re.IGNORECASE),
+    "total_pnl": re.compile(r"^total_?(profit|pnl)$", re.IGNORECASE),
+}
+HEADLINE_METRICS = list(METRIC_FIELD_KEYS)
+
+# Bare "pnl_7d" / "pnl_30d" can be a ratio rather than realized USD, so any realized_* spelling outranks
+# it, and it is ignored outright in an object that also has a realized_* key for the same period
+BARE_PNL_KEY = re.compile(r"^pnl_?(7d|30d)$", re.IGNORECASE)
+NEXT_DATA_MARKER = "__NEXT_DATA__"
+
+
+def find_next_data_blob(raw: Union[str, bytes]) -> Optional[Union[str, bytes]]:
+    """Cut the ``<script id="__NEXT_DATA__">`` body out of raw markup without building a DOM."""
+    if isinstance(raw, bytes):
+        marker, lt, gt, close = NEXT_DATA_MARKER.encode(), b"<", b">", b"</script"
+    else:
+        marker, lt, gt, close = NEXT_DATA_MARKER, "<", ">", "</script"
+    pos = raw.find(marker)
+    while pos != -1:
+        tag_start = raw.rfind(lt, 0, pos)
+        tag_end = raw.find(gt, pos)
+        if tag_start != -1 and tag_end != -1 and raw[tag_start + 1 : tag_start + 7].lower() in ("script", b"script"):
+            body_end = raw.find(close, tag_end)
+            if body_end != -1:
+                return raw[tag_end + 1 : body_end]
+        pos = raw.find(marker, pos + len(marker))
+    return None
+
+
+def metric_for_field(key: str) -> Optional[str]:
+    """Result key ("pnl_7d", "pnl_30d", ...) a payload field name maps to, if any"""
+    if REALIZED_PNL_7D_KEY.match(key):
+        return "pnl_7d"
+    for metric, pattern in METRIC_FIELD_KEYS.items():
+        if pattern.match(key):
+            return metric
+    return None
+
+
+def field_rank(key: str) -> int:
+    """0 for an explicit realized-PnL (or other metric) field name, 1 for a bare pnl_7d / pnl_30d"""
+    return 1 if BARE_PNL_KEY.match(key) else 0
+
+
+def best_field(fields: Dict[str, float], metric: str) -> Optional[Tuple[str, float]]:
+    """(key, value) of the most specific field for ``metric``; the first seen among equals"""
+    best = None
+    for key, value in fields.items():
+        if metric_for_field(key) == metric and (best is None or field_rank(key) < field_rank(best[0])):
+            best = (key, value)
+    return best
+
+
+def _shadowed_bare_key(obj: Dict[Any, Any], key: str) -> bool:
+    # A bare pnl_7d / pnl_30d next to a realized_* key for the same metric
+    metric = metric_for_field(key)
+    return any(isinstance(k, str) and k != key and not BARE_PNL_KEY.match(k) and metric_for_field(k) == metric for k in obj)
+
+
+def _realized_pnl_fields(obj: Any, fields: Dict[str, float], depth: int = 0) -> None:
+    # Collect numeric headline-metric fields (7D realized PnL first among them) anywhere in a decoded JSON payload
+    if depth > 32:
+        return
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(k, str) and k not in fields and metric_for_field(k) and not (BARE_PNL_KEY.match(k) and _shadowed_bare_key(obj, k)):
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    fields[k] = float(v)
+                elif isinstance(v, str):
+                    num = normalize_money_to_float(v) if "$" in v else None
+                    if num is None:
+                        try:
+                            num = float(v.replace(",", ""))
+                        except ValueError:
+                            num = None
+                    if num is not None:
+                        fields[k] = num
+            if isinstance(v, (dict, list)):
+                _realized_pnl_fields(v, fields, depth + 1)
+    elif isinstance(obj, list):
+        for it in obj:
+            _realized_pnl_fields(it, fields, depth + 1)
+
+
+def extract_next_data_fields(raw: Union[str, bytes]) -> Dict[str, float]:
+    """Fast path: return 7D realized PnL and other headline-metric fields straight from the __NEXT_DATA__ blob.
+
+    Returns an empty dict when the blob is missing, malformed or has no such field.
+    """
+    blob = find_next_data_blob(raw)
+    if not blob:
+        return {}
+    try:
+        data = json.loads(blob)
+    except ValueError:
+        return {}
+    fields: Dict[str, float] = {}
+    _realized_pnl_fields(data, fields)
+    return fields
+
+
+CONTEXT_REGEX = re.compile(r"7\s*D|Realized|PnL|Profit", re.IGNORECASE)
+
+# Class / style of the div GMGN renders the 7D Realized PnL value in
+TARGETED_DIV_CLASS = re.compile(r"flex.*font-medium.*text-\[12px\].*ml-\[4px\]")
+RED_DIV_STYLE = re.compile(r"color:\s*rgb\(242,\s*102,\s*130\)")
+
+
+# One pass over case-folded raw text finds every keyword the raw-text fallbacks key on
+RAW_KEYWORD_REGEX = re.compile(r"7\s*d|realized|profit|pnl")
+RAW_KEYWORD_KINDS = {"r": "realized", "pr": "profit", "pn": "pnl"}
+# The only characters re.IGNORECASE folds onto those keyword letters that str.lower() does not
+CASE_FOLD_EXTRA = {0x130: "i", 0x131: "i"}
+DOLLAR_DIGIT_REGEX = re.compile(r"\$\s?-?\d")
+DOLLAR_AMOUNT_REGEX = re.compile(r"\$\s?-?\d[\d,]*(?:\.\d+)?")
+
+
+def _is_word_char(ch: str) -> bool:
+    # What \b treats as a word character
+    return ch.isalnum() or ch == "_"
+
+
+def _fold_case(text: str) -> str:
+    # Lower-case without changing any offsets, so matches map straight back onto ``text``
+    if "\u0130" in text or "\u0131" in text:
+        text = text.translate(CASE_FOLD_EXTRA)
+    return text.lower()
+
+
+class TextTokens:
+    """Keyword offsets from a single lazy pass over a text.
+
+    The raw-text fallbacks resolve proximity from these offsets instead of each
+    walking the text with its own searches; amounts are then only looked for
+    inside the windows the keywords define. The pass only advances as far as a
+    lookup needs, so a fallback that hits early still stops early.
+    ``regex_calls`` counts every regex search/match it has run.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.regex_calls = 0
+        self.seven_starts: List[int] = []
+        self.seven_ends: List[int] = []
+        self.word_starts: List[int] = []
+        self.word_ends: List[int] = []
+        self.word_kinds: List[str] = []
+        self.scanned = 0
+        self._matches = RAW_KEYWORD_REGEX.finditer(_fold_case(text))
+        self._exhausted = False
+
+    def _next(self) -> bool:
+        self.regex_calls += 1
+        m = next(self._matches, None)
+        if m is None:
+            self._exhausted = True
+            self.scanned = len(self.text)
+            return False
+        start, end = m.span()
+        token = m.group()
+        if token[0] == "7":
+            self.seven_starts.append(start)
+            self.seven_ends.append(end)
+        else:
+            self.word_starts.append(start)
+            self.word_ends.append(end)
+            self.word_kinds.append(RAW_KEYWORD_KINDS[token[:1] if token[0] == "r" else token[:2]])
+        self.scanned = end
+        return True
+
+    def advance(self, pos: int) -> None:
+        """Scan until every keyword starting before ``pos`` is recorded"""
+        while self.scanned < pos and not self._exhausted:
+            self._next()
+
+    def _have(self, items: List[int], i: int) -> bool:
+        while len(items) <= i:
+            if not self._next():
+                return False
+        return True
+
+    def sevens(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """7D markers starting in [start, end)"""
+        if end is not None:
+            self.advance(end)
+        i = bisect_left(self.seven_starts, start)
+        while self._have(self.seven_starts, i) and (end is None or self.seven_starts[i] < end):
+            yield self.seven_starts[i], self.seven_ends[i]
+            i += 1
+
+    def words(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int, str]]:
+        """Realized / Profit / PnL keywords starting in [start, end)"""
+        if end is not None:
+            self.advance(end)
+        i = bisect_left(self.word_starts, start)
+        while self._have(self.word_starts, i) and (end is None or self.word_starts[i] < end):
+            yield self.word_starts[i], self.word_ends[i], self.word_kinds[i]
+            i += 1
+
+    def first_dollar(self, start: int, end: int) -> Optional[int]:
+        """Offset of the first "$<digit>" / "$-<digit>" starting in [start, end)"""
+        pos = self.text.find("$", start, end)
+        while pos != -1 and not self.match(DOLLAR_DIGIT_REGEX, pos):
+            pos = self.text.find("$", pos + 1, end)
+        return None if pos == -1 else pos
+
+    def last_dollar(self, start: int, end: int) -> Optional[int]:
+        """Offset of the last "$<digit>" / "$-<digit>" starting in [start, end)"""
+        pos = self.text.rfind("$", start, end)
+        while pos != -1 and not self.match(DOLLAR_DIGIT_REGEX, pos):
+            pos = self.text.rfind("$", start, pos)
+        return None if pos == -1 else pos
 
+    def first_money(self, start: int, end: int) -> Optional[str]:
+        """Same as MONEY_REGEX.search(text[start:end]), without copying the slice"""
+        self.regex_calls += 1
+        m = MONEY_REGEX.search(self.text, start, end)
+        return m.group(0) if m else None
+
+    def match(self, pattern: "re.Pattern[str]", pos: int) -> Optional["re.Match[str]"]:
+        """``pattern.match(text, pos)``, counted"""
+        self.regex_calls += 1
+        return pattern.match(self.text, pos)
+
+    def line_end(self, pos: int) -> int:
+        end = self.text.find("\n", pos)
+        return len(self.text) if end == -1 else end
+
+
+def _money_near_seven(tokens: TextTokens, before: int = 200, after: int = 400) -> Optional[Tuple[str, str]]:
+    # First 7D marker with an amount within ``before``/``after`` characters of it
+    for start, end in tokens.sevens():
+        window_start = max(0, start - before)
+        money = tokens.first_money(window_start, end + after)
+        if money:
+            return money, tokens.text[window_start : window_start + 200]
+    return None
+
+
+def _money_after_label(tokens: TextTokens) -> Optional[Tuple[str, str]]:
+    # First "Realized Profit/PnL" (else a standalone "PnL") with a "$<digit>" later on its line,
+    # and the first whole amount from that label to the end of the line
+    text = tokens.text
+
+    def realized_labels() -> Iterator[Tuple[int, int]]:
+        words = tokens.words()
+        prev = None
+        for word in words:
+            if prev is not None and prev[2] == "realized" and word[2] in ("profit", "pnl"):
+                gap = text[prev[1] : word[0]]
+                if not gap or gap.isspace():
+                    yield prev[0], word[1]
+            prev = word
+
+    def pnl_labels() -> Iterator[Tuple[int, int]]:
+        for start, end, kind in tokens.words():
+            if kind == "pnl" and (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end])):
+                yield start, end
+
+    for labels in (realized_labels(), pnl_labels()):
+        for start, end in labels:
+            line_end = tokens.line_end(end)
+            if tokens.first_dollar(end, line_end) is None:
+                continue
+            money = tokens.first_money(start, line_end)
+            if money:
+                return money, text[start:line_end][:120]
+            break
+    return None
+
+
+class _CountedPattern:
+    """A compiled regex handed to BeautifulSoup, counting the searches it runs on a document"""
+
+    def __init__(self, pattern: "re.Pattern[str]", doc: "PageDocument"):
+        self.pattern = pattern
+        self.doc = doc
+
+    def match(self, text: str) -> Optional["re.Match[str]"]:
+        self.doc._regex_calls += 1
+        return self.pattern.match(text)
+
+    def search(self, text: str) -> Optional["re.Match[str]"]:
+        return self.doc.search(self.pattern, text)
+
+
+class PageDocument:
+    """A page parsed once and shared by every extraction strategy.
+
+    The soup, element texts and full-page scans are computed on first use and
+    reused afterwards. Each further strategy that reuses a result is credited
+    with the time it would have spent redoing that work on its own.
+    Strategies run their regexes through search(), query the tree through
+    find_all() and iterate elements through visit(), so ``regex_calls`` and
+    ``nodes_visited`` are counts of work done, the library's own walks and
+    attribute matches included.
+    """
+
+    def __init__(self, html: Union[str, bytes]):
+        self.raw = html
+        self.fields: Dict[str, float] = {}
+        self.current_strategy: Optional[str] = None
+        self.parse_seconds = 0.0
+        self.parse_saved_seconds = 0.0
+        self.scan_saved_seconds = 0.0
+        self._soup = None
+        self._scans: Dict[str, Any] = {}
+        self._scan_seconds: Dict[str, float] = {}
+        self._consumers: Dict[str, set] = {}
+        self._texts: Dict[int, str] = {}
+        self._next_data_fields: Optional[Dict[str, float]] = None
+        self._raw_tokens: Optional[TextTokens] = None
+        # Per-strategy profile records; None unless the engine was asked to profile
+        self.profile: Optional[Dict[str, Dict[str, Any]]] = None
+        self.nodes_visited = 0
+        self._regex_calls = 0
+        self._node_count: Optional[int] = None
+
+    @property
+    def regex_calls(self) -> int:
+        """Regex calls run on this document so far, the shared token scan's included"""
+        return self._regex_calls + (self._raw_tokens.regex_calls if self._raw_tokens is not None else 0)
+
+    def search(self, pattern: "re.Pattern[str]", text: str) -> Optional["re.Match[str]"]:
+        """``pattern.search(text)``, counted"""
+        self._regex_calls += 1
+        return pattern.search(text)
+
+    def visit(self, nodes: Iterable[Any]) -> Iterator[Any]:
+        """Iterate ``nodes``, counting each one actually reached"""
+        for node in nodes:
+            self.nodes_visited += 1
+            yield node
+
+    def find_all(self, *args: Any, **kwargs: Any) -> List[Any]:
+        """``soup.find_all(...)``, counting the nodes it walks and the regex calls it makes"""
+        soup = self.soup
+        if self._node_count is None:
+            self._node_count = sum(1 for _ in soup.descendants)
+        # find_all without a limit walks every node below the root
+        self.nodes_visited += self._node_count
+        kwargs = {k: _CountedPattern(v, self) if isinstance(v, re.Pattern) else v for k, v in kwargs.items()}
+        return soup.find_all(*args, **kwargs)
+
+    def _note_use(self, key: str) -> bool:
+        """Record a strategy using a shared result; return True if it was a reuse."""
+        users = self._consumers.setdefault(key, set())
+        if self.current_strategy in users:
+            return False
+        users.add(self.current_strategy)
+        return len(users) > 1
+
+    @property
+    def html(self) -> str:
+        # Decoding is deferred so byte-level strategies never pay for it
+        if isinstance(self.raw, bytes):
+            self.raw = self.raw.decode("utf-8", errors="ignore")
+        return self.raw
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            from bs4 import BeautifulSoup  # type: ignore
+            start = time.perf_counter()
+            self._soup = BeautifulSoup(self.html, "lxml")
+            self.parse_seconds = time.perf_counter() - start
+        if self._note_use("__soup__"):
+            self.parse_saved_seconds += self.parse_seconds
+        return self._soup
+
+    @property
+    def parsed(self) -> bool:
+        return self._soup is not None
+
+    @property
+    def next_data_fields(self) -> Dict[str, float]:
+        # __NEXT_DATA__ is decoded at most once, for the fast path and the metrics alike
+        if self._next_data_fields is None:
+            self._next_data_fields = extract_next_data_fields(self.raw)
+        return self._next_data_fields
+
+    @property
+    def raw_tokens(self) -> TextTokens:
+        # One lazy keyword/amount scan of the raw HTML, shared by the raw-text fallbacks
+        if self._raw_tokens is None:
+            self._raw_tokens = TextTokens(self.html)
+        return self._raw_tokens
+
+    def used_soup(self, strategy: str) -> bool:
+        return strategy in self._consumers.get("__soup__", ())
+
+    def scan(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Run a full-page scan once and hand the cached result to later callers."""
+        if key not in self._scans:
+            start = time.perf_counter()
+            self._scans[key] = compute()
+            self._scan_seconds[key] = time.perf_counter() - start
+        if self._note_use(key):
+            self.scan_saved_seconds += self._scan_seconds[key]
+        return self._scans[key]
+
+    def text_of(self, el) -> str:
+        """Memoized ``get_text(strip=True)`` for an element of this document."""
+        key = id(el)
+        text = self._texts.get(key)
+        if text is None:
+            # What get_text(strip=True) joins, with each text node counted
+            text = "".join(self.visit(el.stripped_strings))
+            self._texts[key] = text
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "parse_ms": round(self.parse_seconds * 1000, 3),
+            "parse_saved_ms": round(self.parse_saved_seconds * 1000, 3),
+            "scan_saved_ms": round(self.scan_saved_seconds * 1000, 3),
+            "cached_texts": len(self._texts),
+        }
+
+
+# A strategy reads the shared document and returns (money_text, context) or None
+StrategyFn = Callable[[PageDocument], Optional[Tuple[str, str]]]
+
+
+def _strategy_next_data_fast(doc: PageDocument) -> Optional[Tuple[str, str]]:
+    # Pre-DOM fast path: read realized PnL fields from __NEXT_DATA__ with a byte scan
+    fields = doc.next_data_fields
+    doc.fields.update(fields)
+    best = best_field(fields, "pnl_7d")
+    if best:
+        return format_money(best[1]), f"__NEXT_DATA__ field {best[0]}"
+    return None
+
+
+def _context_of_parents(doc: PageDocument, div) -> str:
+    # Walk up from the value until an ancestor mentions 7D/Realized/PnL/Profit
+    parent_text = ""
+    for parent in doc.visit(div.parents):
+        if parent.get_text:
+            parent_text = doc.text_of(parent)
+            if doc.search(CONTEXT_REGEX, parent_text):
+                return parent_text
+    return parent_text
+
+
+def _strategy_targeted_css(doc: PageDocument) -> Optional[Tuple[str, str]]:
     # Heuristic 0: Targeted CSS selector for GMGN's 7D Realized PnL div
-    soup = BeautifulSoup(html, "lxml")
-    # Look for divs with the specific GMGN styling that contain money values
-    target_divs = soup.find_all("div", class_=re.compile(r"flex.*font-medium.*text-\[12px\].*ml-\[4px\]"))
-    for div in target_divs:
-        text = div.get_text(strip=True)
-        if MONEY_REGEX.search(text):
+    target_divs = doc.scan("targeted_divs", lambda: doc.find_all("div", class_=TARGETED_DIV_CLASS))
+    for div in doc.visit(target_divs):
+        text = doc.text_of(div)
+        money_match = doc.search(MONEY_REGEX, text)
+        if money_match:
             # Check if this div is in context of 7D/Realized/PnL
-            parent_context = ""
-            for parent in div.parents:
-                if parent.get_text:
-                    parent_text = parent.get_text(strip=True)
-                    if re.search(r"7\s*D|Realized|PnL|Profit", parent_text, re.IGNORECASE):
-                        parent_context = parent_text[:200]
-                        break
-            if parent_context or re.search(r"7\s*D|Realized|PnL|Profit", text, re.IGNORECASE):
-                money_match = MONEY_REGEX.search(text)
-                if money_match:
-                    info["strategy"] = "targeted_css_selector"
-                    info["context"] = f"Div: {text}, Parent: {parent_context[:100]}"
-                    if debug:
-                        info["raw_money"] = money_match.group(0)
-                    return normalize_money_to_float(money_match.group(0)), info
-
-    # Also try broader search for any div with the red color style (decrease-100)
-    red_divs = soup.find_all("div", style=re.compile(r"color:\s*rgb\(242,\s*102,\s*130\)"))
-    for div in red_divs:
-        text = div.get_text(strip=True)
-        if MONEY_REGEX.search(text):
+            parent_context = _context_of_parents(doc, div)
+            if not doc.search(CONTEXT_REGEX, parent_context):
+                parent_context = ""
+            if parent_context or doc.search(CONTEXT_REGEX, text):
+                return money_match.group(0), f"Div: {text}, Parent: {parent_context[:100]}"
+    return None
+
+
+def _strategy_red_color_style(doc: PageDocument) -> Optional[Tuple[str, str]]:
+    # Broader search for any div with the red color style (decrease-100)
+    red_divs = doc.scan("red_divs", lambda: doc.find_all("div", style=RED_DIV_STYLE))
+    for div in doc.visit(red_divs):
+        text = doc.text_of(div)
+        money_match = doc.search(MONEY_REGEX, text)
+        if money_match:
             # Check context for 7D/Realized
-            parent_text = ""
-            for parent in div.parents:
-                if parent.get_text:
-                    parent_text = parent.get_text(strip=True)
-                    if re.search(r"7\s*D|Realized|PnL|Profit", parent_text, re.IGNORECASE):
-                        break
-            if re.search(r"7\s*D|Realized|PnL|Profit", parent_text, re.IGNORECASE):
-                money_match = MONEY_REGEX.search(text)
-                if money_match:
-                    info["strategy"] = "red_color_style_selector"
-                    info["context"] = f"Red div: {text}, Context: {parent_text[:100]}"
-                    if debug:
-                        info["raw_money"] = money_match.group(0)
-                    return normalize_money_to_float(money_match.group(0)), info
+            parent_text = _context_of_parents(doc, div)
+            if doc.search(CONTEXT_REGEX, parent_text):
+                return money_match.group(0), f"Red div: {text}, Context: {parent_text[:100]}"
+    return None
 
-    # Heuristic 1: Find an "Analysis" card and within it a block mentioning 7D + (Realized|Profit|PnL)
 
+def _find_analysis_card(doc: PageDocument):
     # Locate the Analysis card container
-    analysis_card = None
-    for el in soup.find_all(string=True):
+    for el in doc.visit(doc.scan("all_strings", lambda: doc.find_all(string=True))):
         t = (el.string or "").strip()
         if t == "Analysis":
             # Prefer the parent that looks like a card (has padding classes or rounded)
@@ -109,82 +550,218 @@ def extract_7d_realized_pnl_from_html(html: str, debug: bool = False) -> Tuple[O
                 cls = parent.get("class") or []
                 # Tailwind-like classes appear in the saved HTML
                 if any(c.startswith("bg-") or c.startswith("p-") or c.startswith("rounded-") for c in cls):
-                    analysis_card = parent
-                    break
-            if analysis_card is not None:
-                break
+                    return parent
+    return None
 
-    def find_money_near_keywords(container) -> Optional[str]:
-        if not container:
-            return None
-        # Gather text blocks and look for segments with 7D and realized/pnl/profit
-        texts = []
-        for t in container.stripped_strings:
-            if t:
-                texts.append(t)
-        joined = " \n ".join(texts)
-        # First try tight keyword combo
-        patterns = [
-            r"7\s*D[^\n]*?(Realized|Profit|PnL)[^\n]*?\$\s?-?\d[\d,]*(?:\.\d+)?",
-            r"(Realized|Profit|PnL)[^\n]*?7\s*D[^\n]*?\$\s?-?\d[\d,]*(?:\.\d+)?",
-        ]
-        for pat in patterns:
-            m = re.search(pat, joined, re.IGNORECASE)
-            if m:
-                money = MONEY_REGEX.search(m.group(0))
-                if money:
-                    return money.group(0)
-        # Fallback: find a line with 7D and then the first money amount in next ~300 chars
-        m7 = re.search(r"7\s*D", joined, re.IGNORECASE)
-        if m7:
-            seg = joined[m7.start() : m7.start() + 300]
-            money = MONEY_REGEX.search(seg)
+
+def _find_money_near_keywords(container, doc: Optional[PageDocument] = None) -> Optional[str]:
+    if not container:
+        return None
+    # Gather text blocks and look for segments with 7D and realized/pnl/profit
+    texts = []
+    strings = container.stripped_strings
+    for t in (doc.visit(strings) if doc is not None else strings):
+        if t:
+            texts.append(t)
+    return _money_near_keywords(texts, doc)
+
+
+# Tight "7D ... Realized/Profit/PnL ... $amount" combos, tried in order
+CARD_KEYWORD_PATTERNS = [
+    re.compile(r"7\s*D[^\n]*?(Realized|Profit|PnL)[^\n]*?\$\s?-?\d[\d,]*(?:\.\d+)?", re.IGNORECASE),
+    re.compile(r"(Realized|Profit|PnL)[^\n]*?7\s*D[^\n]*?\$\s?-?\d[\d,]*(?:\.\d+)?", re.IGNORECASE),
+]
+SEVEN_D_REGEX = re.compile(r"7\s*D", re.IGNORECASE)
+
+
+def _search(pattern: "re.Pattern[str]", text: str) -> Optional["re.Match[str]"]:
+    return pattern.search(text)
+
+
+def _money_near_keywords(texts: List[str], doc: Optional[PageDocument] = None) -> Optional[str]:
+    # Text blocks of a card, in document order
+    search = doc.search if doc is not None else _search
+    joined = " \n ".join(texts)
+    # First try tight keyword combo
+    for pat in CARD_KEYWORD_PATTERNS:
+        m = search(pat, joined)
+        if m:
+            money = search(MONEY_REGEX, m.group(0))
             if money:
                 return money.group(0)
-        # Last resort: any money in the card (often first is 7D)
-        money_any = MONEY_REGEX.search(joined)
-        return money_any.group(0) if money_any else None
+    # Fallback: find a line with 7D and then the first money amount in next ~300 chars
+    m7 = search(SEVEN_D_REGEX, joined)
+    if m7:
+        seg = joined[m7.start() : m7.start() + 300]
+        money = search(MONEY_REGEX, seg)
+        if money:
+            return money.group(0)
+    # Last resort: any money in the card (often first is 7D)
+    money_any = search(MONEY_REGEX, joined)
+    return money_any.group(0) if money_any else None
 
-    # Try inside Analysis card first
-    money_txt: Optional[str] = None
-    if analysis_card is not None:
-        money_txt = find_money_near_keywords(analysis_card)
-        if money_txt:
-            info["strategy"] = "analysis_card_keywords"
-            info["context"] = "Analysis card"
-
-    # Heuristic 2: Global search in HTML text around occurrences of '7D' and 'Realized'
-    if not money_txt:
-        raw = html
-        # Prefer vicinity window around '7D' then 'Realized/Profit/PnL'
-        for m in re.finditer(r"7\s*D", raw, flags=re.IGNORECASE):
-            window = raw[max(0, m.start() - 200) : m.end() + 400]
-            m_money = MONEY_REGEX.search(window)
-            if m_money:
-                money_txt = m_money.group(0)
-                info["strategy"] = "raw_text_vicinity_7d"
-                info["context"] = window[:200]
-                break
 
-    # Heuristic 3: Any explicit label for Realized Profit/PnL with money
-    if not money_txt:
-        for pat in [r"Realized\s*(Profit|PnL)[^\n]*\$\s?-?\d", r"\bPnL\b[^\n]*\$\s?-?\d"]:
-            m = re.search(pat, html, flags=re.IGNORECASE)
-            if m:
-                m_money = MONEY_REGEX.search(m.group(0))
-                if m_money:
-                    money_txt = m_money.group(0)
-                    info["strategy"] = "label_global"
-                    info["context"] = m.group(0)[:120]
-                    break
+def _strategy_analysis_card(doc: PageDocument) -> Optional[Tuple[str, str]]:
+    # Heuristic 1: Find an "Analysis" card and within it a block mentioning 7D + (Realized|Profit|PnL)
+    analysis_card = _find_analysis_card(doc)
+    if analysis_card is None:
+        return None
+    money_txt = _find_money_near_keywords(analysis_card, doc)
+    return (money_txt, "Analysis card") if money_txt else None
+
+
+def _strategy_raw_text_vicinity(doc: PageDocument) -> Optional[Tuple[str, str]]:
+    # Heuristic 2: Global search in HTML text around occurrences of '7D', from the shared token scan
+    return _money_near_seven(doc.raw_tokens)
+
+
+def _strategy_label_global(doc: PageDocument) -> Optional[Tuple[str, str]]:
+    # Heuristic 3: Any explicit label for Realized Profit/PnL with money, from the shared token scan
+    return _money_after_label(doc.raw_tokens)
+
 
+def _strategy_embedded_json(doc: PageDocument) -> Optional[Tuple[str, str]]:
     # Heuristic 4: Parse embedded JSON (Next.js data or inline state) for realized 7d fields
-    if not money_txt:
-        json_money = _extract_money_from_embedded_json(html)
-        if json_money:
-            money_txt = json_money
-            info["strategy"] = "embedded_json_7d"
-            info["context"] = "__NEXT_DATA__ or inline JSON"
+    json_money = _extract_money_from_embedded_json(doc.html, doc=doc)
+    return (json_money, "__NEXT_DATA__ or inline JSON") if json_money else None
+
+
+# Profiling hooks, called as hook(strategy_name, record) after every strategy attempt.
+# Registering one turns profiling on for every extraction in the process.
+PROFILE_HOOKS: List[Callable[[str, Dict[str, Any]], None]] = []
+
+
+# Ordered extraction pipeline; the first strategy that returns a value wins.
+# Insert new (name, fn) pairs here to plug additional heuristics into the engine.
+EXTRACTION_STRATEGIES: List[Tuple[str, StrategyFn]] = [
+    ("next_data_fast", _strategy_next_data_fast),
+    ("targeted_css_selector", _strategy_targeted_css),
+    ("red_color_style_selector", _strategy_red_color_style),
+    ("analysis_card_keywords", _strategy_analysis_card),
+    ("raw_text_vicinity_7d", _strategy_raw_text_vicinity),
+    ("label_global", _strategy_label_global),
+    ("embedded_json_7d", _strategy_embedded_json),
+]
+
+
+_default_strategies = EXTRACTION_STRATEGIES
+
+
+# On-page labels of the other headline metrics; the value follows in the same or a nearby text node
+METRIC_LABELS = {
+    "pnl_30d": re.compile(r"30\s*D\s*Realized\s*(PnL|Profit)", re.IGNORECASE),
+    "winrate": re.compile(r"Win\s*Rate", re.IGNORECASE),
+    "unrealized_pnl": re.compile(r"Unrealized\s*(PnL|Profit)", re.IGNORECASE),
+    "total_pnl": re.compile(r"Total\s*(PnL|Profit)", re.IGNORECASE),
+}
+PERCENT_REGEX = re.compile(r"-?\d+(?:\.\d+)?\s?%")
+
+
+def _metric_value(metric: str, text: str) -> Optional[float]:
+    if metric == "winrate":
+        m = PERCENT_REGEX.search(text)
+        return round(float(m.group(0).rstrip("% ")) / 100, 6) if m else None
+    m = MONEY_REGEX.search(text)
+    return normalize_money_to_float(m.group(0)) if m else None
+
+
+def extract_metrics(doc: PageDocument) -> Dict[str, Optional[float]]:
+    """
+    Headline metrics other than 7D realized PnL, from work the engine has already done.
+
+    __NEXT_DATA__ fields come first. Metrics still missing are read from on-page labels
+    in one pass over the document's text nodes - only if a strategy already parsed the
+    DOM, so asking for more metrics never adds a parse.
+    """
+    metrics: Dict[str, Optional[float]] = {m: None for m in HEADLINE_METRICS}
+    for metric in metrics:
+        best = best_field(doc.next_data_fields, metric)
+        if best:
+            metrics[metric] = best[1]
+    missing = {m: METRIC_LABELS[m] for m, v in metrics.items() if v is None}
+    if not missing or not doc.parsed:
+        return metrics
+
+    strings = doc.scan("all_strings", lambda: doc.find_all(string=True))
+    for i, el in enumerate(strings):
+        if el.parent is not None and el.parent.name in ("script", "style"):
+            continue
+        text = str(el)
+        for metric, label in list(missing.items()):
+            m = label.search(text)
+            if not m:
+                continue
+            # Value in the rest of this node, else in the next few text nodes
+            value = _metric_value(metric, text[m.end():])
+            for nxt in strings[i + 1 : i + 4]:
+                if value is not None:
+                    break
+                value = _metric_value(metric, str(nxt))
+            if value is not None:
+                metrics[metric] = value
+                del missing[metric]
+        if not missing:
+            break
+    return metrics
+
+
+def strategies_by_name(names: List[str]) -> List[Tuple[str, StrategyFn]]:
+    """Look up (name, fn) pairs in the given order; unknown names are skipped"""
+    known = dict(EXTRACTION_STRATEGIES)
+    return [(n, known[n]) for n in names if n in known]
+
+
+def set_strategy_order(strategies: Optional[List[Tuple[str, StrategyFn]]]) -> None:
+    """Change the order used when no explicit list is passed (None restores EXTRACTION_STRATEGIES)"""
+    global _default_strategies
+    _default_strategies = strategies if strategies is not None else EXTRACTION_STRATEGIES
+
+
+def run_extraction_engine(doc: PageDocument, strategies: Optional[List[Tuple[str, StrategyFn]]] = None, debug: bool = False, profile: bool = False) -> Tuple[Optional[float], Dict[str, Any]]:
+    """Run strategies in order over one shared document and report parse/scan reuse.
+
+    With ``profile``, ``info["profile"]`` maps each attempted strategy to its wall
+    time, nodes visited, regex calls and hit flag. Registered PROFILE_HOOKS get the
+    same records whether or not ``profile`` is set.
+    """
+    info: Dict[str, Any] = {"strategy": None, "context": None}
+    money_txt: Optional[str] = None
+    attempted: List[str] = []
+    if profile or PROFILE_HOOKS:
+        doc.profile = {}
+
+    for name, strategy in (strategies if strategies is not None else _default_strategies):
+        doc.current_strategy = name
+        attempted.append(name)
+        if doc.profile is None:
+            found = strategy(doc)
+        else:
+            nodes, regex_calls, parsed = doc.nodes_visited, doc.regex_calls, doc.parse_seconds
+            start = time.perf_counter()
+            found = strategy(doc)
+            record = doc.profile[name] = {"ms": round((time.perf_counter() - start) * 1000, 3)}
+            record["nodes"] = doc.nodes_visited - nodes
+            record["regex_calls"] = doc.regex_calls - regex_calls
+            record["hit"] = bool(found)
+            # Share of ms spent on the one-off DOM parse, and whether the strategy needs the DOM at all
+            record["parse_ms"] = round((doc.parse_seconds - parsed) * 1000, 3)
+            record["dom"] = doc.used_soup(name)
+            for hook in PROFILE_HOOKS:
+                hook(name, record)
+        if found:
+            money_txt, info["context"] = found
+            info["strategy"] = name
+            break
+    doc.current_strategy = None
+
+    info["metrics"] = extract_metrics(doc)
+    if doc.fields:
+        info["fields"] = dict(doc.fields)
+    engine_stats = doc.stats()
+    engine_stats["strategies_attempted"] = attempted
+    info["engine"] = engine_stats
+    if profile:
+        info["profile"] = doc.profile
 
     value = normalize_money_to_float(money_txt or "") if money_txt else None
     if debug:
@@ -192,58 +769,134 @@ def extract_7d_realized_pnl_from_html(html: str, debug: bool = False) -> Tuple[O
     return value, info
 
 
+def extract_7d_realized_pnl_from_html(html: Union[str, bytes], debug: bool = False, profile: bool = False, strategies: Optional[List[Tuple[str, StrategyFn]]] = None) -> Tuple[Optional[float], Dict[str, Any]]:
+    return run_extraction_engine(PageDocument(html), strategies=strategies, debug=debug, profile=profile)
+
+
+class ExtractionProfile:
+    """Aggregates per-strategy profile records across many pages.
+
+    Usable directly as a PROFILE_HOOKS entry, or fed ``info["profile"]`` dicts via add().
+    Records of pages served from the extraction memo count towards attempts and
+    hits only; they carry no timings.
+    """
+
+    def __init__(self):
+        self.strategies: Dict[str, Dict[str, float]] = {}
+
+    def __call__(self, name: str, record: Dict[str, Any]) -> None:
+        totals = self.strategies.setdefault(name, {"attempts": 0, "hits": 0, "memo": 0, "ms": 0.0, "nodes": 0, "regex_calls": 0})
+        totals["attempts"] += 1
+        totals["hits"] += bool(record.get("hit"))
+        if record.get("memo"):
+            totals["memo"] += 1
+            return
+        totals["ms"] += record.get("ms", 0.0)
+        totals["nodes"] += record.get("nodes", 0)
+        totals["regex_calls"] += record.get("regex_calls", 0)
+
+    def add(self, profile: Dict[str, Dict[str, Any]]) -> None:
+        for name, record in profile.items():
+            self(name, record)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-strategy totals, most expensive first, with hit rate and share of extraction time"""
+        total_ms = sum(t["ms"] for t in self.strategies.values()) or 1.0
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, t in sorted(self.strategies.items(), key=lambda kv: -kv[1]["ms"]):
+            timed = t["attempts"] - t["memo"]
+            out[name] = {
+                "attempts": t["attempts"],
+                "hits": t["hits"],
+                "hit_rate": round(t["hits"] / t["attempts"], 3),
+                "memo": t["memo"],
+                "total_ms": round(t["ms"], 3),
+                "mean_ms": round(t["ms"] / timed, 3) if timed else None,
+                "share": round(t["ms"] / total_ms, 3),
+                "nodes": t["nodes"],
+                "regex_calls": t["regex_calls"],
+            }
+        return out
+
+
+def _seven_then_keyword(tokens: TextTokens) -> Optional[Tuple[int, int]]:
+    # Span of the first "7D ... Realized/Profit/PnL ... $amount" on one line
+    for start, end in tokens.sevens():
+        line_end = tokens.line_end(end)
+        word = next(tokens.words(end, line_end), None)
+        dollar = tokens.first_dollar(word[1], line_end) if word else None
+        if dollar is not None:
+            return start, tokens.match(DOLLAR_AMOUNT_REGEX, dollar).end()
+    return None
+
+
+def _keyword_then_seven(tokens: TextTokens) -> Optional[Tuple[int, int]]:
+    # Span of the first "Realized/Profit/PnL ... 7D ... $amount", the amount on the 7D's line
+    for start, end, _ in tokens.words():
+        for _, seven_end in tokens.sevens(end, tokens.line_end(end)):
+            dollar = tokens.first_dollar(seven_end, tokens.line_end(seven_end))
+            if dollar is not None:
+                return start, tokens.match(DOLLAR_AMOUNT_REGEX, dollar).end()
+    return None
+
+
 def extract_from_plain_text(text: str) -> Optional[str]:
-    # Look for a section mentioning 7D and realized/profit/pnl nearby, then money
-    patterns = [
-        r"7\s*D[^\n]*?(Realized|Profit|PnL)[^\n]*?\$\s?-?\d[\d,]*(?:\.\d+)?",
-        r"(Realized|Profit|PnL)[^\n]*?7\s*D[^\n]*?\$\s?-?\d[\d,]*(?:\.\d+)?",
-    ]
-    for pat in patterns:
-        m = re.search(pat, text, flags=re.IGNORECASE)
-        if m:
-            mm = MONEY_REGEX.search(m.group(0))
-            if mm:
-                return mm.group(0)
+    # Look for a section mentioning 7D and realized/profit/pnl nearby, then money - all from one token scan
+    tokens = TextTokens(text)
+    for find_span in (_seven_then_keyword, _keyword_then_seven):
+        span = find_span(tokens)
+        if span:
+            money = tokens.first_money(*span)
+            if money:
+                return money
     # Fallback: proximity search around 7D
-    for m in re.finditer(r"7\s*D", text, flags=re.IGNORECASE):
-        seg = text[max(0, m.start() - 200) : m.end() + 400]
-        mm = MONEY_REGEX.search(seg)
-        if mm:
-            return mm.group(0)
-    return None
+    found = _money_near_seven(tokens)
+    return found[0] if found else None
 
 
-def _extract_money_from_embedded_json(html: str) -> Optional[str]:
-    # Grab likely JSON blobs
-    soup = BeautifulSoup(html, "lxml")
+def _extract_money_from_embedded_json(html: str, doc: Optional[PageDocument] = None) -> Optional[str]:
+    # Grab likely JSON blobs, reusing the engine's parse when called from it
+    if doc is None:
+        doc = PageDocument(html)
+    scripts = doc.scan("scripts", lambda: doc.find_all("script"))
     candidates = []
     # Next.js
-    nd = soup.find("script", id="__NEXT_DATA__")
+    nd = next((s for s in doc.visit(scripts) if s.get("id") == "__NEXT_DATA__"), None)
     if nd and nd.string:
         candidates.append(nd.string)
     # Any application/json scripts
-    for s in soup.find_all("script", attrs={"type": "application/json"}):
-        if s.string:
+    for s in doc.visit(scripts):
+        if s.get("type") == "application/json" and s.string:
             candidates.append(s.string)
     # Also scan inline JS text blocks roughly
-    for s in soup.find_all("script"):
+    for s in doc.visit(scripts):
         if s.string and ("7d" in s.string.lower() or "realiz" in s.string.lower() or "pnl" in s.string.lower()):
             candidates.append(s.string)
 
-    patterns_key = re.compile(r"(7\s*d|seven\s*day).*?(realiz|pnl|profit)|" r"(realiz|pnl|profit).*?(7\s*d|seven\s*day)", re.IGNORECASE | re.DOTALL)
+    for raw in candidates:
+        mv = _money_from_json_text(raw, doc)
+        if mv:
+            return mv
+    return None
+
+
+EMBEDDED_JSON_KEY = re.compile(r"(7\s*d|seven\s*day).*?(realiz|pnl|profit)|" r"(realiz|pnl|profit).*?(7\s*d|seven\s*day)", re.IGNORECASE | re.DOTALL)
+
+
+def _money_from_json_text(raw: str, doc: Optional[PageDocument] = None) -> Optional[str]:
+    # One script body: a realized-7d key in the decoded JSON, else money near 7d/realized in the raw text
+    search = doc.search if doc is not None else _search
 
     def search_in_obj(obj: Any) -> Optional[str]:
         try:
             if isinstance(obj, dict):
                 for k, v in obj.items():
                     key = str(k)
-                    if re.search(patterns_key, key):
-                        if isinstance(v, (int, float)):
-                            val = f"${v}"
-                            if MONEY_REGEX.search(val):
-                                return MONEY_REGEX.search(val).group(0)
+                    if search(EMBEDDED_JSON_KEY, key):
+                        if isinstance(v, (int, float)) and not isinstance(v, bool):
+                            return format_money(v)
                         if isinstance(v, str):
-                            m = MONEY_REGEX.search(v)
+                            m = search(MONEY_REGEX, v)
                             if m:
                                 return m.group(0)
                         # Recurse
@@ -260,103 +913,532 @@ def _extract_money_from_embedded_json(html: str) -> Optional[str]:
                     if mv:
                         return mv
             elif isinstance(obj, str):
-                if re.search(patterns_key, obj):
-                    m = MONEY_REGEX.search(obj)
+                if search(EMBEDDED_JSON_KEY, obj):
+                    m = search(MONEY_REGEX, obj)
                     if m:
                         return m.group(0)
         except Exception:
             return None
         return None
 
-    import json as _json
-
-    for raw in candidates:
-        raw = raw.strip()
-        # First try strict JSON
-        try:
-            data = _json.loads(raw)
-            mv = search_in_obj(data)
-            if mv:
-                return mv
-        except Exception:
-            pass
-        # Fallback: find money near 7d/realized in raw text
-        if re.search(patterns_key, raw):
-            mm = MONEY_REGEX.search(raw)
-            if mm:
-                return mm.group(0)
+    raw = raw.strip()
+    # First try strict JSON
+    try:
+        data = json.loads(raw)
+        mv = search_in_obj(data)
+        if mv:
+            return mv
+    except Exception:
+        pass
+    # Fallback: find money near 7d/realized in raw text
+    if search(EMBEDDED_JSON_KEY, raw):
+        mm = search(MONEY_REGEX, raw)
+        if mm:
+            return mm.group(0)
     return None
 
 
-def write_to_excel(result: Dict[str, Any]) -> None:
-    """Write wallet and PnL data to profit.xlsx file"""
-    excel_file = "profit.xlsx"
-    
-    # Extract wallet address from URL or use provided wallet
-    wallet_address = result.get("wallet", "Unknown")
-    if not wallet_address or wallet_address == "Unknown":
-        # Try to extract from URL
-        url = result.get("url", "")
-        if url and "/address/" in url:
-            wallet_address = url.split("/address/")[-1].split("?")[0]
-        elif url and "gmgn.ai" in url:
-            # Extract from gmgn.ai URL pattern - look for wallet addresses
-            import re
-            # Try different patterns for wallet addresses
-            patterns = [
-                r'/([a-zA-Z0-9]{32,44})',  # Standard wallet address length
-                r'/([a-zA-Z0-9]{4,})',     # Fallback for shorter addresses
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, url)
-                if match:
-                    wallet_address = match.group(1)
-                    break
+def build_result(wallet_label: Optional[str], value: Optional[float], info: Dict[str, Any], file: Optional[str] = None, url: Optional[str] = None, debug: bool = False) -> Dict[str, Any]:
+    """Shape an extraction into the JSON record printed by main() and written to Excel"""
+    result: Dict[str, Any] = {
+        "wallet": wallet_label,
+        "file": file,
+        "url": url,
+        "currency": "USD",
+        "pnl_7d": value,
+        **{m: (info.get("metrics") or {}).get(m) for m in HEADLINE_METRICS},
+        "text_value": info.get("raw_money"),
+        "confidence": 0.6 if value is not None else 0.0,
+        "strategy": info.get("strategy"),
+    }
+    if info.get("profile"):
+        result["profile"] = info["profile"]
+    if info.get("memo"):
+        result["memo"] = info["memo"]
+    if debug:
+        result["debug_context"] = info.get("context")
+        if info.get("engine"):
+            result["engine"] = info["engine"]
+        if "ready_wait_seconds" in info:
+            result["ready_signal"] = info.get("ready_signal")
+            result["ready_wait_seconds"] = info["ready_wait_seconds"]
+        if info.get("fetched_via"):
+            result["fetched_via"] = info["fetched_via"]
+            if info.get("http_fallback_reason"):
+                result["http_fallback_reason"] = info["http_fallback_reason"]
+    return result
+
+
+def wallet_label_from_path(path: Path) -> str:
+    """Saved pages are named '<wallet label> 30D Realized Profit ... .htm'; use the first token."""
+    stem = path.stem.strip()
+    return stem.split(" ")[0] if stem else "Unknown"
+
+
+def wallet_label_from_address(address: str) -> str:
+    """Short display label for a wallet address: first 8 and last 4 characters"""
+    return address[:8] + "..." + address[-4:] if len(address) > 12 else address
+
+
+def extract_html_file(html_path: Path, wallet_label: Optional[str] = None, debug: bool = False, profile: bool = False, strategies: Optional[List[Tuple[str, StrategyFn]]] = None, stream: bool = False, memo=None) -> Dict[str, Any]:
+    """Extract one saved wallet page into a result record (``stream``: read it incrementally, see stream_extract.py;
+    ``memo``: an extract_memo.ExtractMemo serving pages the current code already extracted)"""
+    if stream:
+        from stream_extract import extract_html_file_stream
+        names = [name for name, _ in (strategies if strategies is not None else _default_strategies)]
+        return extract_html_file_stream(html_path, wallet_label, debug=debug, strategies=names)
+    # Raw bytes let the __NEXT_DATA__ fast path skip decoding and DOM building
+    html = read_file_bytes(html_path)
+    if memo is not None:
+        value, info = memo.extract(html, strategies=strategies, debug=debug, profile=profile)
+    else:
+        value, info = extract_7d_realized_pnl_from_html(html, debug=debug, profile=profile, strategies=strategies)
+    return build_result(wallet_label or wallet_label_from_path(html_path), value, info, file=str(html_path), debug=debug)
+
+
+def record_result(result: Dict[str, Any]) -> None:
+    """
+    Record one result in the append-only store and the history database.
+    
+    profit.xlsx is not rewritten per result: that would reread the whole store
+    and load pandas on every single-wallet run. It is exported at the end of
+    batch / list runs, or on demand with --export-excel.
+    """
+    from pnl_history import record_results
+    from results_store import EXCEL_FILE, RESULTS_FILE, append_result
+    
+    result.setdefault("captured_at", utc_timestamp())
+    row = append_result(result)
+    record_results([result])
+    
+    print(f"Data written to {RESULTS_FILE} (run --export-excel to refresh {EXCEL_FILE})")
+    print(f"Wallet: {row['Wallet_Address']}, PnL: {result.get('pnl_7d', 0.0)}")
+
+
+# Advanced user agent rotation for Firefox sessions
+FIREFOX_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:119.0) Gecko/20100101 Firefox/119.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:120.0) Gecko/20100101 Firefox/120.0",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0"
+]
+
+# Advanced stealth JavaScript executed on every new live session to bypass Cloudflare
+STEALTH_SCRIPT = """
+// Hide webdriver property
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+
+// Mock plugins
+Object.defineProperty(navigator, 'plugins', {get: () => [
+    {name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer'},
+    {name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai'},
+    {name: 'Native Client', filename: 'internal-nacl-plugin'}
+]});
+
+// Mock languages
+Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+
+// Mock permissions
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ?
+        Promise.resolve({ state: Notification.permission }) :
+        originalQuery(parameters)
+);
+
+// Mock chrome runtime
+if (!window.chrome) {
+    window.chrome = {};
+}
+if (!window.chrome.runtime) {
+    window.chrome.runtime = {};
+}
+
+// Override getParameter to avoid detection
+const getParameter = WebGLRenderingContext.getParameter;
+WebGLRenderingContext.prototype.getParameter = function(parameter) {
+    if (parameter === 37445) {
+        return 'Intel Inc.';
+    }
+    if (parameter === 37446) {
+        return 'Intel Iris OpenGL Engine';
+    }
+    return getParameter(parameter);
+};
+
+// Mock screen properties
+Object.defineProperty(screen, 'availHeight', {get: () => 1040});
+Object.defineProperty(screen, 'availWidth', {get: () => 1920});
+Object.defineProperty(screen, 'colorDepth', {get: () => 24});
+Object.defineProperty(screen, 'height', {get: () => 1080});
+Object.defineProperty(screen, 'pixelDepth', {get: () => 24});
+Object.defineProperty(screen, 'width', {get: () => 1920});
+
+// Mock timezone
+Object.defineProperty(Intl.DateTimeFormat.prototype, 'resolvedOptions', {
+    value: function() {
+        return {timeZone: 'America/New_York'};
+    }
+});
+"""
+
+
+def build_firefox_options(headless: bool = True, block_resources: bool = True) -> "FirefoxOptions":
+    """
+    Firefox options with the anti-detection arguments and preferences used for live fetches.
+    
+    With ``block_resources`` images, web fonts, media and analytics hosts are
+    not loaded (see resource_blocking.py).
+    """
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    
+    firefox_options = FirefoxOptions()
+    if headless:
+        firefox_options.add_argument("--headless")
+    
+    # Firefox anti-detection arguments for Cloudflare bypass
+    firefox_options.add_argument("--no-sandbox")
+    firefox_options.add_argument("--disable-dev-shm-usage")
+    firefox_options.add_argument("--disable-extensions")
+    firefox_options.add_argument("--window-size=1920,1080")
+    firefox_options.add_argument("--disable-blink-features=AutomationControlled")
+    firefox_options.add_argument("--disable-features=VizDisplayCompositor")
+    firefox_options.add_argument("--disable-ipc-flooding-protection")
+    firefox_options.add_argument("--disable-renderer-backgrounding")
+    firefox_options.add_argument("--disable-backgrounding-occluded-windows")
+    firefox_options.add_argument("--disable-client-side-phishing-detection")
+    firefox_options.add_argument("--disable-sync")
+    firefox_options.add_argument("--disable-translate")
+    firefox_options.add_argument("--disable-logging")
+    firefox_options.add_argument("--disable-gpu-logging")
+    firefox_options.add_argument("--silent")
+    firefox_options.add_argument("--log-level=3")
+    
+    import random
+    selected_ua = random.choice(FIREFOX_USER_AGENTS)
+    firefox_options.set_preference("general.useragent.override", selected_ua)
     
-    # Prepare data for Excel
-    data = {
-        "Wallet_Address": [wallet_address],
-        "PnL_7D": [result.get("pnl_7d", 0.0)],
-        "Currency": [result.get("currency", "USD")],
-        "Text_Value": [result.get("text_value", "")],
-        "Confidence": [result.get("confidence", 0.0)],
-        "Strategy": [result.get("strategy", "")],
-        "URL": [result.get("url", "")],
-        "File": [result.get("file", "")]
+    # Firefox-specific preferences for maximum stealth
+    firefox_options.set_preference("dom.webdriver.enabled", False)
+    firefox_options.set_preference("useAutomationExtension", False)
+    firefox_options.set_preference("marionette.enabled", True)
+    firefox_options.set_preference("dom.webnotifications.enabled", False)
+    firefox_options.set_preference("media.volume_scale", "0.0")
+    firefox_options.set_preference("dom.push.enabled", False)
+    firefox_options.set_preference("geo.enabled", False)
+    firefox_options.set_preference("browser.search.suggest.enabled", False)
+    firefox_options.set_preference("browser.urlbar.suggest.searches", False)
+    firefox_options.set_preference("privacy.trackingprotection.enabled", False)
+    firefox_options.set_preference("browser.safebrowsing.enabled", False)
+    firefox_options.set_preference("browser.safebrowsing.malware.enabled", False)
+    firefox_options.set_preference("browser.safebrowsing.phishing.enabled", False)
+    firefox_options.set_preference("dom.event.clipboard.enabled", False)
+    firefox_options.set_preference("media.navigator.enabled", False)
+    firefox_options.set_preference("media.peerconnection.enabled", False)
+    firefox_options.set_preference("webgl.disabled", True)
+    firefox_options.set_preference("canvas.poisondata", True)
+    firefox_options.set_preference("canvas.image.cache", False)
+    
+    if block_resources:
+        # Firefox ignores Chrome switches like --disable-images; preferences and a PAC blocklist do the job
+        from resource_blocking import apply_firefox_blocking
+        apply_firefox_blocking(firefox_options)
+    return firefox_options
+
+
+def build_chrome_options(headless: bool = True) -> "ChromeOptions":
+    """Chrome options mirroring the stealth setup in stealth_browser.py"""
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    
+    chrome_options = ChromeOptions()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    return chrome_options
+
+
+def create_live_driver(headless: bool = True, browser: str = "firefox", block_resources: bool = True):
+    """
+    Launch the browser used for live fetches and apply the stealth script.
+    
+    ``block_resources`` keeps images, web fonts, media and analytics from
+    loading: Firefox through preferences, Chrome through CDP Network.setBlockedURLs.
+    """
+    from selenium import webdriver
+    from driver_resolver import resolve_driver
+    
+    if browser == "chrome":
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        service = ChromeService(resolve_driver("chrome"))
+        driver = webdriver.Chrome(service=service, options=build_chrome_options(headless))
+        if block_resources:
+            from resource_blocking import enable_chrome_blocking
+            enable_chrome_blocking(driver)
+    else:
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        service = FirefoxService(resolve_driver("firefox"))
+        driver = webdriver.Firefox(service=service, options=build_firefox_options(headless, block_resources=block_resources))
+    driver.execute_script(STEALTH_SCRIPT)
+    return driver
+
+
+def open_gmgn_session(driver, cookies_file: Optional[str] = None, debug: bool = False, scheduler=None, base_url: Optional[str] = None) -> bool:
+    """
+    Establish a GMGN.ai session: load the homepage (``base_url``, default
+    GMGN_BASE_URL), sit out any Cloudflare challenge and apply saved cookies.
+    
+    Returns:
+        True if a login button was seen on the homepage
+    """
+    import random
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    # First, navigate to GMGN.ai homepage to establish session
+    home = base_url or GMGN_BASE_URL
+    if debug:
+        print("Navigating to GMGN.ai homepage...")
+    
+    if scheduler is not None:
+        # The scheduler paces homepage loads along with every other request to the host
+        scheduler.call(home, lambda: driver.get(home) or driver.title, status_of=status_from_title)
+    else:
+        # Random delay to avoid detection
+        time.sleep(random.uniform(2, 5))
+        driver.get(home)
+    
+    # Wait for page to load with longer timeout for Cloudflare
+    wait = WebDriverWait(driver, 30)
+    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    
+    # Additional wait for Cloudflare challenge
+    time.sleep(random.uniform(3, 7))
+    
+    # Check if Cloudflare challenge is present
+    try:
+        cloudflare_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Checking your browser') or contains(text(), 'Please wait') or contains(text(), 'DDoS protection')]")
+        if cloudflare_elements:
+            if debug:
+                print("Cloudflare challenge detected, waiting...")
+            time.sleep(random.uniform(10, 20))
+    except:
+        pass
+    
+    # Check if we need to login
+    login_required = False
+    try:
+        # Look for login button or sign-in elements
+        login_elements = driver.find_elements(By.XPATH, "//button[contains(text(), 'Login') or contains(text(), 'Sign in') or contains(text(), 'Connect')]")
+        if login_elements:
+            login_required = True
+            if debug:
+                print("Login required - found login button")
+    except:
+        pass
+    
+    # If cookies file provided, try to load cookies
+    if cookies_file and Path(cookies_file).exists():
+        if debug:
+            print(f"Loading cookies from {cookies_file}")
+        try:
+            with open(cookies_file, 'r') as f:
+                cookies = json.load(f)
+            for cookie in cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except:
+                    pass
+            if debug:
+                print("Cookies loaded successfully")
+        except Exception as e:
+            if debug:
+                print(f"Failed to load cookies: {e}")
+    
+    return login_required
+
+
+# Polled in the page until the PnL data is actually there; returns the signal name or null
+READY_PROBE_SCRIPT = """
+var money = /-?\\$\\s?\\d/;
+var nodes = document.querySelectorAll("div[class*='font-medium'][class*='ml-[4px]']");
+for (var i = 0; i < nodes.length; i++) {
+    if (money.test(nodes[i].textContent)) { return 'dom_node'; }
+}
+var nd = window.__NEXT_DATA__;
+if (nd && nd.props && /realized_?(profit|pnl)_?7d|pnl_?7d/i.test(JSON.stringify(nd.props))) {
+    return 'next_data';
+}
+var entries = performance.getEntriesByType('resource');
+for (var j = 0; j < entries.length; j++) {
+    var e = entries[j];
+    if ((e.initiatorType === 'fetch' || e.initiatorType === 'xmlhttprequest') && e.responseEnd > 0
+        && /\\/(api|defi)\\/.*(wallet|smartmoney)/i.test(e.name)) {
+        return 'network';
     }
+}
+return null;
+"""
+
+# Time allowed after the wallet API response lands for the DOM/__NEXT_DATA__ to catch up
+READY_NETWORK_GRACE = 0.5
+
+
+def wait_for_pnl_ready(driver, timeout: float = 5.0, poll: float = 0.1) -> Tuple[str, float]:
+    """
+    Wait until the wallet page shows PnL data instead of sleeping a fixed time.
     
-    # Create DataFrame
-    df = pd.DataFrame(data)
+    Ready means any of: the PnL value div holds a dollar amount, __NEXT_DATA__
+    carries a 7D realized field, or the wallet API response has finished.
     
-    # Check if file exists to append or create new
-    if Path(excel_file).exists():
+    Returns:
+        (signal, seconds_waited) where signal is dom_node, next_data, network or timeout
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    network_seen_at: Optional[float] = None
+    while True:
         try:
-            # Try to read existing file
-            existing_df = pd.read_excel(excel_file, engine='openpyxl')
-            # Ensure both DataFrames have the same columns
-            for col in df.columns:
-                if col not in existing_df.columns:
-                    existing_df[col] = None
-            for col in existing_df.columns:
-                if col not in df.columns:
-                    df[col] = None
-            # Reorder columns to match
-            df = df.reindex(columns=existing_df.columns, fill_value=None)
-            # Append new data
-            combined_df = pd.concat([existing_df, df], ignore_index=True)
-            combined_df.to_excel(excel_file, index=False, engine='openpyxl')
+            signal = driver.execute_script(READY_PROBE_SCRIPT)
         except Exception:
-            # If reading fails, create new file
-            df.to_excel(excel_file, index=False, engine='openpyxl')
+            signal = None
+        now = time.perf_counter()
+        if signal in ("dom_node", "next_data"):
+            return signal, now - start
+        if signal == "network":
+            network_seen_at = network_seen_at or now
+            if now - network_seen_at >= READY_NETWORK_GRACE:
+                return signal, now - start
+        if now >= deadline:
+            return ("network" if network_seen_at else "timeout"), now - start
+        time.sleep(poll)
+
+
+def fetch_from_page_cache(page_cache, wallet_address: str, chain: str, max_age: float, debug: bool = False) -> Optional[Tuple[Optional[float], Dict[str, Any]]]:
+    """Extract from a cached page younger than max_age, or return None on a miss"""
+    hit = page_cache.lookup(wallet_address, chain, max_age)
+    if hit is None:
+        return None
+    html, captured_at = hit
+    if debug:
+        print(f"Serving {wallet_address} from page cache ({time.time() - captured_at:.0f}s old)")
+    value, info = extract_7d_realized_pnl_from_html(html, debug=debug)
+    info["page_cache"] = "hit"
+    info["url"] = f"https://gmgn.ai/{chain}/address/{wallet_address}"
+    info["wallet_address"] = wallet_address
+    info["chain"] = chain
+    return value, info
+
+
+def extract_wallet_page(html: Union[str, bytes], wallet_address: str, chain: str, debug: bool = False, change_detector=None) -> Tuple[Optional[float], Dict[str, Any]]:
+    """Extract a fetched wallet page, or reuse the last extraction if change_detector (watch.ChangeDetector) finds nothing relevant changed"""
+    if change_detector is None:
+        return extract_7d_realized_pnl_from_html(html, debug=debug)
+    return change_detector.extract(wallet_address, chain, html, lambda: extract_7d_realized_pnl_from_html(html, debug=debug))
+
+
+def status_from_title(title: Optional[str]) -> Optional[int]:
+    """Browsers hide the HTTP status; read a 429/5xx error page from its title instead"""
+    title = (title or "").strip()
+    m = re.match(r"(429|5\d\d)\b", title)
+    if m:
+        return int(m.group(1))
+    return 429 if "too many requests" in title.lower() else None
+
+
+def fetch_wallet_with_driver(driver, wallet_address: str, chain: str = "sol", debug: bool = False, ready_timeout: float = 5.0, page_cache=None, scheduler=None, change_detector=None, capture_api: bool = False, capture_dir: Optional[str] = None, base_url: Optional[str] = None) -> Tuple[Optional[float], Dict[str, Any]]:
+    """
+    Load a wallet page in an already-established session and extract its PnL.
+    
+    With ``capture_api`` the page's wallet API responses are captured and read
+    structurally (see api_capture.py); the rendered HTML is only serialized and
+    run through the heuristics when they carry no 7D value. ``capture_dir``
+    keeps each wallet's captured responses as <wallet>.jsonl for replay.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    info: Dict[str, Any] = {"strategy": "live_selenium", "context": None}
+    
+    # Navigate to the wallet page
+    url = f"{base_url or GMGN_BASE_URL}/{chain}/address/{wallet_address}"
+    if debug:
+        print(f"Fetching wallet page: {url}")
+    
+    if capture_api:
+        from api_capture import install_capture_hook
+        # Chrome records API bodies from the first request on; other browsers re-fetch them after load
+        install_capture_hook(driver)
+    
+    if scheduler is not None:
+        scheduler.call(url, lambda: driver.get(url) or driver.title, status_of=status_from_title)
     else:
-        # Create new file
-        df.to_excel(excel_file, index=False, engine='openpyxl')
+        driver.get(url)
+    
+    # Wait for page to load
+    wait = WebDriverWait(driver, 30)
+    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    
+    # Check if we're redirected to login page
+    current_url = driver.current_url
+    if "login" in current_url.lower() or "signin" in current_url.lower():
+        if debug:
+            print("Redirected to login page - authentication required")
+        info["error"] = "Authentication required - please login to GMGN.ai first"
+        return None, info
+    
+    # Wait for the PnL data to render (bounded by ready_timeout) rather than a fixed sleep
+    ready_signal, ready_wait = wait_for_pnl_ready(driver, timeout=ready_timeout)
+    info["ready_signal"] = ready_signal
+    info["ready_wait_seconds"] = round(ready_wait, 3)
+    if debug:
+        print(f"Page ready via {ready_signal} after {ready_wait:.2f}s")
+    
+    if capture_api:
+        from api_capture import capture_from_driver, save_responses
+        value, captured_info, responses = capture_from_driver(driver, debug=debug, timeout=max(ready_timeout, 1.0))
+        if capture_dir and responses:
+            save_responses(responses, Path(capture_dir) / f"{wallet_address}.jsonl")
+        if debug:
+            print(f"API capture via {captured_info.get('api_capture')}: {len(responses)} responses, value {value}")
+        if value is not None:
+            info.update(captured_info)
+            info["url"] = url
+            info["wallet_address"] = wallet_address
+            info["chain"] = chain
+            return value, info
+        info["api_capture"] = captured_info.get("api_capture")
+    
+    # Get page source
+    html = driver.page_source
+    
+    if debug:
+        print(f"Page loaded successfully, HTML length: {len(html)}")
     
-    print(f"Data written to {excel_file}")
-    print(f"Wallet: {wallet_address}, PnL: {result.get('pnl_7d', 0.0)}")
+    # Keep the page so later heuristic changes can be re-run without the browser
+    if page_cache is not None:
+        info["page_sha256"] = page_cache.put(wallet_address, chain, html)
+    
+    # Extract PnL using existing function
+    value, extraction_info = extract_wallet_page(html, wallet_address, chain, debug=debug, change_detector=change_detector)
+    
+    # Update info with extraction details
+    info.update(extraction_info)
+    info["url"] = url
+    info["wallet_address"] = wallet_address
+    info["chain"] = chain
+    
+    return value, info
 
 
-def fetch_live_wallet_pnl(wallet_address: str, chain: str = "sol", headless: bool = True, debug: bool = False, cookies_file: Optional[str] = None, browser: str = "firefox") -> Tuple[Optional[float], Dict[str, Any]]:
+def fetch_live_wallet_pnl(wallet_address: str, chain: str = "sol", headless: bool = True, debug: bool = False, cookies_file: Optional[str] = None, browser: str = "firefox", pool=None, ready_timeout: float = 5.0, page_cache=None, cache_max_age: float = 0, scheduler=None, change_detector=None, capture_api: bool = False, capture_dir: Optional[str] = None, base_url: Optional[str] = None, block_resources: bool = True) -> Tuple[Optional[float], Dict[str, Any]]:
     """
     Fetch live PnL data from GMGN.ai for a given wallet address using Selenium.
     
@@ -366,6 +1448,18 @@ def fetch_live_wallet_pnl(wallet_address: str, chain: str = "sol", headless: boo
         headless: Whether to run browser in headless mode
         debug: Whether to print debug information
         cookies_file: Path to cookies file for authentication
+        browser: Browser to launch (firefox or chrome)
+        pool: Optional driver_pool.DriverPool; when given, a warm session is
+            borrowed from it instead of launching and quitting a browser
+        ready_timeout: Hard deadline in seconds for the PnL data to render
+        page_cache: Optional page_cache.PageCache that stores every fetched page
+        cache_max_age: Serve from page_cache without a browser if a page this fresh exists
+        scheduler: Optional fetch_scheduler.FetchScheduler pacing and retrying page loads
+        change_detector: Optional watch.ChangeDetector; an unchanged page reuses the last extraction
+        capture_api: Read PnL from the page's captured JSON API responses, HTML heuristics as fallback
+        capture_dir: Save each wallet's captured API responses here as <wallet>.jsonl
+        base_url: Site root (default GMGN_BASE_URL), e.g. stub_server.py --api for testing
+        block_resources: Don't load images, web fonts, media or analytics (see resource_blocking.py)
         
     Returns:
         Tuple of (pnl_value, info_dict)
@@ -373,225 +1467,22 @@ def fetch_live_wallet_pnl(wallet_address: str, chain: str = "sol", headless: boo
     info: Dict[str, Any] = {"strategy": "live_selenium", "context": None}
     
     try:
-        # Setup Firefox options with anti-detection measures
-        firefox_options = FirefoxOptions()
-        if headless:
-            firefox_options.add_argument("--headless")
-        
-        # Firefox anti-detection arguments for Cloudflare bypass
-        firefox_options.add_argument("--no-sandbox")
-        firefox_options.add_argument("--disable-dev-shm-usage")
-        firefox_options.add_argument("--disable-extensions")
-        firefox_options.add_argument("--disable-plugins")
-        firefox_options.add_argument("--disable-images")
-        firefox_options.add_argument("--window-size=1920,1080")
-        firefox_options.add_argument("--disable-blink-features=AutomationControlled")
-        firefox_options.add_argument("--disable-features=VizDisplayCompositor")
-        firefox_options.add_argument("--disable-ipc-flooding-protection")
-        firefox_options.add_argument("--disable-renderer-backgrounding")
-        firefox_options.add_argument("--disable-backgrounding-occluded-windows")
-        firefox_options.add_argument("--disable-client-side-phishing-detection")
-        firefox_options.add_argument("--disable-sync")
-        firefox_options.add_argument("--disable-translate")
-        firefox_options.add_argument("--disable-logging")
-        firefox_options.add_argument("--disable-gpu-logging")
-        firefox_options.add_argument("--silent")
-        firefox_options.add_argument("--log-level=3")
-        
-        # Advanced user agent rotation
-        user_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:119.0) Gecko/20100101 Firefox/119.0",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:120.0) Gecko/20100101 Firefox/120.0",
-            "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0"
-        ]
-        import random
-        selected_ua = random.choice(user_agents)
-        firefox_options.set_preference("general.useragent.override", selected_ua)
-        
-        # Firefox-specific preferences for maximum stealth
-        firefox_options.set_preference("dom.webdriver.enabled", False)
-        firefox_options.set_preference("useAutomationExtension", False)
-        firefox_options.set_preference("marionette.enabled", True)
-        firefox_options.set_preference("dom.webnotifications.enabled", False)
-        firefox_options.set_preference("media.volume_scale", "0.0")
-        firefox_options.set_preference("dom.push.enabled", False)
-        firefox_options.set_preference("geo.enabled", False)
-        firefox_options.set_preference("browser.search.suggest.enabled", False)
-        firefox_options.set_preference("browser.urlbar.suggest.searches", False)
-        firefox_options.set_preference("privacy.trackingprotection.enabled", False)
-        firefox_options.set_preference("browser.safebrowsing.enabled", False)
-        firefox_options.set_preference("browser.safebrowsing.malware.enabled", False)
-        firefox_options.set_preference("browser.safebrowsing.phishing.enabled", False)
-        firefox_options.set_preference("dom.event.clipboard.enabled", False)
-        firefox_options.set_preference("media.navigator.enabled", False)
-        firefox_options.set_preference("media.peerconnection.enabled", False)
-        firefox_options.set_preference("webgl.disabled", True)
-        firefox_options.set_preference("canvas.poisondata", True)
-        firefox_options.set_preference("canvas.image.cache", False)
+        if page_cache is not None and cache_max_age > 0:
+            cached = fetch_from_page_cache(page_cache, wallet_address, chain, cache_max_age, debug=debug)
+            if cached is not None:
+                return cached
         
-        # Initialize Firefox driver
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=firefox_options)
-        
-        # Execute advanced stealth JavaScript to bypass Cloudflare
-        stealth_script = """
-        // Hide webdriver property
-        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-        
-        // Mock plugins
-        Object.defineProperty(navigator, 'plugins', {get: () => [
-            {name: 'Chrome PDF Plugin', filename: 'internal-pdf-viewer'},
-            {name: 'Chrome PDF Viewer', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai'},
-            {name: 'Native Client', filename: 'internal-nacl-plugin'}
-        ]});
-        
-        // Mock languages
-        Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-        
-        // Mock permissions
-        const originalQuery = window.navigator.permissions.query;
-        window.navigator.permissions.query = (parameters) => (
-            parameters.name === 'notifications' ?
-                Promise.resolve({ state: Notification.permission }) :
-                originalQuery(parameters)
-        );
-        
-        // Mock chrome runtime
-        if (!window.chrome) {
-            window.chrome = {};
-        }
-        if (!window.chrome.runtime) {
-            window.chrome.runtime = {};
-        }
-        
-        // Override getParameter to avoid detection
-        const getParameter = WebGLRenderingContext.getParameter;
-        WebGLRenderingContext.prototype.getParameter = function(parameter) {
-            if (parameter === 37445) {
-                return 'Intel Inc.';
-            }
-            if (parameter === 37446) {
-                return 'Intel Iris OpenGL Engine';
-            }
-            return getParameter(parameter);
-        };
-        
-        // Mock screen properties
-        Object.defineProperty(screen, 'availHeight', {get: () => 1040});
-        Object.defineProperty(screen, 'availWidth', {get: () => 1920});
-        Object.defineProperty(screen, 'colorDepth', {get: () => 24});
-        Object.defineProperty(screen, 'height', {get: () => 1080});
-        Object.defineProperty(screen, 'pixelDepth', {get: () => 24});
-        Object.defineProperty(screen, 'width', {get: () => 1920});
-        
-        // Mock timezone
-        Object.defineProperty(Intl.DateTimeFormat.prototype, 'resolvedOptions', {
-            value: function() {
-                return {timeZone: 'America/New_York'};
-            }
-        });
-        """
-        
-        driver.execute_script(stealth_script)
+        if pool is not None:
+            with pool.session() as session:
+                value, info = fetch_wallet_with_driver(session.driver, wallet_address, chain=chain, debug=debug, ready_timeout=ready_timeout, page_cache=page_cache, scheduler=scheduler, change_detector=change_detector, capture_api=capture_api, capture_dir=capture_dir, base_url=base_url)
+                # An auth redirect means the session's cookies are stale; start a fresh one next time
+                session.failed = bool(info.get("error"))
+                return value, info
         
+        driver = create_live_driver(headless=headless, browser=browser, block_resources=block_resources)
         try:
-            # First, navigate to GMGN.ai homepage to establish session
-            if debug:
-                print("Navigating to GMGN.ai homepage...")
-            
-            # Random delay to avoid detection
-            import random
-            time.sleep(random.uniform(2, 5))
-            
-            driver.get("https://gmgn.ai")
-            
-            # Wait for page to load with longer timeout for Cloudflare
-            wait = WebDriverWait(driver, 30)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # Additional wait for Cloudflare challenge
-            time.sleep(random.uniform(3, 7))
-            
-            # Check if Cloudflare challenge is present
-            try:
-                cloudflare_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Checking your browser') or contains(text(), 'Please wait') or contains(text(), 'DDoS protection')]")
-                if cloudflare_elements:
-                    if debug:
-                        print("Cloudflare challenge detected, waiting...")
-                    time.sleep(random.uniform(10, 20))
-            except:
-                pass
-            
-            # Check if we need to login
-            login_required = False
-            try:
-                # Look for login button or sign-in elements
-                login_elements = driver.find_elements(By.XPATH, "//button[contains(text(), 'Login') or contains(text(), 'Sign in') or contains(text(), 'Connect')]")
-                if login_elements:
-                    login_required = True
-                    if debug:
-                        print("Login required - found login button")
-            except:
-                pass
-            
-            # If cookies file provided, try to load cookies
-            if cookies_file and Path(cookies_file).exists():
-                if debug:
-                    print(f"Loading cookies from {cookies_file}")
-                try:
-                    import json
-                    with open(cookies_file, 'r') as f:
-                        cookies = json.load(f)
-                    for cookie in cookies:
-                        try:
-                            driver.add_cookie(cookie)
-                        except:
-                            pass
-                    if debug:
-                        print("Cookies loaded successfully")
-                except Exception as e:
-                    if debug:
-                        print(f"Failed to load cookies: {e}")
-            
-            # Navigate to the wallet page
-            url = f"https://gmgn.ai/{chain}/address/{wallet_address}"
-            if debug:
-                print(f"Fetching wallet page: {url}")
-            
-            driver.get(url)
-            
-            # Wait for page to load
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # Check if we're redirected to login page
-            current_url = driver.current_url
-            if "login" in current_url.lower() or "signin" in current_url.lower():
-                if debug:
-                    print("Redirected to login page - authentication required")
-                info["error"] = "Authentication required - please login to GMGN.ai first"
-                return None, info
-            
-            # Additional wait for dynamic content
-            time.sleep(5)
-            
-            # Get page source
-            html = driver.page_source
-            
-            if debug:
-                print(f"Page loaded successfully, HTML length: {len(html)}")
-            
-            # Extract PnL using existing function
-            value, extraction_info = extract_7d_realized_pnl_from_html(html, debug=debug)
-            
-            # Update info with extraction details
-            info.update(extraction_info)
-            info["url"] = url
-            info["wallet_address"] = wallet_address
-            info["chain"] = chain
-            
-            return value, info
-            
+            open_gmgn_session(driver, cookies_file=cookies_file, debug=debug, scheduler=scheduler, base_url=base_url)
+            return fetch_wallet_with_driver(driver, wallet_address, chain=chain, debug=debug, ready_timeout=ready_timeout, page_cache=page_cache, scheduler=scheduler, change_detector=change_detector, capture_api=capture_api, capture_dir=capture_dir, base_url=base_url)
         finally:
             driver.quit()
             
@@ -602,7 +1493,44 @@ def fetch_live_wallet_pnl(wallet_address: str, chain: str = "sol", headless: boo
         return None, info
 
 
-def fetch_live_wallet_pnl_simple(wallet_address: str, chain: str = "sol", debug: bool = False) -> Tuple[Optional[float], Dict[str, Any]]:
+def fetch_wallet_list_with_pool(wallet_addresses: List[str], chain: str = "sol", pool_size: int = 2, max_pages: int = 50, headless: bool = True, debug: bool = False, cookies_file: Optional[str] = None, browser: str = "firefox", ready_timeout: float = 5.0, page_cache=None, cache_max_age: float = 0, scheduler=None, capture_api: bool = False, capture_dir: Optional[str] = None, base_url: Optional[str] = None, block_resources: bool = True):
+    """
+    Fetch many wallets through a pool of warm browser sessions.
+    
+    Yields:
+        (wallet_address, pnl_value, info_dict) as each fetch completes, then
+        a final (None, None, pool_stats) entry
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from driver_pool import gmgn_driver_pool
+    
+    with gmgn_driver_pool(size=pool_size, max_pages=max_pages, headless=headless, browser=browser, cookies_file=cookies_file, debug=debug, scheduler=scheduler, base_url=base_url, block_resources=block_resources) as pool:
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            futures = {
+                executor.submit(fetch_live_wallet_pnl, address, chain=chain, debug=debug, pool=pool, ready_timeout=ready_timeout, page_cache=page_cache, cache_max_age=cache_max_age, scheduler=scheduler, capture_api=capture_api, capture_dir=capture_dir, base_url=base_url): address
+                for address in wallet_addresses
+            }
+            for future in as_completed(futures):
+                value, info = future.result()
+                yield futures[future], value, info
+        stats = pool.stats()
+    yield None, None, stats
+
+
+GMGN_BASE_URL = "https://gmgn.ai"
+
+# Headers to mimic a real browser on plain HTTP fetches
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+def fetch_live_wallet_pnl_simple(wallet_address: str, chain: str = "sol", debug: bool = False, page_cache=None, cache_max_age: float = 0, session: Optional["requests.Session"] = None, base_url: str = GMGN_BASE_URL, timeout: float = 30, scheduler=None, change_detector=None, headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[float], Dict[str, Any]]:
     """
     Fetch live PnL data using simple HTTP requests (faster but may not work with Cloudflare).
     
@@ -610,38 +1538,53 @@ def fetch_live_wallet_pnl_simple(wallet_address: str, chain: str = "sol", debug:
         wallet_address: The wallet address to check
         chain: Blockchain chain (sol, eth, etc.)
         debug: Whether to print debug information
+        page_cache: Optional page_cache.PageCache that stores every fetched page
+        cache_max_age: Serve from page_cache without a request if a page this fresh exists
+        session: Optional requests.Session whose pooled connections are reused across calls
+        base_url: Site root, e.g. a local stub_server.py for testing
+        timeout: Request timeout in seconds
+        scheduler: Optional fetch_scheduler.FetchScheduler enforcing per-host rate limits and retrying 429/5xx
+        change_detector: Optional watch.ChangeDetector; an unchanged page reuses the last extraction
+        headers: Request headers (default: HTTP_HEADERS), e.g. with the User-Agent of the browser whose cookies the session carries
         
     Returns:
         Tuple of (pnl_value, info_dict)
     """
     info: Dict[str, Any] = {"strategy": "live_requests", "context": None}
+    headers = headers or HTTP_HEADERS
     
     try:
-        # Construct URL
-        url = f"https://gmgn.ai/{chain}/address/{wallet_address}"
+        if page_cache is not None and cache_max_age > 0:
+            cached = fetch_from_page_cache(page_cache, wallet_address, chain, cache_max_age, debug=debug)
+            if cached is not None:
+                return cached
         
-        # Headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+        # Construct URL
+        url = f"{base_url}/{chain}/address/{wallet_address}"
         
         if debug:
             print(f"Fetching: {url}")
         
         # Make request
-        response = requests.get(url, headers=headers, timeout=30)
+        if session is not None:
+            client = session
+        else:
+            import requests
+            client = requests
+        if scheduler is not None:
+            response = scheduler.get(client, url, headers=headers, timeout=timeout)
+        else:
+            response = client.get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         
         if debug:
             print(f"Response status: {response.status_code}, Content length: {len(response.text)}")
         
+        if page_cache is not None:
+            info["page_sha256"] = page_cache.put(wallet_address, chain, response.content)
+        
         # Extract PnL using existing function
-        value, extraction_info = extract_7d_realized_pnl_from_html(response.text, debug=debug)
+        value, extraction_info = extract_wallet_page(response.text, wallet_address, chain, debug=debug, change_detector=change_detector)
         
         # Update info with extraction details
         info.update(extraction_info)
@@ -672,6 +1615,11 @@ def save_cookies(driver, cookies_file: str) -> None:
 
 def manual_browser_mode(wallet_address: str, chain: str = "sol", debug: bool = False) -> Tuple[Optional[float], Dict[str, Any]]:
     """Manual browser mode - user handles everything"""
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+    from driver_resolver import resolve_driver
+    
     print("\n🌐 Manual Browser Mode")
     print("=" * 50)
     print("This will open a browser window where you can:")
@@ -696,7 +1644,7 @@ def manual_browser_mode(wallet_address: str, chain: str = "sol", debug: bool = F
     firefox_options.set_preference("dom.webnotifications.enabled", False)
     firefox_options.set_preference("media.volume_scale", "0.0")
     
-    service = FirefoxService(GeckoDriverManager().install())
+    service = FirefoxService(resolve_driver("firefox"))
     driver = webdriver.Firefox(service=service, options=firefox_options)
     
     try:
@@ -765,6 +1713,32 @@ def interactive_login(driver, debug: bool = False) -> bool:
         return False
 
 
+def print_run_stats(page_cache=None, profiler: Optional[ExtractionProfile] = None, strategy_stats=None, scheduler=None, memo=None) -> None:
+    """End-of-run page cache, scheduler, memo and strategy profile figures, on stderr to keep stdout JSON-only"""
+    if scheduler is not None:
+        print(json.dumps({"scheduler": scheduler.stats()}), file=sys.stderr)
+    if page_cache is not None:
+        print(json.dumps({"page_cache": page_cache.stats()}), file=sys.stderr)
+        page_cache.close()
+    if memo is not None:
+        print(json.dumps({"memo": memo.stats()}), file=sys.stderr)
+        memo.close()
+    if profiler is not None:
+        print(json.dumps({"profile": profiler.summary()}), file=sys.stderr)
+    if strategy_stats is not None:
+        strategy_stats.save()
+
+
+def memo_path(args: argparse.Namespace) -> Optional[str]:
+    """Memo database for --memo runs, or None without --memo"""
+    if not args.memo:
+        return None
+    if args.memo_db:
+        return args.memo_db
+    from extract_memo import EXTRACT_MEMO_DB
+    return str(EXTRACT_MEMO_DB)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Extract GMGN 7D Realized PnL from saved wallet HTML or live wallet data")
     
@@ -773,18 +1747,34 @@ def main() -> None:
     mode_group.add_argument("--html", help="Path to saved gmgn.ai wallet HTML file")
     mode_group.add_argument("--url", help="GMGN.ai wallet URL to fetch live data")
     mode_group.add_argument("--wallet-address", help="Wallet address to check live (e.g., 4eK5...RKVf)")
+    mode_group.add_argument("--batch", help="Directory, glob or manifest of saved HTML pages to extract in parallel")
+    mode_group.add_argument("--export-excel", action="store_true", help="Rebuild profit.xlsx from the profit.jsonl results store and exit")
+    mode_group.add_argument("--wallet-list", help="File with one wallet address per line to fetch live through a browser pool")
     
     # Common arguments
     parser.add_argument("--wallet", help="Wallet label/name (e.g., 4eK5...RKVf)")
     parser.add_argument("--chain", default="sol", help="Blockchain chain (sol, eth, etc.) - default: sol")
     parser.add_argument("--debug", action="store_true", help="Print debug info in JSON output")
-    parser.add_argument("--excel", action="store_true", default=True, help="Write results to profit.xlsx file (default: True)")
-    parser.add_argument("--no-excel", action="store_true", help="Disable Excel output")
+    parser.add_argument("--profile", action="store_true", help="Record time, nodes visited and regex calls per extraction strategy; totals go to stderr")
+    parser.add_argument("--strategy-order", choices=["fixed", "adaptive", "frozen"], default="fixed", help="Extraction strategy order: fixed (default), adaptive (learned from saved stats, updated after the run) or frozen (learned, not updated)")
+    parser.add_argument("--strategy-stats", help="Stats file for --strategy-order (default: ~/.cache/gmgn_scrape/strategy_stats.json)")
+    parser.add_argument("--excel", action="store_true", default=True, help="Record results in profit.jsonl and pnl_history.db; batch and list runs also export profit.xlsx at the end, single-page and single-wallet runs need --export-excel for that (default: True)")
+    parser.add_argument("--no-excel", action="store_true", help="Do not record results (profit.jsonl, pnl_history.db, profit.xlsx)")
+    
+    # Batch mode arguments
+    parser.add_argument("--workers", type=int, default=0, help="Batch mode worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=8, help="Batch mode pages per worker task (default: 8)")
+    parser.add_argument("--scaling", action="store_true", help="Batch mode: also measure pages/sec at 1..N workers")
+    parser.add_argument("--stream", action="store_true", help="HTML and batch modes: read pages incrementally and stop once the result is decided (bounded memory for huge pages)")
+    parser.add_argument("--memo", action="store_true", help="HTML and batch modes: reuse results for pages the current extractor version already processed (see extract_memo.py)")
+    parser.add_argument("--memo-db", help="Memo database for --memo (default: ~/.cache/gmgn_scrape/extract_memo.db)")
     
     # Live mode specific arguments
     parser.add_argument("--selenium", action="store_true", help="Use Selenium for live data (handles Cloudflare)")
     parser.add_argument("--headless", action="store_true", default=True, help="Run browser in headless mode (default: True)")
     parser.add_argument("--no-headless", action="store_true", help="Show browser window")
+    parser.add_argument("--ready-timeout", type=float, default=5.0, help="Max seconds to wait for PnL data to render after navigation (default: 5, the old fixed sleep)")
+    parser.add_argument("--no-block-resources", action="store_true", help="Let the browser load images, web fonts, media and analytics (blocked by default; see resource_blocking.py)")
     
     # Authentication arguments
     parser.add_argument("--cookies", help="Path to cookies file for authentication")
@@ -797,65 +1787,206 @@ def main() -> None:
     parser.add_argument("--proxy", help="Use proxy server (format: ip:port)")
     parser.add_argument("--user-agent", help="Custom user agent string")
     
+    # Browser pool arguments (--wallet-list mode)
+    parser.add_argument("--pool-size", type=int, default=2, help="Warm browser sessions kept open (default: 2)")
+    parser.add_argument("--max-pages-per-session", type=int, default=50, help="Restart a browser session after this many pages (default: 50)")
+    
+    # Async HTTP arguments (--wallet-list mode)
+    parser.add_argument("--async-http", action="store_true", help="Fetch --wallet-list over pooled plain-HTTP connections with asyncio instead of browsers")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight with --async-http or --hybrid (default: 8)")
+    parser.add_argument("--base-url", default=GMGN_BASE_URL, help="Site root for every live fetch mode (e.g. http://127.0.0.1:8765 for stub_server.py)")
+    
+    # Hybrid arguments (--wallet-address and --wallet-list modes)
+    parser.add_argument("--hybrid", action="store_true", help="Authenticate in the browser once (or take --cookies), then fetch wallet pages over pooled HTTP with those cookies; the browser is used again only when a response has no value (see hybrid_fetch.py)")
+    
+    # API capture arguments (Selenium modes)
+    parser.add_argument("--capture-api", action="store_true", help="Record the JSON API responses the wallet page loads and read PnL from them by field name; the HTML heuristics run only when they carry no value (see api_capture.py)")
+    parser.add_argument("--capture-dir", help="With --capture-api: save each wallet's captured responses to DIR/<wallet>.jsonl for replay")
+    
+    # Watch mode arguments (--wallet-list mode)
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="Keep polling --wallet-list every SECONDS per wallet; unchanged pages skip extraction and only changed PnL values are printed and stored (see watch.py)")
+    parser.add_argument("--watch-state", help="With --watch: JSON file of the last emitted figures, so a restart does not re-emit them")
+    
+    # Request scheduling arguments (all live modes)
+    parser.add_argument("--rate", type=float, help="Max requests per second to gmgn.ai; 429/5xx responses are retried with backoff (default: unlimited)")
+    parser.add_argument("--burst", type=float, default=1.0, help="Requests allowed back to back with --rate (default: 1)")
+    parser.add_argument("--max-retries", type=int, default=4, help="Retries per request with --rate (default: 4)")
+    
+    # Page cache arguments
+    parser.add_argument("--page-cache", help="Directory of the compressed page cache; every fetched page is stored there")
+    parser.add_argument("--cache-max-age", type=float, default=0, help="Serve live requests from the page cache if a page this many seconds old exists (default: 0 = always fetch)")
+    
     args = parser.parse_args()
+    
+    page_cache = None
+    if args.page_cache:
+        from page_cache import PageCache
+        page_cache = PageCache(args.page_cache)
+
+    scheduler = None
+    if args.rate:
+        from fetch_scheduler import FetchScheduler
+        in_flight = args.concurrency if args.async_http or args.hybrid else args.pool_size
+        scheduler = FetchScheduler(rate=args.rate, burst=args.burst, concurrency=in_flight, max_retries=args.max_retries)
+
+    if args.batch:
+        from batch_extract import write_batch
+        write_batch(args.batch, workers=args.workers, chunk_size=args.chunk_size, debug=args.debug, scaling=args.scaling, excel=args.excel and not args.no_excel, profile=args.profile, strategy_order=args.strategy_order, strategy_stats=args.strategy_stats, stream=args.stream, memo=memo_path(args))
+        return
+
+    profiler = None
+    if args.profile:
+        profiler = ExtractionProfile()
+        PROFILE_HOOKS.append(profiler)
+    strategy_stats = None
+    if args.strategy_order != "fixed":
+        from strategy_stats import apply_strategy_order
+        strategy_stats, order = apply_strategy_order(args.strategy_order, args.strategy_stats)
+        if strategy_stats is not None:
+            PROFILE_HOOKS.append(strategy_stats)
+        print(json.dumps({"strategy_order": order}), file=sys.stderr)
+
+    if args.export_excel:
+        from results_store import RESULTS_FILE, EXCEL_FILE, export_excel
+        count = export_excel()
+        print(f"Exported {count} rows from {RESULTS_FILE} to {EXCEL_FILE}")
+        return
+
+    if args.wallet_list:
+        from pnl_history import record_results
+        from results_store import append_result, export_excel
+        recorded: List[Dict[str, Any]] = []
+        with open(args.wallet_list, "r", encoding="utf-8") as f:
+            addresses = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        headless = args.headless and not args.no_headless
+        if args.watch:
+            from watch import Watcher, browser_fetcher, http_fetcher, run_watch
+            in_flight = args.concurrency if args.async_http or args.hybrid else args.pool_size
+
+            def watch(fetch) -> None:
+                watcher = Watcher(addresses, fetch, interval=args.watch, chain=args.chain, concurrency=in_flight, store=args.excel and not args.no_excel, state_file=args.watch_state, debug=args.debug)
+                run_watch(watcher)
+
+            if args.hybrid:
+                from hybrid_fetch import HybridFetcher
+                from watch import hybrid_fetcher
+                with HybridFetcher(cookies_file=args.cookies, chain=args.chain, base_url=args.base_url, concurrency=in_flight, pool_size=args.pool_size, headless=headless, browser=args.browser, ready_timeout=args.ready_timeout, page_cache=page_cache, scheduler=scheduler, debug=args.debug) as hybrid:
+                    watch(hybrid_fetcher(hybrid, chain=args.chain))
+            elif args.async_http:
+                watch(http_fetcher(chain=args.chain, concurrency=in_flight, base_url=args.base_url, debug=args.debug, page_cache=page_cache, scheduler=scheduler))
+            else:
+                from driver_pool import gmgn_driver_pool
+                with gmgn_driver_pool(size=args.pool_size, max_pages=args.max_pages_per_session, headless=headless, browser=args.browser, cookies_file=args.cookies, debug=args.debug, scheduler=scheduler, base_url=args.base_url, block_resources=not args.no_block_resources) as pool:
+                    watch(browser_fetcher(pool, chain=args.chain, debug=args.debug, ready_timeout=args.ready_timeout, page_cache=page_cache, scheduler=scheduler, base_url=args.base_url))
+            print_run_stats(page_cache, profiler, strategy_stats, scheduler)
+            return
+        if args.hybrid:
+            from hybrid_fetch import fetch_wallet_list_hybrid
+            stats_key = "hybrid"
+            fetched = fetch_wallet_list_hybrid(
+                addresses,
+                concurrency=args.concurrency,
+                cookies_file=args.cookies,
+                chain=args.chain,
+                base_url=args.base_url,
+                pool_size=args.pool_size,
+                headless=headless,
+                browser=args.browser,
+                ready_timeout=args.ready_timeout,
+                page_cache=page_cache,
+                scheduler=scheduler,
+                debug=args.debug,
+            )
+        elif args.async_http:
+            from async_fetch import fetch_wallet_list_async
+            stats_key = "http"
+            fetched = fetch_wallet_list_async(
+                addresses,
+                chain=args.chain,
+                concurrency=args.concurrency,
+                base_url=args.base_url,
+                debug=args.debug,
+                page_cache=page_cache,
+                cache_max_age=args.cache_max_age,
+                scheduler=scheduler,
+            )
+        else:
+            stats_key = "pool"
+            fetched = fetch_wallet_list_with_pool(
+                addresses,
+                chain=args.chain,
+                pool_size=args.pool_size,
+                max_pages=args.max_pages_per_session,
+                headless=headless,
+                debug=args.debug,
+                cookies_file=args.cookies,
+                browser=args.browser,
+                ready_timeout=args.ready_timeout,
+                page_cache=page_cache,
+                cache_max_age=args.cache_max_age,
+                scheduler=scheduler,
+                capture_api=args.capture_api,
+                capture_dir=args.capture_dir,
+                base_url=args.base_url,
+                block_resources=not args.no_block_resources,
+            )
+        for address, value, info in fetched:
+            if address is None:
+                # Final entry carries the pool utilization / throughput stats; stdout stays a clean JSONL stream of results
+                print(json.dumps({stats_key: info}), file=sys.stderr)
+                break
+            label = wallet_label_from_address(address)
+            result = build_result(label, value, info, url=info.get("url"), debug=args.debug)
+            if args.excel and not args.no_excel:
+                result["captured_at"] = utc_timestamp()
+                append_result(result)
+                recorded.append(result)
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+        if args.excel and not args.no_excel:
+            # One history transaction and one Excel export for the whole list
+            record_results(recorded)
+            export_excel()
+        print_run_stats(page_cache, profiler, strategy_stats, scheduler)
+        return
 
     # Determine wallet label
     wallet_label = args.wallet
     if not wallet_label:
         if args.wallet_address:
-            wallet_label = args.wallet_address[:8] + "..." + args.wallet_address[-4:] if len(args.wallet_address) > 12 else args.wallet_address
+            wallet_label = wallet_label_from_address(args.wallet_address)
         elif args.url:
             # Extract wallet from URL
             if "/address/" in args.url:
                 wallet_address = args.url.split("/address/")[-1].split("?")[0]
-                wallet_label = wallet_address[:8] + "..." + wallet_address[-4:] if len(wallet_address) > 12 else wallet_address
+                wallet_label = wallet_label_from_address(wallet_address)
         else:
             wallet_label = "Unknown"
 
     # Extract PnL data based on mode
+    memo = None
     if args.html:
         # HTML file mode
         html_path = Path(args.html)
         if not html_path.exists():
             raise SystemExit(f"HTML file not found: {html_path}")
         
-        html = read_file_text(html_path)
-        value, info = extract_7d_realized_pnl_from_html(html, debug=args.debug)
-        
-        result: Dict[str, Any] = {
-            "wallet": wallet_label,
-            "file": str(html_path),
-            "url": None,
-            "currency": "USD",
-            "pnl_7d": value,
-            "text_value": info.get("raw_money"),
-            "confidence": 0.6 if value is not None else 0.0,
-            "strategy": info.get("strategy"),
-        }
+        if args.memo and not args.stream:
+            from extract_memo import ExtractMemo
+            memo = ExtractMemo(memo_path(args))
+        result = extract_html_file(html_path, wallet_label, debug=args.debug, profile=args.profile, stream=args.stream, memo=memo)
         
     elif args.url:
-        # URL mode - fetch live data
+        # URL mode - fetch live data for the wallet the URL names
+        if "/address/" not in args.url:
+            raise SystemExit("Invalid URL format. Expected: https://gmgn.ai/sol/address/WALLET_ADDRESS")
+        wallet_address = args.url.split("/address/")[-1].split("?")[0]
         if args.selenium:
-            # Extract wallet address from URL for Selenium
-            if "/address/" in args.url:
-                wallet_address = args.url.split("/address/")[-1].split("?")[0]
-                headless = args.headless and not args.no_headless
-                value, info = fetch_live_wallet_pnl(wallet_address, chain=args.chain, headless=headless, debug=args.debug)
-            else:
-                raise SystemExit("Invalid URL format. Expected: https://gmgn.ai/sol/address/WALLET_ADDRESS")
+            headless = args.headless and not args.no_headless
+            value, info = fetch_live_wallet_pnl(wallet_address, chain=args.chain, headless=headless, debug=args.debug, ready_timeout=args.ready_timeout, page_cache=page_cache, cache_max_age=args.cache_max_age, scheduler=scheduler, capture_api=args.capture_api, capture_dir=args.capture_dir, base_url=args.base_url, block_resources=not args.no_block_resources)
         else:
-            value, info = fetch_live_wallet_pnl_simple(args.url, chain=args.chain, debug=args.debug)
+            value, info = fetch_live_wallet_pnl_simple(wallet_address, chain=args.chain, debug=args.debug, page_cache=page_cache, cache_max_age=args.cache_max_age, scheduler=scheduler, base_url=args.base_url)
         
-        result: Dict[str, Any] = {
-            "wallet": wallet_label,
-            "file": None,
-            "url": args.url,
-            "currency": "USD",
-            "pnl_7d": value,
-            "text_value": info.get("raw_money"),
-            "confidence": 0.6 if value is not None else 0.0,
-            "strategy": info.get("strategy"),
-        }
+        result = build_result(wallet_label, value, info, url=args.url, debug=args.debug)
         
     elif args.wallet_address:
         # Wallet address mode - fetch live data
@@ -878,7 +2009,15 @@ def main() -> None:
                 headless=headless, 
                 debug=args.debug,
                 cookies_file=args.cookies,
-                browser=args.browser
+                browser=args.browser,
+                ready_timeout=args.ready_timeout,
+                page_cache=page_cache,
+                cache_max_age=args.cache_max_age,
+                scheduler=scheduler,
+                capture_api=args.capture_api,
+                capture_dir=args.capture_dir,
+                base_url=args.base_url,
+                block_resources=not args.no_block_resources
             )
             
             # Handle authentication errors
@@ -892,7 +2031,14 @@ def main() -> None:
                         headless=False, 
                         debug=args.debug,
                         cookies_file=args.cookies,
-                        browser=args.browser
+                        browser=args.browser,
+                        ready_timeout=args.ready_timeout,
+                        page_cache=page_cache,
+                        scheduler=scheduler,
+                        capture_api=args.capture_api,
+                        capture_dir=args.capture_dir,
+                        base_url=args.base_url,
+                        block_resources=not args.no_block_resources
                     )
                 else:
                     print("\n❌ Authentication required!")
@@ -901,31 +2047,28 @@ def main() -> None:
                     print(f"   2. Interactive login: python gmgn_scrape.py --wallet-address {args.wallet_address} --selenium --login --debug")
                     print(f"   3. Stealth mode: python gmgn_scrape.py --wallet-address {args.wallet_address} --selenium --stealth --login")
                     print("💡 Or use saved cookies with --cookies cookies.json")
+        elif args.hybrid:
+            from hybrid_fetch import HybridFetcher
+            with HybridFetcher(cookies_file=args.cookies, chain=args.chain, base_url=args.base_url, headless=args.headless and not args.no_headless, browser=args.browser, ready_timeout=args.ready_timeout, page_cache=page_cache, scheduler=scheduler, debug=args.debug) as hybrid:
+                value, info = hybrid.fetch(args.wallet_address)
         else:
-            value, info = fetch_live_wallet_pnl_simple(args.wallet_address, chain=args.chain, debug=args.debug)
+            value, info = fetch_live_wallet_pnl_simple(args.wallet_address, chain=args.chain, debug=args.debug, page_cache=page_cache, cache_max_age=args.cache_max_age, scheduler=scheduler, base_url=args.base_url)
         
-        result: Dict[str, Any] = {
-            "wallet": wallet_label,
-            "file": None,
-            "url": info.get("url"),
-            "currency": "USD",
-            "pnl_7d": value,
-            "text_value": info.get("raw_money"),
-            "confidence": 0.6 if value is not None else 0.0,
-            "strategy": info.get("strategy"),
-        }
+        result = build_result(wallet_label, value, info, url=info.get("url"), debug=args.debug)
     
-    if args.debug:
-        result["debug_context"] = info.get("context")
-    
-    # Write to Excel if requested (default behavior unless --no-excel is specified)
+    # Record the result unless --no-excel is specified; profit.xlsx is left to --export-excel
     if args.excel and not args.no_excel:
-        write_to_excel(result)
+        record_result(result)
     
     print(json.dumps(result, ensure_ascii=False))
+    print_run_stats(page_cache, profiler, strategy_stats, scheduler, memo)
 
 
 if __name__ == "__main__":
-    main()
+    # Run from the importable gmgn_scrape module, the one whose PROFILE_HOOKS and
+    # strategy order extract_memo, strategy_stats and the other helpers import
+    import gmgn_scrape
+
+    gmgn_scrape.main()
 
 
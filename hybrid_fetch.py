@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Hybrid live fetching: the browser handles the login / Cloudflare handshake and
+plain HTTP fetches the wallet pages.
+The authenticated cookie jar and the browser's User-Agent go into one pooled
+keep-alive requests session. The jar comes from a warm browser session or from
+the file save_cookies.py / --save-cookies writes. Each wallet page costs one
+HTTP round trip. Only a response without the PnL data (a challenge page, a
+login redirect, an HTTP error) is fetched again through the browser, and that
+browser's refreshed cookies are copied back into the HTTP session.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from gmgn_scrape import GMGN_BASE_URL, HTTP_HEADERS, build_result, fetch_live_wallet_pnl_simple, fetch_wallet_with_driver
+
+
+ExtractionResult = Tuple[Optional[float], Dict[str, Any]]
+
+
+def load_cookies_file(path: str) -> List[Dict[str, Any]]:
+    """Selenium-style cookie dicts as written by save_cookies.py and --save-cookies"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def cookie_jar(cookies: List[Dict[str, Any]], host: Optional[str] = None):
+    """
+    requests cookie jar from Selenium cookie dicts.
+
+    Args:
+        cookies: driver.get_cookies() output
+        host: Site the session talks to; cookies scoped to another domain are
+            re-scoped to it, so a local stub_server.py receives gmgn.ai cookies
+    """
+    from requests.cookies import RequestsCookieJar, create_cookie
+
+    jar = RequestsCookieJar()
+    for c in cookies:
+        domain = c.get("domain") or host or ""
+        secure = bool(c.get("secure"))
+        if host and not ("." + host).endswith("." + domain.lstrip(".")):
+            domain, secure = host, False
+        jar.set_cookie(create_cookie(
+            c["name"], c["value"], domain=domain, path=c.get("path") or "/", secure=secure,
+            expires=c.get("expiry"), rest={"HttpOnly": c.get("httpOnly")} if c.get("httpOnly") else {},
+        ))
+    return jar
+
+
+class HybridFetcher:
+    """
+    Args:
+        cookies_file: Saved cookies to start from; without one, a browser session is opened up front
+        chain: Default blockchain chain
+        base_url: Site root for the HTTP fetches (e.g. a local stub_server.py)
+        concurrency: Pooled HTTP connections (one per concurrent fetch)
+        pool_size: Browser sessions kept for the handshake and for fallbacks
+        headless: Run the browsers headless
+        browser: firefox or chrome
+        ready_timeout: Deadline for a browser fallback page to render its data
+        fallback: Re-fetch through the browser when the HTTP response has no value
+        timeout: HTTP request timeout in seconds
+        page_cache: Optional page_cache.PageCache that stores every fetched page
+        scheduler: Optional fetch_scheduler.FetchScheduler pacing HTTP and browser requests alike
+        debug: Whether to print debug information
+    """
+
+    def __init__(self, cookies_file: Optional[str] = None, chain: str = "sol", base_url: str = GMGN_BASE_URL, concurrency: int = 8, pool_size: int = 1, headless: bool = True, browser: str = "firefox", ready_timeout: float = 5.0, fallback: bool = True, timeout: float = 30, page_cache=None, scheduler=None, debug: bool = False):
+        from async_fetch import make_session
+
+        self.cookies_file = cookies_file
+        self.chain = chain
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.headless = headless
+        self.browser = browser
+        self.ready_timeout = ready_timeout
+        self.fallback = fallback
+        self.timeout = timeout
+        self.page_cache = page_cache
+        self.scheduler = scheduler
+        self.debug = debug
+        self.session = make_session(concurrency)
+        self.headers = dict(HTTP_HEADERS)
+        self._host = urlsplit(base_url).hostname
+        self._pool = None
+        self._lock = threading.Lock()
+        self.counts: Counter = Counter()
+        self.seconds: Counter = Counter()
+        self.fallback_reasons: Counter = Counter()
+
+        if cookies_file and Path(cookies_file).exists():
+            self.session.cookies.update(cookie_jar(load_cookies_file(cookies_file), self._host))
+            self.counts["cookies_from_file"] += 1
+        elif fallback:
+            # Nothing to authenticate with yet: do the handshake once before the first fetch
+            with self.pool.session() as pooled:
+                self.sync_from_driver(pooled.driver)
+
+    @property
+    def pool(self):
+        """The browser pool, launched on first use"""
+        with self._lock:
+            if self._pool is None:
+                from driver_pool import gmgn_driver_pool
+                self._pool = gmgn_driver_pool(size=self.pool_size, headless=self.headless, browser=self.browser, cookies_file=self.cookies_file, debug=self.debug, scheduler=self.scheduler, base_url=self.base_url)
+            return self._pool
+
+    def sync_from_driver(self, driver) -> None:
+        """Copy a browser session's cookies and User-Agent into the HTTP session"""
+        cookies = driver.get_cookies()
+        user_agent = driver.execute_script("return navigator.userAgent")
+        with self._lock:
+            self.session.cookies.update(cookie_jar(cookies, self._host))
+            if user_agent:
+                # Cloudflare ties its clearance cookie to the User-Agent it was issued to
+                self.headers = {**self.headers, "User-Agent": user_agent}
+            self.counts["cookie_syncs"] += 1
+
+    def fetch(self, wallet_address: str, chain: Optional[str] = None, change_detector=None) -> ExtractionResult:
+        """One wallet over HTTP, falling back to the browser when the response has no value"""
+        chain = chain or self.chain
+        start = time.perf_counter()
+        value, info = fetch_live_wallet_pnl_simple(
+            wallet_address, chain=chain, debug=self.debug, page_cache=self.page_cache, session=self.session,
+            base_url=self.base_url, timeout=self.timeout, scheduler=self.scheduler, change_detector=change_detector, headers=self.headers,
+        )
+        self.seconds["http"] += time.perf_counter() - start
+        self.counts["http"] += 1
+        info["fetched_via"] = "http"
+        if value is not None or not self.fallback:
+            self.counts["http_found"] += value is not None
+            return value, info
+
+        reason = info.get("error") or "no value in page"
+        self.fallback_reasons[reason.split(" for url")[0][:80]] += 1
+        if self.debug:
+            print(f"HTTP fetch of {wallet_address} had no value ({reason}); falling back to the browser")
+        start = time.perf_counter()
+        try:
+            with self.pool.session() as pooled:
+                value, info = fetch_wallet_with_driver(
+                    pooled.driver, wallet_address, chain=chain, debug=self.debug, ready_timeout=self.ready_timeout,
+                    page_cache=self.page_cache, scheduler=self.scheduler, change_detector=change_detector, base_url=self.base_url,
+                )
+                pooled.failed = bool(info.get("error"))
+                if not pooled.failed:
+                    # The browser just passed whatever stopped the HTTP request; reuse its fresh cookies
+                    self.sync_from_driver(pooled.driver)
+        except Exception as e:
+            value, info = None, {"strategy": "live_selenium", "context": None, "error": str(e)}
+        self.seconds["browser"] += time.perf_counter() - start
+        self.counts["browser_fallbacks"] += 1
+        self.counts["browser_found"] += value is not None
+        info["fetched_via"] = "browser"
+        info["http_fallback_reason"] = reason
+        return value, info
+
+    def stats(self) -> Dict[str, Any]:
+        http, browser = self.counts["http"], self.counts["browser_fallbacks"]
+        stats: Dict[str, Any] = {
+            **self.counts,
+            "http_seconds_avg": round(self.seconds["http"] / http, 4) if http else None,
+            "browser_seconds_avg": round(self.seconds["browser"] / browser, 4) if browser else None,
+            "fallback_fraction": round(browser / http, 3) if http else None,
+            "fallback_reasons": dict(self.fallback_reasons),
+        }
+        if self._pool is not None:
+            stats["pool"] = self._pool.stats()
+        return stats
+
+    def close(self) -> None:
+        self.session.close()
+        if self._pool is not None:
+            self._pool.close()
+
+    def __enter__(self) -> "HybridFetcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def fetch_wallet_list_hybrid(addresses: List[str], concurrency: int = 8, **kwargs: Any) -> Iterator[Tuple[Optional[str], Optional[float], Dict[str, Any]]]:
+    """
+    Fetch many wallets through one HybridFetcher.
+
+    Yields (address, value, info) as each fetch completes and finally
+    (None, None, stats), the same shape as gmgn_scrape.fetch_wallet_list_with_pool().
+    """
+    start = time.perf_counter()
+    with HybridFetcher(concurrency=concurrency, **kwargs) as hybrid:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="gmgn-hybrid") as executor:
+            futures = {executor.submit(hybrid.fetch, address): address for address in addresses}
+            for future in as_completed(futures):
+                value, info = future.result()
+                yield futures[future], value, info
+        stats = hybrid.stats()
+    elapsed = time.perf_counter() - start
+    stats.update({
+        "wallets": len(addresses),
+        "seconds": round(elapsed, 3),
+        "wallets_per_sec": round(len(addresses) / elapsed, 2) if elapsed > 0 else 0.0,
+    })
+    yield None, None, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fetch wallets over HTTP with cookies from an authenticated browser session")
+    parser.add_argument("wallet_list", help="File with one wallet address per line")
+    parser.add_argument("--cookies", help="Saved cookies (save_cookies.py / --save-cookies); without it a browser session logs in first")
+    parser.add_argument("--chain", default="sol", help="Blockchain chain (default: sol)")
+    parser.add_argument("--concurrency", type=int, default=8, help="HTTP requests in flight at once (default: 8)")
+    parser.add_argument("--pool-size", type=int, default=1, help="Browser sessions for the handshake and fallbacks (default: 1)")
+    parser.add_argument("--browser", choices=["firefox", "chrome"], default="firefox")
+    parser.add_argument("--no-headless", action="store_true", help="Show the browser window")
+    parser.add_argument("--no-fallback", action="store_true", help="Never re-fetch through the browser; report HTTP results as they are")
+    parser.add_argument("--base-url", default=GMGN_BASE_URL, help=f"Site root (default: {GMGN_BASE_URL}; e.g. http://127.0.0.1:8765 for stub_server.py)")
+    parser.add_argument("--rate", type=float, help="Max requests per second to the host (default: unlimited)")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    scheduler = None
+    if args.rate:
+        from fetch_scheduler import FetchScheduler
+        scheduler = FetchScheduler(rate=args.rate, concurrency=args.concurrency)
+
+    with open(args.wallet_list, "r", encoding="utf-8") as f:
+        addresses = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    for address, value, info in fetch_wallet_list_hybrid(
+        addresses, concurrency=args.concurrency, cookies_file=args.cookies, chain=args.chain, base_url=args.base_url,
+        pool_size=args.pool_size, headless=not args.no_headless, browser=args.browser, fallback=not args.no_fallback,
+        scheduler=scheduler, debug=args.debug,
+    ):
+        if address is None:
+            if scheduler is not None:
+                info["scheduler"] = scheduler.stats()
+            print(json.dumps({"hybrid": info}), file=sys.stderr)
+            break
+        print(json.dumps(build_result(address, value, info, url=info.get("url"), debug=args.debug), ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed job queue for live wallet fetches.
+Jobs are (chain, wallet_address) pairs loaded from a wallet list or a JSONL job
+file. Worker processes claim them atomically a few at a time, fetch and extract
+each wallet, and mark it done in the same database. Completed jobs are never
+re-run, so an interrupted run resumes where it stopped. Jobs held by a worker
+that died are handed out again once their lease expires.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+from queue import Empty
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from results_store import utc_timestamp
+
+
+JOB_QUEUE_DB = "jobs.db"
+
+JOB_STATUSES = ("pending", "running", "done", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    chain TEXT NOT NULL,
+    wallet_address TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    enqueued_at TEXT NOT NULL,
+    finished_at TEXT,
+    pnl_7d REAL,
+    result TEXT,
+    error TEXT,
+    UNIQUE (chain, wallet_address)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+"""
+
+# One statement, so the pick and the hand-out are a single atomic write; a
+# running job whose lease ran out belongs to a dead worker and is fair game
+CLAIM_SQL = """
+UPDATE jobs SET status = 'running', worker = ?, lease_until = ?, attempts = attempts + 1
+WHERE id IN (
+    SELECT id FROM jobs
+    WHERE (status = 'pending' OR (status = 'running' AND lease_until < ?)) AND attempts < ?
+    ORDER BY id LIMIT ?
+)
+RETURNING id, chain, wallet_address
+"""
+
+Job = Tuple[int, str, str]
+ExtractionResult = Tuple[Optional[float], Dict[str, Any]]
+
+
+def read_jobs(source: str, chain: str = "sol") -> Iterator[Tuple[str, str]]:
+    """
+    (chain, wallet_address) pairs from a wallet list or a JSONL job file.
+
+    Plain lines are wallet addresses ('#' starts a comment); JSON lines carry
+    "wallet_address" (or "wallet" / "address") and an optional "chain".
+    """
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                job = json.loads(line)
+                address = job.get("wallet_address") or job.get("wallet") or job.get("address")
+                if address:
+                    yield job.get("chain") or chain, address
+            else:
+                yield chain, line
+
+
+class JobQueue:
+    """
+    Args:
+        path: SQLite database shared by every worker (WAL, so readers never block the claimer)
+        lease: Seconds a claimed job stays reserved for its worker; renewed as the worker finishes jobs
+        max_attempts: Failed fetches are retried until a job has been claimed this many times
+    """
+
+    def __init__(self, path: str = JOB_QUEUE_DB, lease: float = 300.0, max_attempts: int = 3):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        # Workers contend for the write lock on every claim; wait for it rather than erroring
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def enqueue(self, jobs: Iterable[Tuple[str, str]], refresh: bool = False) -> Dict[str, int]:
+        """
+        Add jobs; a wallet already in the queue keeps its state, so re-adding a list resumes it.
+
+        Args:
+            jobs: (chain, wallet_address) pairs
+            refresh: Put wallets that are already done or failed back to pending for a new pass
+        """
+        rows = [(chain, address, utc_timestamp()) for chain, address in jobs]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO jobs (chain, wallet_address, enqueued_at) VALUES (?, ?, ?)", rows)
+            added = self.conn.total_changes - before
+            refreshed = 0
+            if refresh:
+                before = self.conn.total_changes
+                self.conn.executemany(
+                    "UPDATE jobs SET status = 'pending', attempts = 0, worker = NULL, lease_until = NULL, error = NULL, enqueued_at = ? "
+                    "WHERE chain = ? AND wallet_address = ? AND status IN ('done', 'failed')",
+                    [(stamp, chain, address) for chain, address, stamp in rows],
+                )
+                refreshed = self.conn.total_changes - before
+        return {"submitted": len(rows), "added": added, "refreshed": refreshed}
+
+    def claim(self, worker: str, limit: int = 1) -> List[Job]:
+        """Atomically hand up to ``limit`` claimable jobs to ``worker``"""
+        now = time.time()
+        with self.conn:
+            # A dead worker's job that already used its last attempt is not handed out again
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', worker = NULL, lease_until = NULL, error = 'worker lost' "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            rows = self.conn.execute(CLAIM_SQL, (worker, now + self.lease, now, self.max_attempts, limit)).fetchall()
+        return sorted(rows)
+
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]) -> bool:
+        """Mark a job done; False if the lease was lost and another worker owns it now"""
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE jobs SET status = 'done', lease_until = NULL, finished_at = ?, pnl_7d = ?, result = ?, error = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (utc_timestamp(), result.get("pnl_7d"), json.dumps(result, ensure_ascii=False, default=str), job_id, worker),
+            )
+            self._renew(worker)
+        return cur.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> str:
+        """Record a failed attempt; the job goes back to pending until max_attempts, then to failed"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, lease_until = NULL, finished_at = ?, error = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (self.max_attempts, utc_timestamp(), error, job_id, worker),
+            )
+            self._renew(worker)
+            row = self.conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else "missing"
+
+    def _renew(self, worker: str) -> None:
+        # Progress on one job extends the lease on the rest of the worker's batch
+        self.conn.execute("UPDATE jobs SET lease_until = ? WHERE worker = ? AND status = 'running'", (time.time() + self.lease, worker))
+
+    def release(self, worker: str) -> int:
+        """Return a stopping worker's unfinished jobs to pending without counting the attempt"""
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE jobs SET status = 'pending', worker = NULL, lease_until = NULL, attempts = MAX(attempts - 1, 0) "
+                "WHERE worker = ? AND status = 'running'",
+                (worker,),
+            )
+        return cur.rowcount
+
+    def retry_failed(self) -> int:
+        """Give every failed job a fresh set of attempts"""
+        with self.conn:
+            cur = self.conn.execute("UPDATE jobs SET status = 'pending', attempts = 0, error = NULL WHERE status = 'failed'")
+        return cur.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        counts.update(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return counts
+
+    def results(self, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stored result records of done jobs, optionally only those finished at or after ``since``"""
+        sql, params = "SELECT result FROM jobs WHERE status = 'done'", []
+        if since:
+            sql += " AND finished_at >= ?"
+            params.append(since)
+        for (result,) in self.conn.execute(sql + " ORDER BY id", params):
+            yield json.loads(result)
+
+    def clear(self) -> int:
+        with self.conn:
+            return self.conn.execute("DELETE FROM jobs").rowcount
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def make_fetcher(options: Dict[str, Any]) -> Tuple[Callable[[str, str], ExtractionResult], Callable[[], None]]:
+    """
+    Per-worker fetch(chain, address) and its cleanup, built inside the worker process.
+
+    Each worker owns one keep-alive HTTP session, one warm browser session
+    with --selenium, or both with --hybrid; a --rate budget is split evenly
+    across the workers.
+    """
+    scheduler = None
+    if options.get("rate"):
+        from fetch_scheduler import FetchScheduler
+        scheduler = FetchScheduler(rate=options["rate"] / options["workers"], concurrency=1)
+
+    if options.get("hybrid"):
+        from gmgn_scrape import GMGN_BASE_URL
+        from hybrid_fetch import HybridFetcher
+
+        hybrid = HybridFetcher(cookies_file=options.get("cookies"), base_url=options.get("base_url") or GMGN_BASE_URL, concurrency=1, headless=options.get("headless", True), browser=options.get("browser", "firefox"), scheduler=scheduler, debug=options.get("debug", False))
+
+        def fetch_hybrid(chain: str, address: str) -> ExtractionResult:
+            return hybrid.fetch(address, chain=chain)
+
+        return fetch_hybrid, hybrid.close
+
+    if options.get("selenium"):
+        from driver_pool import gmgn_driver_pool
+        from gmgn_scrape import fetch_live_wallet_pnl
+
+        pool = gmgn_driver_pool(size=1, headless=options.get("headless", True), browser=options.get("browser", "firefox"), cookies_file=options.get("cookies"), debug=options.get("debug", False), scheduler=scheduler)
+
+        def fetch_browser(chain: str, address: str) -> ExtractionResult:
+            return fetch_live_wallet_pnl(address, chain=chain, debug=options.get("debug", False), pool=pool, scheduler=scheduler)
+
+        return fetch_browser, pool.close
+
+    from async_fetch import make_session
+    from gmgn_scrape import GMGN_BASE_URL, fetch_live_wallet_pnl_simple
+
+    session = make_session(1)
+
+    def fetch_http(chain: str, address: str) -> ExtractionResult:
+        return fetch_live_wallet_pnl_simple(address, chain=chain, debug=options.get("debug", False), session=session, base_url=options.get("base_url") or GMGN_BASE_URL, scheduler=scheduler)
+
+    return fetch_http, session.close
+
+
+def run_worker(path: str, options: Dict[str, Any], emit: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+    """
+    Claim, fetch and complete jobs until the queue has nothing left to claim.
+
+    Args:
+        path: Queue database
+        options: Fetch and queue settings shared by all workers (see main())
+        emit: Called with each result record once its job is marked done
+
+    Returns:
+        Counts for this worker
+    """
+    from gmgn_scrape import build_result, wallet_label_from_address
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    queue = JobQueue(path, lease=options["lease"], max_attempts=options["max_attempts"])
+    fetch, cleanup = make_fetcher(options)
+    stats = {"worker": worker, "done": 0, "retried": 0, "failed": 0, "lost": 0}
+    try:
+        while True:
+            jobs = queue.claim(worker, options["claim"])
+            if not jobs:
+                break
+            for job_id, chain, address in jobs:
+                try:
+                    value, info = fetch(chain, address)
+                except Exception as e:
+                    value, info = None, {"error": str(e)}
+                if info.get("error"):
+                    state = queue.fail(job_id, worker, info["error"])
+                    stats["failed" if state == "failed" else "retried"] += 1
+                    continue
+                result = build_result(wallet_label_from_address(address), value, info, url=info.get("url"), debug=options.get("debug", False))
+                result.update({"chain": chain, "wallet_address": address, "captured_at": utc_timestamp()})
+                if not queue.complete(job_id, worker, result):
+                    stats["lost"] += 1
+                    continue
+                stats["done"] += 1
+                emit(result)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        queue.release(worker)
+        queue.close()
+        cleanup()
+    return stats
+
+
+def _worker_process(path: str, options: Dict[str, Any], out: Any) -> None:
+    try:
+        out.put({"_worker": run_worker(path, options, out.put)})
+    except Exception as e:
+        out.put({"_worker": {"worker": str(os.getpid()), "error": str(e)}})
+
+
+def run_queue(path: str, workers: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Drain the queue with ``workers`` processes (1 = inline) and return run stats.
+
+    Results stream to stdout as JSON lines as workers finish them. This
+    process is the only writer of profit.jsonl and the PnL history, so
+    workers never race on the results store.
+    """
+    from pnl_history import record_results
+    from results_store import append_result, export_excel
+
+    options = dict(options, workers=workers)
+    queue = JobQueue(path, lease=options["lease"], max_attempts=options["max_attempts"])
+    started_at = utc_timestamp()
+    before = queue.counts()
+    recorded: List[Dict[str, Any]] = []
+
+    def emit(result: Dict[str, Any]) -> None:
+        if options.get("store"):
+            append_result(result)
+            recorded.append(result)
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    start = time.perf_counter()
+    worker_stats: List[Dict[str, Any]] = []
+    if workers <= 1:
+        worker_stats.append(run_worker(path, options, emit))
+    else:
+        out = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=_worker_process, args=(path, options, out)) for _ in range(workers)]
+        for proc in procs:
+            proc.start()
+        while len(worker_stats) < workers:
+            try:
+                item = out.get(timeout=1.0)
+            except Empty:
+                if not any(proc.is_alive() for proc in procs):
+                    break
+                continue
+            except KeyboardInterrupt:
+                # Workers got the same Ctrl-C; keep draining while they release their jobs and exit
+                continue
+            if "_worker" in item:
+                worker_stats.append(item["_worker"])
+            else:
+                emit(item)
+        for proc in procs:
+            proc.join()
+    elapsed = time.perf_counter() - start
+
+    if options.get("store"):
+        # One history transaction and one Excel export for the whole run
+        record_results(recorded)
+        export_excel()
+
+    done = sum(s.get("done", 0) for s in worker_stats)
+    stats = {
+        "workers": workers,
+        "done": done,
+        "retried": sum(s.get("retried", 0) for s in worker_stats),
+        "failed": sum(s.get("failed", 0) for s in worker_stats),
+        "already_done": before["done"],
+        "seconds": round(elapsed, 3),
+        "wallets_per_sec": round(done / elapsed, 2) if elapsed > 0 else 0.0,
+        "per_worker": {s["worker"]: s.get("done", 0) for s in worker_stats},
+        "started_at": started_at,
+        "queue": queue.counts(),
+    }
+    queue.close()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Queue wallet fetches in SQLite and drain them with several worker processes")
+    parser.add_argument("--db", default=JOB_QUEUE_DB, help=f"Queue database (default: {JOB_QUEUE_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Add wallets from a wallet list or JSONL job file")
+    enqueue.add_argument("source", help="One wallet address per line, or JSON lines with wallet_address and chain")
+    enqueue.add_argument("--chain", default="sol", help="Chain for entries that do not name one (default: sol)")
+    enqueue.add_argument("--refresh", action="store_true", help="Also requeue wallets that are already done or failed")
+
+    run = sub.add_parser("run", help="Drain the queue; safe to interrupt and run again")
+    run.add_argument("--enqueue", metavar="SOURCE", help="Add this wallet list or job file first")
+    run.add_argument("--chain", default="sol", help="Chain for --enqueue entries that do not name one (default: sol)")
+    run.add_argument("--workers", type=int, default=4, help="Worker processes (default: 4; 1 runs inline)")
+    run.add_argument("--claim", type=int, default=2, help="Jobs a worker claims at a time (default: 2)")
+    run.add_argument("--lease", type=float, default=300.0, help="Seconds before a silent worker's jobs are handed out again (default: 300)")
+    run.add_argument("--max-attempts", type=int, default=3, help="Fetch attempts per job before it is marked failed (default: 3)")
+    run.add_argument("--selenium", action="store_true", help="Fetch through one warm browser session per worker instead of plain HTTP")
+    run.add_argument("--hybrid", action="store_true", help="Fetch over HTTP with browser cookies (or --cookies), using the browser only when a page has no value")
+    run.add_argument("--browser", choices=["firefox", "chrome"], default="firefox")
+    run.add_argument("--no-headless", action="store_true", help="Show the browser windows")
+    run.add_argument("--cookies", help="Cookies file for --selenium / --hybrid sessions")
+    run.add_argument("--base-url", help="Site root for plain HTTP (e.g. http://127.0.0.1:8765 for stub_server.py)")
+    run.add_argument("--rate", type=float, help="Max requests per second to the host, split across workers (default: unlimited)")
+    run.add_argument("--no-excel", action="store_true", help="Do not record results in profit.jsonl / profit.xlsx")
+    run.add_argument("--debug", action="store_true")
+
+    sub.add_parser("status", help="Job counts by status")
+    sub.add_parser("retry", help="Requeue failed jobs")
+    export = sub.add_parser("results", help="Print stored results as JSON lines")
+    export.add_argument("--since", help="Only jobs finished at or after this UTC timestamp")
+    sub.add_parser("clear", help="Delete every job")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if args.enqueue:
+            queue = JobQueue(args.db)
+            print(json.dumps({"enqueue": queue.enqueue(read_jobs(args.enqueue, args.chain))}), file=sys.stderr)
+            queue.close()
+        options = {
+            "claim": args.claim,
+            "lease": args.lease,
+            "max_attempts": args.max_attempts,
+            "selenium": args.selenium,
+            "hybrid": args.hybrid,
+            "browser": args.browser,
+            "headless": not args.no_headless,
+            "cookies": args.cookies,
+            "base_url": args.base_url,
+            "rate": args.rate,
+            "store": not args.no_excel,
+            "debug": args.debug,
+        }
+        print(json.dumps({"jobs": run_queue(args.db, args.workers, options)}), file=sys.stderr)
+        return
+
+    queue = JobQueue(args.db)
+    try:
+        if args.command == "enqueue":
+            print(json.dumps(queue.enqueue(read_jobs(args.source, args.chain), refresh=args.refresh)))
+        elif args.command == "status":
+            print(json.dumps(queue.counts()))
+        elif args.command == "retry":
+            print(json.dumps({"requeued": queue.retry_failed()}))
+        elif args.command == "results":
+            for result in queue.results(args.since):
+                print(json.dumps(result, ensure_ascii=False))
+        elif args.command == "clear":
+            print(json.dumps({"deleted": queue.clear()}))
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Compressed, content-addressed cache of fetched wallet pages.
+Every page_source from a live fetch is gzip-compressed and stored once under
+its SHA-256; an SQLite index maps (chain, wallet_address, captured_at) to the
+blob. Heuristic changes can then be re-run over cached pages without a browser.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+
+PAGE_CACHE_DIR = "page_cache"
+
+# Defaults: keep pages for 30 days and at most 2 GB of compressed blobs
+PAGE_CACHE_TTL = 30 * 24 * 3600
+PAGE_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    chain TEXT NOT NULL,
+    wallet_address TEXT NOT NULL,
+    captured_at REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    raw_bytes INTEGER NOT NULL,
+    PRIMARY KEY (chain, wallet_address, captured_at)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_captured_at ON pages (captured_at);
+CREATE INDEX IF NOT EXISTS idx_pages_sha256 ON pages (sha256);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    raw_bytes INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class PageCache:
+    """
+    Args:
+        root: Cache directory (index.db plus objects/<2-char prefix>/<sha256>.html.gz)
+        ttl: Seconds a page stays in the cache
+        max_bytes: Upper bound on compressed bytes kept on disk
+    """
+
+    def __init__(self, root: str = PAGE_CACHE_DIR, ttl: float = PAGE_CACHE_TTL, max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        # Shared by pool threads; the lock keeps their transactions from interleaving
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._puts = 0
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.root / "objects" / sha[:2] / f"{sha}.html.gz"
+
+    def _bump(self, **deltas: int) -> None:
+        with self._lock, self._conn:
+            for name, delta in deltas.items():
+                self._conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                    (name, delta),
+                )
+
+    def _compress(self, path: Path, raw: bytes) -> str:
+        # Temp file unique to this call, next to the blob: threads may store the same page at once
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+            with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6) as gz:
+                gz.write(raw)
+        return f.name
+
+    def put(self, wallet_address: str, chain: str, html: Union[str, bytes], captured_at: Optional[float] = None) -> str:
+        """Store a fetched page; identical pages share one compressed blob. Returns its sha256."""
+        raw = html.encode("utf-8") if isinstance(html, str) else html
+        sha = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(sha)
+        # Compress outside the lock; most pages are new
+        tmp = self._compress(path, raw) if not path.exists() else None
+        # Publishing the blob and indexing it share the lock with evict(), so an orphan sweep cannot unlink it in between
+        with self._lock, self._conn:
+            if not path.exists():
+                # New, or swept by evict() since the check above
+                os.replace(tmp or self._compress(path, raw), path)
+            elif tmp is not None:
+                os.unlink(tmp)
+            stored = path.stat().st_size
+            self._conn.execute("INSERT OR IGNORE INTO blobs (sha256, raw_bytes, stored_bytes) VALUES (?, ?, ?)", (sha, len(raw), stored))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (chain, wallet_address, captured_at, sha256, raw_bytes) VALUES (?, ?, ?, ?, ?)",
+                (chain, wallet_address, captured_at or time.time(), sha, len(raw)),
+            )
+        self._bump(stores=1)
+        # Enforce TTL/size limits periodically rather than on every write
+        with self._lock:
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self.evict()
+        return sha
+
+    def read(self, sha: str) -> Optional[bytes]:
+        try:
+            with gzip.open(self._blob_path(sha), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def lookup(self, wallet_address: str, chain: str, max_age: float) -> Optional[Tuple[bytes, float]]:
+        """
+        Serve the newest cached page for a wallet if it is younger than ``max_age``.
+
+        Counts a hit (and the bytes not re-fetched) or a miss.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, captured_at, raw_bytes FROM pages WHERE chain = ? AND wallet_address = ? AND captured_at >= ? ORDER BY captured_at DESC LIMIT 1",
+                (chain, wallet_address, time.time() - max_age),
+            ).fetchone()
+        html = self.read(row[0]) if row else None
+        if html is None:
+            self._bump(misses=1)
+            return None
+        self._bump(hits=1, bytes_saved=row[2])
+        return html, row[1]
+
+    def iter_pages(self, wallet_address: Optional[str] = None, chain: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield index entries (newest first) for re-extraction"""
+        sql = "SELECT chain, wallet_address, captured_at, sha256, raw_bytes FROM pages"
+        clauses, params = [], []
+        if chain:
+            clauses.append("chain = ?")
+            params.append(chain)
+        if wallet_address:
+            clauses.append("wallet_address = ?")
+            params.append(wallet_address)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY captured_at DESC"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for c, w, at, sha, size in rows:
+            yield {"chain": c, "wallet_address": w, "captured_at": at, "sha256": sha, "raw_bytes": size}
+
+    def evict(self) -> Dict[str, int]:
+        """Drop pages past the TTL, then the oldest pages until blobs fit in ``max_bytes``"""
+        with self._lock:
+            return self._evict()
+
+    def _evict(self) -> Dict[str, int]:
+        with self._conn:
+            expired = self._conn.execute("DELETE FROM pages WHERE captured_at < ?", (time.time() - self.ttl,)).rowcount
+        removed_blobs = self._drop_unreferenced()
+
+        total = self._conn.execute("SELECT COALESCE(SUM(stored_bytes), 0) FROM blobs").fetchone()[0]
+        evicted = 0
+        while total > self.max_bytes:
+            oldest = self._conn.execute("SELECT chain, wallet_address, captured_at FROM pages ORDER BY captured_at LIMIT 64").fetchall()
+            if not oldest:
+                break
+            with self._conn:
+                self._conn.executemany("DELETE FROM pages WHERE chain = ? AND wallet_address = ? AND captured_at = ?", oldest)
+            evicted += len(oldest)
+            removed_blobs += self._drop_unreferenced()
+            total = self._conn.execute("SELECT COALESCE(SUM(stored_bytes), 0) FROM blobs").fetchone()[0]
+        return {"expired_pages": expired, "evicted_pages": evicted, "removed_blobs": removed_blobs}
+
+    def _drop_unreferenced(self) -> int:
+        orphans = [r[0] for r in self._conn.execute("SELECT sha256 FROM blobs WHERE sha256 NOT IN (SELECT sha256 FROM pages)").fetchall()]
+        for sha in orphans:
+            try:
+                self._blob_path(sha).unlink()
+            except OSError:
+                pass
+        with self._conn:
+            self._conn.executemany("DELETE FROM blobs WHERE sha256 = ?", [(s,) for s in orphans])
+        return len(orphans)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            pages, raw_total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(raw_bytes), 0) FROM pages").fetchone()
+            blobs, blob_raw, stored = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(raw_bytes), 0), COALESCE(SUM(stored_bytes), 0) FROM blobs").fetchone()
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "pages": pages,
+            "unique_blobs": blobs,
+            "stored_bytes": stored,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+            # Bytes not fetched again thanks to hits, and bytes not written thanks to dedupe + gzip
+            "bytes_saved_fetch": counters.get("bytes_saved", 0),
+            "bytes_saved_storage": raw_total - stored,
+            "compression_ratio": round(blob_raw / stored, 2) if stored else None,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def reextract(cache: PageCache, wallet_address: Optional[str] = None, chain: Optional[str] = None, latest_only: bool = False, debug: bool = False) -> Iterator[Dict[str, Any]]:
+    """Run the current extractor over cached pages; no browser involved"""
+    from gmgn_scrape import build_result, extract_7d_realized_pnl_from_html
+
+    seen = set()
+    for entry in cache.iter_pages(wallet_address, chain):
+        key = (entry["chain"], entry["wallet_address"])
+        if latest_only and key in seen:
+            continue
+        seen.add(key)
+        html = cache.read(entry["sha256"])
+        if html is None:
+            continue
+        value, info = extract_7d_realized_pnl_from_html(html, debug=debug)
+        result = build_result(entry["wallet_address"], value, info, url=f"https://gmgn.ai/{entry['chain']}/address/{entry['wallet_address']}", debug=debug)
+        result["captured_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(entry["captured_at"]))
+        result["sha256"] = entry["sha256"]
+        yield result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect, evict or re-extract the fetched page cache")
+    parser.add_argument("--dir", default=PAGE_CACHE_DIR, help=f"Cache directory (default: {PAGE_CACHE_DIR})")
+    parser.add_argument("--ttl", type=float, default=PAGE_CACHE_TTL, help="Seconds to keep pages (default: 30 days)")
+    parser.add_argument("--max-bytes", type=int, default=PAGE_CACHE_MAX_BYTES, help="Compressed size cap (default: 2 GB)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Hit rate, bytes saved and size on disk")
+    sub.add_parser("evict", help="Apply TTL and size limits now")
+    p_re = sub.add_parser("reextract", help="Re-run extraction over cached pages")
+    p_re.add_argument("--wallet", help="Only this wallet address")
+    p_re.add_argument("--chain", help="Only this chain")
+    p_re.add_argument("--latest-only", action="store_true", help="Only the newest page per wallet")
+    p_re.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    cache = PageCache(args.dir, ttl=args.ttl, max_bytes=args.max_bytes)
+    try:
+        if args.command == "stats":
+            print(json.dumps(cache.stats(), indent=2))
+        elif args.command == "evict":
+            print(json.dumps(cache.evict()))
+        else:
+            count = 0
+            start = time.perf_counter()
+            for result in reextract(cache, args.wallet, args.chain, latest_only=args.latest_only, debug=args.debug):
+                count += 1
+                print(json.dumps(result, ensure_ascii=False))
+            print(f"Re-extracted {count} cached pages in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
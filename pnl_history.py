@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite history of wallet PnL snapshots.
+Snapshots are keyed by (chain, wallet_address, captured_at, seq); a companion
+wallet_latest table is maintained in the same transaction so "latest 7D PnL
+per wallet" is a straight table read instead of a scan of all history.
+captured_at has microsecond resolution; seq tells apart snapshots of one wallet
+that still share a stamp within a batch, in batch order. Imported rows that
+predate Captured_At are filed under UNDATED_CAPTURED_AT with their position in
+the store as seq, so re-importing is idempotent and never collapses them.
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from results_store import METRIC_COLUMNS, RESULTS_FILE, iter_rows, utc_timestamp, wallet_address_for
+
+
+HISTORY_DB = "pnl_history.db"
+
+SNAPSHOT_COLUMNS = ["chain", "wallet_address", "captured_at", "seq", "pnl_7d", "currency", "text_value", "confidence", "strategy", "url", "file", "pnl_30d", "winrate", "unrealized_pnl", "total_pnl"]
+
+# Metric columns added after the first release; connect() adds them to older databases
+ADDED_COLUMNS = {"pnl_30d": "REAL", "winrate": "REAL", "unrealized_pnl": "REAL", "total_pnl": "REAL"}
+
+# Stamp for imported rows written before profit.jsonl had Captured_At; sorts before every real capture
+UNDATED_CAPTURED_AT = "0000-00-00T00:00:00.000000Z"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pnl_snapshots (
+    chain TEXT NOT NULL,
+    wallet_address TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0,
+    pnl_7d REAL,
+    currency TEXT,
+    text_value TEXT,
+    confidence REAL,
+    strategy TEXT,
+    url TEXT,
+    file TEXT,
+    pnl_30d REAL,
+    winrate REAL,
+    unrealized_pnl REAL,
+    total_pnl REAL,
+    PRIMARY KEY (chain, wallet_address, captured_at, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshots_captured_at ON pnl_snapshots (captured_at);
+CREATE TABLE IF NOT EXISTS wallet_latest (
+    chain TEXT NOT NULL,
+    wallet_address TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0,
+    pnl_7d REAL,
+    currency TEXT,
+    text_value TEXT,
+    confidence REAL,
+    strategy TEXT,
+    url TEXT,
+    file TEXT,
+    pnl_30d REAL,
+    winrate REAL,
+    unrealized_pnl REAL,
+    total_pnl REAL,
+    PRIMARY KEY (chain, wallet_address)
+) WITHOUT ROWID;
+"""
+
+_COLS = ", ".join(SNAPSHOT_COLUMNS)
+_PARAMS = ", ".join("?" for _ in SNAPSHOT_COLUMNS)
+_UPDATES = ", ".join(f"{c} = excluded.{c}" for c in SNAPSHOT_COLUMNS[4:])
+
+UPSERT_SNAPSHOT_SQL = f"""
+INSERT INTO pnl_snapshots ({_COLS}) VALUES ({_PARAMS})
+ON CONFLICT (chain, wallet_address, captured_at, seq) DO UPDATE SET {_UPDATES}
+"""
+
+# Only move the latest pointer forward; replaying old snapshots never regresses it
+UPSERT_LATEST_SQL = f"""
+INSERT INTO wallet_latest ({_COLS}) VALUES ({_PARAMS})
+ON CONFLICT (chain, wallet_address) DO UPDATE SET captured_at = excluded.captured_at, seq = excluded.seq, {_UPDATES}
+WHERE (excluded.captured_at, excluded.seq) >= (wallet_latest.captured_at, wallet_latest.seq)
+"""
+
+
+def connect(path: str = HISTORY_DB) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    for table in ("pnl_snapshots", "wallet_latest"):
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, kind in ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+        if "seq" not in existing:
+            _add_seq(conn, table)
+    return conn
+
+
+def _add_seq(conn: sqlite3.Connection, table: str) -> None:
+    # seq is part of the snapshot primary key, which ALTER TABLE cannot change: rebuild the table
+    columns = ", ".join(c for c in SNAPSHOT_COLUMNS if c != "seq")
+    conn.executescript(f"""
+        BEGIN;
+        DROP INDEX IF EXISTS idx_snapshots_captured_at;
+        ALTER TABLE {table} RENAME TO {table}_old;
+        {SCHEMA}
+        INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_old;
+        DROP TABLE {table}_old;
+        COMMIT;
+    """)
+
+
+def snapshot_from_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a result record (or a profit.jsonl row) into a history snapshot"""
+    url = result.get("url") or result.get("URL") or ""
+    chain = result.get("chain")
+    match = re.search(r"gmgn\.ai/([a-z0-9]+)/address/([^/?#]+)", url)
+    if not chain:
+        chain = match.group(1) if match else "sol"
+    wallet = result.get("wallet_address") or (match.group(2) if match else None)
+    if not wallet:
+        wallet = result.get("Wallet_Address") or wallet_address_for(result)
+    return {
+        "chain": chain,
+        "wallet_address": wallet,
+        "captured_at": result.get("captured_at") or result.get("Captured_At") or utc_timestamp(),
+        "seq": 0,
+        "pnl_7d": result.get("pnl_7d", result.get("PnL_7D")),
+        "currency": result.get("currency", result.get("Currency", "USD")),
+        "text_value": result.get("text_value", result.get("Text_Value")),
+        "confidence": result.get("confidence", result.get("Confidence")),
+        "strategy": result.get("strategy", result.get("Strategy")),
+        "url": url or None,
+        "file": result.get("file", result.get("File")),
+        **{key: result.get(key, result.get(column)) for key, column in METRIC_COLUMNS.items()},
+    }
+
+
+def upsert_snapshots(conn: sqlite3.Connection, snapshots: Iterable[Dict[str, Any]]) -> int:
+    """Upsert a batch of snapshots in one transaction; returns the number of rows written"""
+    # Snapshots of one wallet sharing a stamp get seq 0, 1, 2... in batch order instead of overwriting each other
+    seen: Dict[tuple, int] = {}
+    rows = []
+    for s in snapshots:
+        key = (s["chain"], s["wallet_address"], s["captured_at"])
+        seq = seen[key] = seen.get(key, -1) + 1
+        rows.append(tuple(seq if c == "seq" else s.get(c) for c in SNAPSHOT_COLUMNS))
+    if not rows:
+        return 0
+    with conn:
+        conn.executemany(UPSERT_SNAPSHOT_SQL, rows)
+        conn.executemany(UPSERT_LATEST_SQL, rows)
+    return len(rows)
+
+
+def record_results(results: Iterable[Dict[str, Any]], path: str = HISTORY_DB) -> int:
+    """Store result records from a run as history snapshots"""
+    conn = connect(path)
+    try:
+        return upsert_snapshots(conn, (snapshot_from_result(r) for r in results))
+    finally:
+        conn.close()
+
+
+def import_store(store: str = RESULTS_FILE, path: str = HISTORY_DB) -> int:
+    """Backfill history from the JSONL results store, keeping rows without Captured_At apart in store order"""
+    def rows() -> Iterable[Dict[str, Any]]:
+        for row in iter_rows(store):
+            if not (row.get("captured_at") or row.get("Captured_At")):
+                row = dict(row, captured_at=UNDATED_CAPTURED_AT)
+            yield row
+
+    return record_results(rows(), path)
+
+
+def latest(conn: sqlite3.Connection, wallet: Optional[str] = None, chain: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Latest snapshot per wallet, optionally for one wallet/chain"""
+    sql = f"SELECT {_COLS} FROM wallet_latest"
+    clauses, params = [], []
+    if chain:
+        clauses.append("chain = ?")
+        params.append(chain)
+    if wallet:
+        clauses.append("wallet_address = ?")
+        params.append(wallet)
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [dict(zip(SNAPSHOT_COLUMNS, r)) for r in conn.execute(sql, params)]
+
+
+def history(conn: sqlite3.Connection, since: Optional[str] = None, until: Optional[str] = None, wallet: Optional[str] = None, chain: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Snapshots in [since, until], newest first; uses the primary key for one wallet and the time index otherwise"""
+    clauses, params = [], []
+    if chain:
+        clauses.append("chain = ?")
+        params.append(chain)
+    if wallet:
+        clauses.append("wallet_address = ?")
+        params.append(wallet)
+    if since:
+        clauses.append("captured_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("captured_at <= ?")
+        params.append(until)
+    sql = f"SELECT {_COLS} FROM pnl_snapshots"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY captured_at DESC, seq DESC"
+    return [dict(zip(SNAPSHOT_COLUMNS, r)) for r in conn.execute(sql, params)]
+
+
+def _bench(path: str, wallets: int, snapshots_per_wallet: int) -> Dict[str, Any]:
+    # Synthetic load: N wallets x M snapshots, then time the latest-per-wallet query
+    conn = connect(path)
+    start = time.perf_counter()
+    for k in range(snapshots_per_wallet):
+        stamp = f"2026-01-{k + 1:02d}T00:00:00.000000Z"
+        upsert_snapshots(conn, (
+            {"chain": "sol", "wallet_address": f"W{i:08d}", "captured_at": stamp, "pnl_7d": float(i % 1000 - 500), "currency": "USD"}
+            for i in range(wallets)
+        ))
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    rows = latest(conn)
+    query_seconds = time.perf_counter() - start
+    conn.close()
+    return {
+        "wallets": wallets,
+        "snapshots": wallets * snapshots_per_wallet,
+        "upsert_seconds": round(load_seconds, 3),
+        "latest_rows": len(rows),
+        "latest_query_seconds": round(query_seconds, 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the wallet PnL snapshot history")
+    parser.add_argument("--db", default=HISTORY_DB, help=f"SQLite history database (default: {HISTORY_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_latest = sub.add_parser("latest", help="Latest 7D PnL per wallet")
+    p_latest.add_argument("--wallet", help="Only this wallet address")
+    p_latest.add_argument("--chain", help="Only this chain")
+    p_latest.add_argument("--limit", type=int, help="Max rows")
+
+    p_range = sub.add_parser("range", help="Snapshots within a time range")
+    p_range.add_argument("--since", help="ISO timestamp, inclusive (e.g. 2026-01-01T00:00:00Z)")
+    p_range.add_argument("--until", help="ISO timestamp, inclusive")
+    p_range.add_argument("--wallet", help="Only this wallet address")
+    p_range.add_argument("--chain", help="Only this chain")
+
+    p_import = sub.add_parser("import", help="Backfill history from the JSONL results store")
+    p_import.add_argument("--store", default=RESULTS_FILE, help=f"JSONL results store (default: {RESULTS_FILE})")
+
+    p_bench = sub.add_parser("bench", help="Time latest-per-wallet on synthetic data")
+    p_bench.add_argument("--wallets", type=int, default=100000)
+    p_bench.add_argument("--snapshots", type=int, default=3, help="Snapshots per wallet")
+
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(json.dumps(_bench(args.db, args.wallets, args.snapshots)))
+        return
+    if args.command == "import":
+        count = import_store(args.store, args.db)
+        print(f"Upserted {count} snapshots from {args.store} into {args.db}")
+        return
+
+    conn = connect(args.db)
+    try:
+        start = time.perf_counter()
+        if args.command == "latest":
+            rows = latest(conn, wallet=args.wallet, chain=args.chain, limit=args.limit)
+        else:
+            rows = history(conn, since=args.since, until=args.until, wallet=args.wallet, chain=args.chain)
+        elapsed = time.perf_counter() - start
+    finally:
+        conn.close()
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+    print(f"{len(rows)} rows in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
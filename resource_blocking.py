@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Resource-blocking profile for live wallet renders.
+A wallet page pulls in images, web fonts, media and third-party analytics,
+and none of them are read. Firefox ignores Chrome switches such as
+--disable-images, so each browser gets what it actually honours:
+- Firefox: preferences that stop image, web-font and media loads, plus a PAC
+  script that sends analytics hosts (and plain-http asset URLs) to a dead proxy.
+- Chrome: CDP Network.setBlockedURLs with the same extension and host patterns.
+Scripts, stylesheets, documents and fetch/XHR are never blocked, since the
+Cloudflare challenge and the wallet data need them.
+
+``python resource_blocking.py wallets.txt`` renders the same wallets with and
+without blocking and reports bytes transferred and load time for each.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+
+# Asset extensions no extraction strategy reads
+BLOCKED_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "ogg", "wav", "m4a",
+]
+
+# Analytics, tag managers and session recorders seen on the site; never the challenge or API hosts
+BLOCKED_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "connect.facebook.net", "analytics.twitter.com", "static.ads-twitter.com",
+    "hotjar.com", "mixpanel.com", "segment.io", "segment.com", "amplitude.com",
+    "clarity.ms", "intercom.io", "sentry.io", "datadoghq.com", "fullstory.com",
+]
+
+# Nothing listens here, so blocked connections fail at once instead of timing out
+DEAD_PROXY = "PROXY 127.0.0.1:9"
+
+# Page weight from the Performance API. transferSize is 0 for cache hits and for
+# cross-origin entries without Timing-Allow-Origin, so the byte count is a lower bound.
+PAGE_WEIGHT_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var entries = performance.getEntriesByType('resource');
+var byType = {};
+var bytes = nav ? (nav.transferSize || 0) : 0;
+var decoded = nav ? (nav.decodedBodySize || 0) : 0;
+entries.forEach(function (e) {
+    var t = byType[e.initiatorType] = byType[e.initiatorType] || {count: 0, bytes: 0};
+    t.count += 1;
+    t.bytes += e.transferSize || 0;
+    bytes += e.transferSize || 0;
+    decoded += e.decodedBodySize || 0;
+});
+return {
+    transfer_bytes: bytes,
+    decoded_bytes: decoded,
+    resources: entries.length,
+    by_type: byType,
+    dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd - nav.startTime) : null,
+    load_ms: nav && nav.loadEventEnd ? Math.round(nav.loadEventEnd - nav.startTime) : null
+};
+"""
+
+
+def pac_script() -> str:
+    """PAC script routing BLOCKED_HOSTS (and plain-http asset URLs) to DEAD_PROXY"""
+    # Firefox hands PAC only scheme://host for https, so extensions can only be matched on http URLs
+    return """function FindProxyForURL(url, host) {
+    var hosts = %(hosts)s;
+    for (var i = 0; i < hosts.length; i++) {
+        if (host === hosts[i] || dnsDomainIs(host, '.' + hosts[i])) { return '%(dead)s'; }
+    }
+    if (/\\.(%(extensions)s)(\\?|#|$)/i.test(url)) { return '%(dead)s'; }
+    return 'DIRECT';
+}""" % {"hosts": json.dumps(BLOCKED_HOSTS), "dead": DEAD_PROXY, "extensions": "|".join(BLOCKED_EXTENSIONS)}
+
+
+def firefox_blocking_preferences() -> Dict[str, Any]:
+    """Firefox preferences for the blocking profile"""
+    return {
+        # 2 = block all images
+        "permissions.default.image": 2,
+        "gfx.downloadable_fonts.enabled": False,
+        "browser.display.use_document_fonts": 0,
+        # 5 = block all autoplay; preload nothing for <video>/<audio>
+        "media.autoplay.default": 5,
+        "media.preload.default": 0,
+        "media.preload.auto": 0,
+        "network.prefetch-next": False,
+        "network.dns.disablePrefetch": True,
+        "network.http.speculative-parallel-limit": 0,
+        # 2 = proxy auto-config
+        "network.proxy.type": 2,
+        "network.proxy.autoconfig_url": "data:application/x-ns-proxy-autoconfig," + quote(pac_script()),
+    }
+
+
+def apply_firefox_blocking(firefox_options) -> None:
+    """Set the blocking preferences on a FirefoxOptions"""
+    for name, value in firefox_blocking_preferences().items():
+        firefox_options.set_preference(name, value)
+
+
+def chrome_blocked_url_patterns() -> List[str]:
+    """Network.setBlockedURLs wildcard patterns for the blocking profile"""
+    patterns = [f"*.{ext}" for ext in BLOCKED_EXTENSIONS] + [f"*.{ext}?*" for ext in BLOCKED_EXTENSIONS]
+    patterns += [f"*://{host}/*" for host in BLOCKED_HOSTS] + [f"*://*.{host}/*" for host in BLOCKED_HOSTS]
+    return patterns
+
+
+def enable_chrome_blocking(driver) -> bool:
+    """Install the blocklist on a Chrome driver through CDP; False if CDP is unavailable"""
+    execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+    if execute_cdp_cmd is None:
+        return False
+    try:
+        execute_cdp_cmd("Network.enable", {})
+        execute_cdp_cmd("Network.setBlockedURLs", {"urls": chrome_blocked_url_patterns()})
+    except Exception:
+        return False
+    return True
+
+
+def measure_page_load(driver) -> Dict[str, Any]:
+    """Bytes transferred, resource counts and load timings of the page the driver has loaded"""
+    try:
+        return driver.execute_script(PAGE_WEIGHT_SCRIPT) or {}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def median(key: str) -> Optional[float]:
+        values = [r[key] for r in rows if r.get(key) is not None]
+        return round(statistics.median(values), 3) if values else None
+
+    return {
+        "pages": len(rows),
+        "found": sum(r["value"] is not None for r in rows),
+        "transfer_bytes_median": median("transfer_bytes"),
+        "resources_median": median("resources"),
+        "load_ms_median": median("load_ms"),
+        "render_seconds_median": median("render_seconds"),
+    }
+
+
+def benchmark(addresses: List[str], chain: str = "sol", browser: str = "firefox", headless: bool = True, cookies_file: Optional[str] = None, base_url: Optional[str] = None, ready_timeout: float = 5.0, debug: bool = False) -> Dict[str, Any]:
+    """
+    Render every wallet once without and once with blocking, one fresh browser per mode.
+
+    Returns:
+        {"off": summary, "on": summary, "transfer_reduction", "load_time_reduction",
+        "value_mismatches": wallets whose extracted value differs between modes}
+    """
+    from gmgn_scrape import create_live_driver, fetch_wallet_with_driver, open_gmgn_session
+
+    report: Dict[str, Any] = {"browser": browser}
+    values: Dict[str, Dict[str, Optional[float]]] = {}
+    for mode, block in (("off", False), ("on", True)):
+        driver = create_live_driver(headless=headless, browser=browser, block_resources=block)
+        rows: List[Dict[str, Any]] = []
+        try:
+            open_gmgn_session(driver, cookies_file=cookies_file, debug=debug, base_url=base_url)
+            for address in addresses:
+                start = time.perf_counter()
+                value, info = fetch_wallet_with_driver(driver, address, chain=chain, debug=debug, ready_timeout=ready_timeout, base_url=base_url)
+                row = {"wallet": address, "blocking": mode, "value": value, "render_seconds": round(time.perf_counter() - start, 3)}
+                row.update(measure_page_load(driver))
+                if info.get("error"):
+                    row["error"] = info["error"]
+                rows.append(row)
+                values.setdefault(address, {})[mode] = value
+                print(json.dumps(row), flush=True)
+        finally:
+            driver.quit()
+        report[mode] = _summarize(rows)
+
+    def reduction(key: str) -> Optional[float]:
+        off, on = report["off"].get(key), report["on"].get(key)
+        return round(1 - on / off, 3) if off and on is not None else None
+
+    report["transfer_reduction"] = reduction("transfer_bytes_median")
+    report["load_time_reduction"] = reduction("load_ms_median")
+    report["value_mismatches"] = [a for a, v in values.items() if v.get("off") != v.get("on")]
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare wallet page renders with and without resource blocking (bytes transferred, load time)")
+    parser.add_argument("wallet_list", help="File with one wallet address per line")
+    parser.add_argument("--limit", type=int, default=5, help="Wallets to render per mode (default: 5)")
+    parser.add_argument("--chain", default="sol", help="Blockchain chain (default: sol)")
+    parser.add_argument("--browser", choices=["firefox", "chrome"], default="firefox")
+    parser.add_argument("--no-headless", action="store_true", help="Show the browser window")
+    parser.add_argument("--cookies", help="Saved cookies (save_cookies.py / --save-cookies)")
+    parser.add_argument("--base-url", help="Site root (default: https://gmgn.ai)")
+    parser.add_argument("--ready-timeout", type=float, default=5.0, help="Max seconds to wait for PnL data to render (default: 5)")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.wallet_list, "r", encoding="utf-8") as f:
+        addresses = [line.strip() for line in f if line.strip() and not line.startswith("#")][:args.limit]
+    report = benchmark(
+        addresses, chain=args.chain, browser=args.browser, headless=not args.no_headless, cookies_file=args.cookies,
+        base_url=args.base_url, ready_timeout=args.ready_timeout, debug=args.debug,
+    )
+    print(json.dumps({"blocking": report}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Append-only results store.
+Each result is one JSON line appended to profit.jsonl, so recording a result
+costs the same no matter how much history exists. profit.xlsx is produced
+from the store in one pass at the end of a run, or on demand.
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+
+RESULTS_FILE = "profit.jsonl"
+EXCEL_FILE = "profit.xlsx"
+
+# Column order of profit.xlsx; Captured_At and the metric columns after it are new, the rest match the original sheet
+EXCEL_COLUMNS = ["Wallet_Address", "PnL_7D", "Currency", "Text_Value", "Confidence", "Strategy", "URL", "File", "Captured_At", "PnL_30D", "Winrate", "Unrealized_PnL", "Total_PnL"]
+
+# Result keys of the extra headline metrics -> profit.xlsx columns
+METRIC_COLUMNS = {"pnl_30d": "PnL_30D", "winrate": "Winrate", "unrealized_pnl": "Unrealized_PnL", "total_pnl": "Total_PnL"}
+
+
+def utc_timestamp() -> str:
+    """Capture time in a fixed-width UTC format that sorts lexically, to the microsecond"""
+    now = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)) + f".{int(now % 1 * 1_000_000):06d}Z"
+
+
+def wallet_address_for(result: Dict[str, Any]) -> str:
+    """Use the wallet label, falling back to the address embedded in the URL"""
+    wallet_address = result.get("wallet", "Unknown")
+    if not wallet_address or wallet_address == "Unknown":
+        # Try to extract from URL
+        url = result.get("url", "") or ""
+        if url and "/address/" in url:
+            wallet_address = url.split("/address/")[-1].split("?")[0]
+        elif url and "gmgn.ai" in url:
+            # Try different patterns for wallet addresses
+            patterns = [
+                r'/([a-zA-Z0-9]{32,44})',  # Standard wallet address length
+                r'/([a-zA-Z0-9]{4,})',     # Fallback for shorter addresses
+            ]
+            for pattern in patterns:
+                match = re.search(pattern, url)
+                if match:
+                    wallet_address = match.group(1)
+                    break
+    return wallet_address or "Unknown"
+
+
+def result_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a result record onto the profit.xlsx columns"""
+    return {
+        "Wallet_Address": wallet_address_for(result),
+        "PnL_7D": result.get("pnl_7d", 0.0),
+        "Currency": result.get("currency", "USD"),
+        "Text_Value": result.get("text_value", ""),
+        "Confidence": result.get("confidence", 0.0),
+        "Strategy": result.get("strategy", ""),
+        "URL": result.get("url", ""),
+        "File": result.get("file", ""),
+        "Captured_At": result.get("captured_at") or utc_timestamp(),
+        **{column: result.get(key) for key, column in METRIC_COLUMNS.items()},
+    }
+
+
+def _seed_from_excel(store: Path, excel_file: str) -> None:
+    # One-time migration: carry rows already in profit.xlsx into a fresh store
+    if store.exists() or not Path(excel_file).exists():
+        return
+    try:
+        import pandas as pd  # type: ignore
+        existing = pd.read_excel(excel_file, engine='openpyxl')
+    except Exception:
+        return
+    with store.open("a", encoding="utf-8") as f:
+        for row in existing.to_dict(orient="records"):
+            clean = {k: (None if isinstance(v, float) and v != v else v) for k, v in row.items()}
+            f.write(json.dumps(clean, ensure_ascii=False, default=str) + "\n")
+
+
+def _ends_with_newline(store: Path) -> bool:
+    # True for a missing or empty store too
+    try:
+        with store.open("rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    except FileNotFoundError:
+        return True
+
+
+def append_result(result: Dict[str, Any], path: str = RESULTS_FILE, excel_file: str = EXCEL_FILE, durable: bool = True) -> Dict[str, Any]:
+    """
+    Append one result to the store.
+
+    Args:
+        result: Result record as printed by gmgn_scrape.main()
+        path: JSONL store path
+        excel_file: Existing sheet to import rows from when the store is first created
+        durable: fsync after the write so a crash cannot lose acknowledged rows
+
+    Returns:
+        The row that was written
+    """
+    store = Path(path)
+    _seed_from_excel(store, excel_file)
+    row = result_row(result)
+    line = json.dumps(row, ensure_ascii=False, default=str) + "\n"
+    if not _ends_with_newline(store):
+        # A crash left a torn last line; start a fresh one so this row is not glued onto it
+        line = "\n" + line
+    # A single write of a whole line; readers skip a torn final line after a crash
+    with store.open("a", encoding="utf-8") as f:
+        f.write(line)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    return row
+
+
+def iter_rows(path: str = RESULTS_FILE) -> Iterator[Dict[str, Any]]:
+    """Yield stored rows, skipping a partially written last line"""
+    store = Path(path)
+    if not store.exists():
+        return
+    with store.open("r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def export_excel(path: str = RESULTS_FILE, excel_file: str = EXCEL_FILE) -> int:
+    """Rewrite profit.xlsx from the store in one pass; returns the number of rows written"""
+    import pandas as pd  # type: ignore
+
+    rows: List[Dict[str, Any]] = list(iter_rows(path))
+    if not rows and Path(excel_file).exists():
+        # Nothing recorded yet - leave the existing sheet alone
+        return 0
+    df = pd.DataFrame(rows)
+    extra = [c for c in df.columns if c not in EXCEL_COLUMNS]
+    df = df.reindex(columns=EXCEL_COLUMNS + extra)
+    tmp = Path(excel_file).with_name(Path(excel_file).stem + ".tmp.xlsx")
+    df.to_excel(tmp, index=False, engine='openpyxl')
+    os.replace(tmp, excel_file)
+    return len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the append-only results store to profit.xlsx")
+    parser.add_argument("--store", default=RESULTS_FILE, help=f"JSONL results store (default: {RESULTS_FILE})")
+    parser.add_argument("--excel-file", default=EXCEL_FILE, help=f"Excel file to write (default: {EXCEL_FILE})")
+    args = parser.parse_args()
+
+    count = export_excel(args.store, args.excel_file)
+    print(f"Exported {count} rows from {args.store} to {args.excel_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,10 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 
+from driver_resolver import resolve_driver
+
 def save_gmgn_cookies(cookies_file: str = "gmgn_cookies.json"):
     """Save GMGN.ai cookies after manual login"""
     
@@ -24,7 +25,7 @@ def save_gmgn_cookies(cookies_file: str = "gmgn_cookies.json"):
     chrome_options.add_argument("--window-size=1920,1080")
     
     # Initialize Chrome driver
-    service = Service(ChromeDriverManager().install())
+    service = Service(resolve_driver("chrome"))
     driver = webdriver.Chrome(service=service, options=chrome_options)
     
     try:
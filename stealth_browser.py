@@ -7,11 +7,12 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 import time
 import random
 
+from driver_resolver import resolve_driver
+
 def stealth_browser():
     options = Options()
     
@@ -34,7 +35,7 @@ def stealth_browser():
     # Random delays
     time.sleep(random.uniform(1, 3))
     
-    service = Service(ChromeDriverManager().install())
+    service = Service(resolve_driver("chrome"))
     driver = webdriver.Chrome(service=service, options=options)
     
     try:
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Persisted per-strategy hit rates and costs, used to reorder the extraction pipeline.
+Profile records from every run are folded into a small JSON file; the next run
+orders strategies by expected cost per hit (mean cost / hit rate, cheapest first),
+so pages stop paying for scans that rarely find anything on our corpus.
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from gmgn_scrape import EXTRACTION_STRATEGIES, StrategyFn, set_strategy_order
+
+
+STRATEGY_STATS_FILE = Path(os.environ.get("GMGN_STRATEGY_STATS", str(Path.home() / ".cache" / "gmgn_scrape" / "strategy_stats.json")))
+
+# Proximity heuristics can match a different amount than a labelled field on the
+# same page (label_global takes any Realized Profit/PnL label, 30D included), so
+# they always run after the exact strategies, in their original order. Only the
+# exact ones move.
+FUZZY_STRATEGIES = ("analysis_card_keywords", "raw_text_vicinity_7d", "label_global")
+
+# Counts are halved past this many attempts so the stats follow changes in the site
+MAX_ATTEMPTS = 10000
+
+# fixed: the listed order. adaptive: learned order, stats updated and saved after the run.
+# frozen: learned order from the saved stats, never updated - reproducible across runs.
+STRATEGY_ORDER_MODES = ("fixed", "adaptive", "frozen")
+
+
+class StrategyStats:
+    """
+    Args:
+        path: JSON file the stats are loaded from and saved to
+    """
+
+    def __init__(self, path: Path = STRATEGY_STATS_FILE):
+        self.path = Path(path)
+        self.strategies: Dict[str, Dict[str, float]] = {}
+        self.parse_ms = 0.0
+        self.parses = 0
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.strategies = data.get("strategies", {})
+        self.parse_ms = data.get("parse_ms", 0.0)
+        self.parses = data.get("parses", 0)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"updated_at": time.time(), "parse_ms": self.parse_ms, "parses": self.parses, "strategies": self.strategies}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def __call__(self, name: str, record: Dict[str, Any]) -> None:
+        # Same signature as a gmgn_scrape.PROFILE_HOOKS entry
+        s = self.strategies.setdefault(name, {"attempts": 0, "hits": 0, "ms": 0.0, "dom": 0})
+        if record.get("memo"):
+            # Served from the extraction memo: count the outcome at the strategy's current mean cost
+            if s["attempts"]:
+                s["ms"] += s["ms"] / s["attempts"]
+                s["dom"] += s["dom"] / s["attempts"]
+            s["attempts"] += 1
+            s["hits"] += bool(record.get("hit"))
+            self._decay(s)
+            return
+        s["attempts"] += 1
+        s["hits"] += bool(record.get("hit"))
+        parse_ms = record.get("parse_ms", 0.0)
+        # The one-off parse is tracked separately; it is paid by whichever DOM strategy runs first
+        s["ms"] += max(0.0, record.get("ms", 0.0) - parse_ms)
+        s["dom"] += bool(record.get("dom"))
+        if parse_ms:
+            self.parse_ms += parse_ms
+            self.parses += 1
+        self._decay(s)
+
+    @staticmethod
+    def _decay(s: Dict[str, float]) -> None:
+        if s["attempts"] > MAX_ATTEMPTS:
+            for key in s:
+                s[key] /= 2
+
+    def add(self, profile: Dict[str, Dict[str, Any]]) -> None:
+        """Fold in one page's ``info["profile"]``"""
+        for name, record in profile.items():
+            self(name, record)
+
+    def expected_cost(self, name: str) -> float:
+        """Mean ms (plus the parse for DOM strategies) per hit, with a Laplace prior for unseen strategies"""
+        s = self.strategies.get(name)
+        if not s or not s["attempts"]:
+            return 0.0
+        mean_parse = self.parse_ms / self.parses if self.parses else 0.0
+        cost = s["ms"] / s["attempts"] + mean_parse * (s["dom"] / s["attempts"])
+        hit_rate = (s["hits"] + 1) / (s["attempts"] + 2)
+        return cost / hit_rate
+
+    def order(self, strategies: List[Tuple[str, StrategyFn]] = EXTRACTION_STRATEGIES) -> List[Tuple[str, StrategyFn]]:
+        """Exact strategies by expected cost per hit, then the fuzzy ones as listed; ties keep the listed order"""
+        exact = [(i, s) for i, s in enumerate(strategies) if s[0] not in FUZZY_STRATEGIES]
+        fuzzy = [s for s in strategies if s[0] in FUZZY_STRATEGIES]
+        # Unseen strategies cost 0 and so get tried, which is how they collect stats
+        exact.sort(key=lambda item: (round(self.expected_cost(item[1][0]), 6), item[0]))
+        return [s for _, s in exact] + fuzzy
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "order": [name for name, _ in self.order()],
+            "mean_parse_ms": round(self.parse_ms / self.parses, 3) if self.parses else None,
+            "strategies": {
+                name: {
+                    "attempts": int(s["attempts"]),
+                    "hit_rate": round(s["hits"] / s["attempts"], 3) if s["attempts"] else None,
+                    "mean_ms": round(s["ms"] / s["attempts"], 3) if s["attempts"] else None,
+                    "expected_cost_per_hit_ms": round(self.expected_cost(name), 3),
+                }
+                for name, s in self.strategies.items()
+            },
+        }
+
+
+def apply_strategy_order(mode: str, path: Optional[str] = None) -> Tuple[Optional[StrategyStats], List[str]]:
+    """
+    Set the extraction engine's default strategy order for this run.
+
+    Returns:
+        (stats to feed profile records into and save - adaptive mode only, strategy names in run order)
+    """
+    if mode == "fixed":
+        set_strategy_order(None)
+        return None, [name for name, _ in EXTRACTION_STRATEGIES]
+    stats = StrategyStats(Path(path) if path else STRATEGY_STATS_FILE)
+    order = stats.order()
+    set_strategy_order(order)
+    return (stats if mode == "adaptive" else None), [name for name, _ in order]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show or reset the persisted strategy statistics behind --strategy-order adaptive")
+    parser.add_argument("--stats", default=str(STRATEGY_STATS_FILE), help=f"Stats file (default: {STRATEGY_STATS_FILE})")
+    parser.add_argument("--reset", action="store_true", help="Delete the stats file")
+    args = parser.parse_args()
+
+    if args.reset:
+        Path(args.stats).unlink(missing_ok=True)
+        print(f"Removed {args.stats}")
+        return
+    print(json.dumps(StrategyStats(Path(args.stats)).summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
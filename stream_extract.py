@@ -0,0 +1,667 @@
+#!/usr/bin/env python3
+"""
+Streaming, early-exit extraction for large saved wallet pages.
+The page is read in fixed-size chunks and fed to lxml's incremental HTML parser
+with a callback target, so no tree is built. Every strategy keeps the first
+candidate it sees as its element closes or its text streams past. Reading stops
+once the highest-priority strategy with a candidate can no longer be beaten:
+every strategy ahead of it in the order has already settled without one, e.g.
+next_data_fast once __NEXT_DATA__ has been read. The pick is therefore the one
+the full engine makes. Memory is bounded by the chunk size, the largest
+script and the longest line after a PnL label, not the page.
+"""
+
+import argparse
+import codecs
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from lxml import etree  # type: ignore
+
+from gmgn_scrape import (
+    CONTEXT_REGEX,
+    EXTRACTION_STRATEGIES,
+    HEADLINE_METRICS,
+    METRIC_LABELS,
+    MONEY_REGEX,
+    NEXT_DATA_MARKER,
+    RED_DIV_STYLE,
+    TARGETED_DIV_CLASS,
+    TextTokens,
+    _metric_value,
+    _money_from_json_text,
+    _money_near_keywords,
+    _realized_pnl_fields,
+    best_field,
+    build_result,
+    extract_html_file,
+    format_money,
+    normalize_money_to_float,
+    wallet_label_from_path,
+)
+
+
+CHUNK_SIZE = 32 * 1024
+
+# Recent visible text nodes kept for ancestor context and the Analysis card
+TEXT_PIECES = 512
+
+# Scripts longer than this are dropped rather than buffered
+SCRIPT_LIMIT = 16 * 1024 * 1024
+
+# libxml2's push parser loses a "</script" split across two feeds, so a short
+# trailing "<..." fragment is held back and fed with the next chunk
+TAG_HOLDBACK = 64
+
+# libxml2's push parser also keeps every character it is fed, so it is replaced
+# by a fresh one about this often, right after an end tag, with the open
+# elements replayed into it
+RESTART_CHARS = 1024 * 1024
+
+# raw_text_vicinity_7d window, as in the full engine
+VICINITY_BEFORE, VICINITY_AFTER = 200, 400
+VICINITY_REGEX = re.compile(r"7\s*D", re.IGNORECASE)
+
+# label_global reads the whole line after a label; "$" + newline + "-<digit>" still counts as an amount,
+# so a line is only evaluated once this many characters past its newline have arrived
+LINE_TAIL = 3
+LABEL_REGEXES = [re.compile(r"Realized\s*(Profit|PnL)", re.IGNORECASE), re.compile(r"\bPnL\b", re.IGNORECASE)]
+
+CARD_CLASS_PREFIXES = ("bg-", "p-", "rounded-")
+
+
+# Returned by a scan's evaluate to end the scan without a result
+STOP = ("", "")
+
+
+class _WindowScan:
+    """
+    First match of ``pattern`` over a stream of text chunks whose window satisfies ``evaluate``.
+
+    Only ``before`` characters ahead of the next search position are kept between
+    chunks; a match is evaluated once ``after`` characters past it have arrived,
+    or with ``after=None`` once the rest of its line has. ``evaluate`` returns
+    None to move on to the next match and STOP to give up.
+    """
+
+    def __init__(self, pattern, before: int, after: Optional[int], evaluate: Callable[[str, Any], Optional[Tuple[str, str]]]):
+        self.pattern = pattern
+        self.before = before
+        self.after = after
+        self.evaluate = evaluate
+        self.result: Optional[Tuple[str, str]] = None
+        self.stopped = False
+        self._buf = ""
+        self._pos = 0
+        # Where the search for a deferred match's newline resumes
+        self._line_from = 0
+
+    @property
+    def settled(self) -> bool:
+        return self.result is not None or self.stopped
+
+    def _ready(self, m) -> bool:
+        if self.after is not None:
+            return m.end() + self.after <= len(self._buf)
+        nl = self._buf.find("\n", max(m.end(), self._line_from))
+        if nl == -1:
+            self._line_from = len(self._buf)
+            return False
+        self._line_from = nl
+        return nl + LINE_TAIL <= len(self._buf)
+
+    def feed(self, text: str, final: bool = False) -> None:
+        if self.settled:
+            return
+        self._buf += text
+        deferred = False
+        for m in self.pattern.finditer(self._buf, self._pos):
+            if not final and not self._ready(m):
+                self._pos = m.start()
+                deferred = True
+                break
+            self._line_from = 0
+            found = self.evaluate(self._buf, m)
+            if found is STOP:
+                self.stopped = True
+            elif found is not None:
+                self.result = found
+            if self.settled:
+                self._buf = ""
+                return
+        if not deferred:
+            # A match may straddle the chunk boundary
+            self._pos = max(self._pos, len(self._buf) - 32)
+        drop = max(0, self._pos - self.before)
+        self._buf = self._buf[drop:]
+        self._pos -= drop
+        self._line_from = max(0, self._line_from - drop)
+
+
+def _vicinity_money(buf: str, m) -> Optional[Tuple[str, str]]:
+    window = buf[max(0, m.start() - VICINITY_BEFORE) : m.end() + VICINITY_AFTER]
+    money = MONEY_REGEX.search(window)
+    return (money.group(0), window[:200]) if money else None
+
+
+def _label_money(buf: str, m) -> Optional[Tuple[str, str]]:
+    # As label_global: a label without "$<digit>" later on its line is skipped, and
+    # the first one with it decides, giving up if there is no whole amount on the line
+    tokens = TextTokens(buf[m.start() :])
+    label_end = m.end() - m.start()
+    line_end = tokens.line_end(label_end)
+    if tokens.first_dollar(label_end, line_end) is None:
+        return None
+    money = tokens.first_money(0, line_end)
+    return (money, tokens.text[:line_end][:120]) if money else STOP
+
+
+class _Open:
+    __slots__ = ("tag", "first_piece", "kinds", "card")
+
+    def __init__(self, tag: str, first_piece: int, kinds: Tuple[str, ...] = (), card: bool = False):
+        self.tag = tag
+        self.first_piece = first_piece
+        self.kinds = kinds
+        self.card = card
+
+
+class StreamingPage:
+    """
+    Incremental counterpart of gmgn_scrape.run_extraction_engine for one page.
+
+    feed() decoded text as it is read and check ``done``; finish() once the page
+    has ended (or reading stopped early) to get (value, info).
+    """
+
+    def __init__(self, strategies: Optional[List[str]] = None):
+        self.order = strategies or [name for name, _ in EXTRACTION_STRATEGIES]
+        # First (money_text, context) per strategy, and the strategy that wins once it is decided
+        self.candidates: Dict[str, Tuple[str, str]] = {}
+        self.winner: Optional[str] = None
+        self._eof = False
+        self.fields: Dict[str, float] = {}
+        self.metrics: Dict[str, Optional[float]] = {m: None for m in HEADLINE_METRICS}
+        self._stack: List[_Open] = []
+        self._pieces: Deque[Tuple[int, str]] = deque(maxlen=TEXT_PIECES)
+        self._piece_count = 0
+        self._pending: List[str] = []
+        self._script: Optional[Dict[str, Any]] = None
+        self._skip_depth = 0
+        self._card: Optional[_Open] = None
+        self._card_done = False
+        self._json_hits: Dict[int, str] = {}
+        self._next_data_seen = False
+        self._metric_wait: Dict[str, int] = {}
+        self._carry = ""
+        self._fed = 0
+        self._in_comment = False
+        self._suppress = 0
+        self._detached = False
+        self.restarts = 0
+        self._scans = {
+            "raw_text_vicinity_7d": _WindowScan(VICINITY_REGEX, VICINITY_BEFORE, VICINITY_AFTER, _vicinity_money),
+            "label_global:0": _WindowScan(LABEL_REGEXES[0], 0, None, _label_money),
+            "label_global:1": _WindowScan(LABEL_REGEXES[1], 0, None, _label_money),
+        }
+        self._parser = etree.HTMLParser(target=self)
+
+    @property
+    def done(self) -> bool:
+        return self.winner is not None
+
+    def _settled(self, name: str) -> bool:
+        # Whether a strategy without a candidate can no longer produce one
+        if self._eof:
+            return True
+        if name == "next_data_fast":
+            return self._next_data_seen
+        if name == "analysis_card_keywords":
+            return self._card_done
+        if name == "label_global":
+            return self._scans["label_global:0"].stopped and self._scans["label_global:1"].stopped
+        return False
+
+    def _offer(self, name: str, found: Tuple[str, str]) -> None:
+        # Keep a strategy's first candidate, then see whether the winner is decided
+        if name not in self.candidates:
+            self.candidates[name] = found
+            self._decide()
+
+    def _decide(self) -> None:
+        for name in self.order:
+            if name in self.candidates:
+                self.winner = name
+                return
+            if not self._settled(name):
+                return
+
+    # --- driving -------------------------------------------------------------
+
+    def feed(self, text: str) -> None:
+        text = self._carry + text
+        cut = text.rfind("<")
+        if cut != -1 and len(text) - cut < TAG_HOLDBACK:
+            self._carry, text = text[cut:], text[:cut]
+        else:
+            self._carry = ""
+        if text:
+            self._feed_parser(text)
+        if not self.done:
+            # The raw-text fallbacks see the page as it streams past
+            for scan in self._scans.values():
+                scan.feed(text)
+            self._collect_scans()
+
+    def _collect_scans(self) -> None:
+        # A scan's first result is final, except the standalone-PnL labels, which
+        # label_global only reads once no Realized Profit/PnL label can decide
+        realized, pnl = self._scans["label_global:0"], self._scans["label_global:1"]
+        if self._scans["raw_text_vicinity_7d"].result is not None:
+            self._offer("raw_text_vicinity_7d", self._scans["raw_text_vicinity_7d"].result)
+        if realized.result is not None:
+            self._offer("label_global", realized.result)
+        elif (realized.stopped or self._eof) and pnl.result is not None:
+            self._offer("label_global", pnl.result)
+
+    def _feed_parser(self, text: str) -> None:
+        end_tag = text.rfind("</")
+        close = text.find(">", end_tag) if end_tag != -1 else -1
+        if self._fed + len(text) < RESTART_CHARS or close == -1:
+            self._parser.feed(text)
+            self._note_fed(text)
+            return
+        head, tail = text[: close + 1], text[close + 1 :]
+        self._parser.feed(head)
+        self._note_fed(head)
+        # Everything fed so far has produced its events once an end tag is parsed,
+        # unless that end tag sat inside a script, style or comment
+        if not self.done and self._script is None and not self._skip_depth and not self._in_comment:
+            self._restart_parser()
+        if tail:
+            self._parser.feed(tail)
+            self._note_fed(tail)
+
+    def _note_fed(self, text: str) -> None:
+        self._fed += len(text)
+        opened, closed = text.rfind("<!--"), text.rfind("-->")
+        if opened != closed:
+            self._in_comment = opened > closed
+
+    def _restart_parser(self) -> None:
+        # Closing frees libxml2's buffers now rather than whenever the parser/target cycle is collected;
+        # the end events it generates for still-open elements are ignored
+        self._detached = True
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        self._detached = False
+        self._parser = etree.HTMLParser(target=self)
+        # The replayed tags' start events were already handled by the old parser
+        self._suppress = len(self._stack)
+        self._parser.feed("".join(f"<{el.tag}>" for el in self._stack))
+        self._fed = 0
+        self.restarts += 1
+
+    def finish(self, complete: bool = True) -> Tuple[Optional[float], Dict[str, Any]]:
+        """Flush the parser (when the whole page was read) and pick the result"""
+        if complete and not self.done:
+            if self._carry:
+                self._parser.feed(self._carry)
+            for scan in self._scans.values():
+                scan.feed(self._carry, final=True)
+            self._carry = ""
+            try:
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                # Empty or non-HTML input
+                pass
+        if not self.done:
+            self._eof = True
+            self._collect_scans()
+            if self._json_hits:
+                self._offer("embedded_json_7d", (self._json_hits[min(self._json_hits)], "__NEXT_DATA__ or inline JSON"))
+            self._decide()
+
+        info: Dict[str, Any] = {"strategy": None, "context": None}
+        money_txt = None
+        if self.winner is not None:
+            info["strategy"] = self.winner
+            money_txt, info["context"] = self.candidates[self.winner]
+        # __NEXT_DATA__ fields take precedence over on-page labels, as in extract_metrics
+        metrics = dict(self.metrics)
+        for metric in metrics:
+            best = best_field(self.fields, metric)
+            if best:
+                metrics[metric] = best[1]
+        info["metrics"] = metrics
+        if self.fields:
+            info["fields"] = dict(self.fields)
+        info["raw_money"] = money_txt
+        return (normalize_money_to_float(money_txt) if money_txt else None), info
+
+    # --- text ----------------------------------------------------------------
+
+    def _text_since(self, first_piece: int) -> str:
+        # get_text(strip=True) of an open element, as far as it has been read
+        return "".join(t for i, t in self._pieces if i >= first_piece)
+
+    def _flush_text(self) -> None:
+        if not self._pending:
+            return
+        text = "".join(self._pending).strip()
+        self._pending = []
+        if not text:
+            return
+        self._pieces.append((self._piece_count, text))
+        self._piece_count += 1
+        if text == "Analysis" and self._card is None and not self._card_done:
+            # Nearest card-looking ancestor within five levels, like _find_analysis_card
+            for el in reversed(self._stack[-5:]):
+                if el.card:
+                    self._card = el
+                    break
+        self._metric_text(text)
+
+    def _metric_text(self, text: str) -> None:
+        # Same label-then-value rule as extract_metrics, one text node at a time
+        for metric in list(self._metric_wait):
+            value = _metric_value(metric, text)
+            if value is not None:
+                self.metrics[metric] = value
+                del self._metric_wait[metric]
+            else:
+                self._metric_wait[metric] -= 1
+                if not self._metric_wait[metric]:
+                    del self._metric_wait[metric]
+        for metric, label in METRIC_LABELS.items():
+            if self.metrics[metric] is not None or metric in self._metric_wait:
+                continue
+            m = label.search(text)
+            if m:
+                value = _metric_value(metric, text[m.end():])
+                if value is not None:
+                    self.metrics[metric] = value
+                else:
+                    self._metric_wait[metric] = 3
+
+    # --- lxml parser target ----------------------------------------------------
+
+    def start(self, tag: str, attrib) -> None:
+        if self._suppress:
+            self._suppress -= 1
+            return
+        if self.done or self._detached:
+            return
+        self._flush_text()
+        tag = tag.lower()
+        if tag == "script":
+            self._script = {"id": attrib.get("id"), "type": attrib.get("type"), "parts": [], "size": 0}
+        elif tag in ("style", "template"):
+            self._skip_depth += 1
+        kinds: Tuple[str, ...] = ()
+        card = False
+        if tag == "div":
+            if TARGETED_DIV_CLASS.search(attrib.get("class", "")):
+                kinds += ("targeted_css_selector",)
+            if RED_DIV_STYLE.search(attrib.get("style", "")):
+                kinds += ("red_color_style_selector",)
+        classes = attrib.get("class")
+        if classes:
+            card = any(c.startswith(CARD_CLASS_PREFIXES) for c in classes.split())
+        self._stack.append(_Open(tag, self._piece_count, kinds, card))
+
+    def data(self, data: str) -> None:
+        if self.done or self._detached:
+            return
+        if self._script is not None:
+            if self._script["size"] <= SCRIPT_LIMIT:
+                self._script["parts"].append(data)
+                self._script["size"] += len(data)
+        elif not self._skip_depth:
+            self._pending.append(data)
+
+    def end(self, tag: str) -> None:
+        if self.done or self._detached:
+            return
+        self._flush_text()
+        tag = tag.lower()
+        if not any(el.tag == tag for el in self._stack):
+            return
+        while self._stack:
+            el = self._stack.pop()
+            self._closed(el)
+            if el.tag == tag or self.done:
+                break
+
+    def comment(self, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._detached:
+            return
+        self._flush_text()
+        while self._stack and not self.done:
+            self._closed(self._stack.pop())
+
+    # --- strategies ------------------------------------------------------------
+
+    def _closed(self, el: _Open) -> None:
+        if el.tag == "script":
+            self._script_closed()
+        elif el.tag in ("style", "template"):
+            self._skip_depth = max(0, self._skip_depth - 1)
+        if el.kinds:
+            self._value_div_closed(el)
+        if el is self._card:
+            money = _money_near_keywords([t for i, t in self._pieces if i >= el.first_piece])
+            self._card = None
+            self._card_done = True
+            if money:
+                self._offer("analysis_card_keywords", (money, "Analysis card"))
+            else:
+                self._decide()
+
+    def _parent_context(self) -> str:
+        # _context_of_parents over the text read so far: nearest ancestor mentioning 7D/Realized/PnL/Profit
+        text = ""
+        for parent in reversed(self._stack):
+            text = self._text_since(parent.first_piece)
+            if CONTEXT_REGEX.search(text):
+                return text
+        return text
+
+    def _value_div_closed(self, el: _Open) -> None:
+        text = self._text_since(el.first_piece)
+        money = MONEY_REGEX.search(text)
+        if not money:
+            return
+        parent_context = self._parent_context()
+        matched = bool(CONTEXT_REGEX.search(parent_context))
+        if "targeted_css_selector" in el.kinds and (matched or CONTEXT_REGEX.search(text)):
+            self._offer("targeted_css_selector", (money.group(0), f"Div: {text}, Parent: {parent_context[:100] if matched else ''}"))
+        if "red_color_style_selector" in el.kinds and matched:
+            self._offer("red_color_style_selector", (money.group(0), f"Red div: {text}, Context: {parent_context[:100]}"))
+
+    def _script_closed(self) -> None:
+        script, self._script = self._script, None
+        if script is None or script["size"] > SCRIPT_LIMIT:
+            return
+        text = "".join(script["parts"])
+        if not text:
+            return
+        if script["id"] == NEXT_DATA_MARKER and not self._next_data_seen:
+            self._next_data_seen = True
+            try:
+                data = json.loads(text)
+            except ValueError:
+                data = None
+            if data is not None:
+                fields: Dict[str, float] = {}
+                _realized_pnl_fields(data, fields)
+                self.fields.update(fields)
+                best = best_field(fields, "pnl_7d")
+                if best:
+                    self._offer("next_data_fast", (format_money(best[1]), f"__NEXT_DATA__ field {best[0]}"))
+                else:
+                    self._decide()
+            else:
+                self._decide()
+            if self.done:
+                return
+            category = 0
+        elif script["type"] == "application/json":
+            category = 1
+        elif any(k in text.lower() for k in ("7d", "realiz", "pnl")):
+            category = 2
+        else:
+            return
+        # _extract_money_from_embedded_json tries __NEXT_DATA__, then JSON scripts, then inline JS
+        if category not in self._json_hits:
+            money = _money_from_json_text(text)
+            if money:
+                self._json_hits[category] = money
+                if category == 0:
+                    self._offer("embedded_json_7d", (money, "__NEXT_DATA__ or inline JSON"))
+
+
+def extract_stream(html_path: Path, debug: bool = False, chunk_size: int = CHUNK_SIZE, strategies: Optional[List[str]] = None) -> Tuple[Optional[float], Dict[str, Any]]:
+    """
+    Extract one saved page by streaming it, stopping once the winning strategy is decided.
+
+    Returns:
+        (value, info) like gmgn_scrape.extract_7d_realized_pnl_from_html; info["engine"]
+        reports bytes read vs the file size and whether reading stopped early
+    """
+    start = time.perf_counter()
+    page = StreamingPage(strategies)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    bytes_read = chunks = 0
+    with html_path.open("rb") as f:
+        while not page.done:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            bytes_read += len(chunk)
+            chunks += 1
+            page.feed(decoder.decode(chunk))
+        complete = not page.done
+        if complete:
+            page.feed(decoder.decode(b"", final=True))
+    value, info = page.finish(complete)
+    total = html_path.stat().st_size
+    info["engine"] = {
+        "mode": "stream",
+        "bytes_read": bytes_read,
+        "bytes_total": total,
+        "early_exit": bytes_read < total,
+        "chunks": chunks,
+        "parser_restarts": page.restarts,
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+    if not debug:
+        info.pop("raw_money", None)
+    return value, info
+
+
+def extract_html_file_stream(html_path: Path, wallet_label: Optional[str] = None, debug: bool = False, chunk_size: int = CHUNK_SIZE, strategies: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Streaming counterpart of gmgn_scrape.extract_html_file"""
+    value, info = extract_stream(html_path, debug=debug, chunk_size=chunk_size, strategies=strategies)
+    return build_result(wallet_label or wallet_label_from_path(html_path), value, info, file=str(html_path), debug=debug)
+
+
+def _peak_rss_kb() -> int:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _measure(mode: str, path: str, chunk_size: int) -> Dict[str, Any]:
+    # Runs in a fresh interpreter so the peak RSS belongs to this one page and path
+    html_path = Path(path)
+    start = time.perf_counter()
+    if mode == "baseline":
+        result: Dict[str, Any] = {}
+        bytes_read = 0
+    elif mode == "stream":
+        result = extract_html_file_stream(html_path, chunk_size=chunk_size, debug=True)
+        bytes_read = result["engine"]["bytes_read"]
+    else:
+        result = extract_html_file(html_path, debug=True)
+        bytes_read = html_path.stat().st_size
+    return {
+        "value": result.get("pnl_7d"),
+        "strategy": result.get("strategy"),
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+        "bytes_read": bytes_read,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def _measure_in_child(mode: str, path: str, chunk_size: int) -> Dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--measure", mode, "--chunk-kb", str(chunk_size // 1024), path],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout)
+
+
+def compare_paths(paths: List[Path], chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """Peak RSS, bytes read and time per page for the current (full) path vs streaming, each in its own process"""
+    baseline = _measure_in_child("baseline", str(paths[0]), chunk_size)["peak_rss_kb"] if paths else 0
+    rows = []
+    for p in paths:
+        full = _measure_in_child("full", str(p), chunk_size)
+        stream = _measure_in_child("stream", str(p), chunk_size)
+        for m in (full, stream):
+            m["rss_over_baseline_kb"] = m["peak_rss_kb"] - baseline
+        rows.append({"file": str(p), "bytes": p.stat().st_size, "full": full, "stream": stream, "same_value": full["value"] == stream["value"]})
+    return {"baseline_rss_kb": baseline, "chunk_size": chunk_size, "pages": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract 7D Realized PnL from saved pages by streaming them, stopping as soon as the result is decided")
+    parser.add_argument("pages", nargs="+", help="Saved wallet HTML files")
+    parser.add_argument("--chunk-kb", type=int, default=CHUNK_SIZE // 1024, help=f"Read size in KB (default: {CHUNK_SIZE // 1024})")
+    parser.add_argument("--compare", action="store_true", help="Report peak RSS, bytes read and time against the current full-parse path, one process per page")
+    parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--measure", choices=["baseline", "full", "stream"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    chunk_size = args.chunk_kb * 1024
+
+    if args.measure:
+        print(json.dumps(_measure(args.measure, args.pages[0], chunk_size)))
+        return
+
+    paths = [Path(p) for p in args.pages]
+    if args.compare:
+        report = compare_paths(paths, chunk_size)
+        for row in report["pages"]:
+            print(json.dumps(row))
+        full_rss = max(r["full"]["rss_over_baseline_kb"] for r in report["pages"])
+        stream_rss = max(r["stream"]["rss_over_baseline_kb"] for r in report["pages"])
+        summary = {
+            "pages": len(paths),
+            "baseline_rss_kb": report["baseline_rss_kb"],
+            "max_rss_over_baseline_kb": {"full": full_rss, "stream": stream_rss},
+            "bytes_read": {"full": sum(r["full"]["bytes_read"] for r in report["pages"]), "stream": sum(r["stream"]["bytes_read"] for r in report["pages"])},
+            "same_value": sum(r["same_value"] for r in report["pages"]),
+        }
+        print(json.dumps({"compare": summary}), file=sys.stderr)
+        return
+
+    for p in paths:
+        print(json.dumps(extract_html_file_stream(p, debug=args.debug, chunk_size=chunk_size), ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for gmgn.ai that serves saved wallet pages.
+GET /<chain>/address/<wallet> returns <pages>/<wallet>.html (or .htm) when it
+exists, otherwise the default page. Speaks HTTP/1.1 keep-alive and counts
+connections vs requests, so fetchers can be tested end-to-end without the site.
+Optionally enforces a request rate (429 + Retry-After beyond it), injects 503s
+and answers requests without a given cookie with a 403 challenge page.
+With --api DIR it also replays API responses recorded by --capture-api
+(DIR/<wallet>.jsonl): each recorded URL path answers with its JSON body, and
+those wallets get a client-rendered page that fetches them, like the real site.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from fetch_scheduler import TokenBucket
+
+
+WALLET_PATH = re.compile(r"^/([a-z0-9]+)/address/([^/?#]+)")
+
+# What a Cloudflare interstitial looks like to a client without clearance
+CHALLENGE_PAGE = b"<html><head><title>Just a moment...</title></head><body>Checking your browser before accessing gmgn.ai.</body></html>"
+
+# Wallet page for --api recordings: the figures only exist after its fetch() calls return
+APP_SHELL = """<!DOCTYPE html>
+<html><head><title>%(wallet)s - GMGN.AI</title></head>
+<body><div id="app">Loading...</div>
+<script>
+var app = document.getElementById('app');
+Promise.all(%(paths)s.map(function (path) {
+    return fetch(path, {credentials: 'include'}).then(function (r) { return r.text(); });
+})).then(function (bodies) {
+    app.textContent = '';
+    bodies.forEach(function (body) {
+        var pre = document.createElement('pre');
+        pre.textContent = body;
+        app.appendChild(pre);
+    });
+});
+</script></body></html>
+"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.count("connections")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8", headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self.server.count("requests")
+        if self.path == "/__stats__":
+            self._send(200, json.dumps(self.server.stats()).encode(), "application/json")
+            return
+        limiter = self.server.limiter
+        if limiter is not None and not limiter.try_acquire():
+            self.server.count("throttled")
+            self._send(429, b"<html><head><title>429 Too Many Requests</title></head></html>", headers={"Retry-After": "1"})
+            return
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            self.server.count("server_errors")
+            self._send(503, b"<html><head><title>503 Service Unavailable</title></head></html>")
+            return
+        if self.server.require_cookie and self.server.require_cookie not in (self.headers.get("Cookie") or "").replace(" ", "").split(";"):
+            self.server.count("challenged")
+            self._send(403, CHALLENGE_PAGE)
+            return
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        self.server.count("served")
+        recorded = self.server.api_response(self.path)
+        if recorded is not None:
+            self.server.count("api_served")
+            self._send(recorded[0], recorded[1], "application/json")
+            return
+        m = WALLET_PATH.match(self.path)
+        page = self.server.page_for(m.group(2)) if m else None
+        if page is None:
+            self._send(404, b"not found", "text/plain")
+            return
+        self._send(200, page)
+
+    do_HEAD = do_GET
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Args:
+        address: (host, port); port 0 picks a free port
+        pages: Directory of <wallet>.html files, or a single page served for every wallet (optional with api)
+        delay: Seconds added to every page response to simulate network latency
+        rate_limit: Requests per second allowed before answering 429 (0 = unlimited)
+        error_rate: Fraction of requests answered with 503
+        require_cookie: "name=value" a request must carry, else it gets a 403 challenge page
+        api: Directory of <wallet>.jsonl API recordings (--capture-api --capture-dir) to replay
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, pages: Optional[str], delay: float = 0.0, verbose: bool = False, rate_limit: float = 0.0, error_rate: float = 0.0, require_cookie: Optional[str] = None, api: Optional[str] = None):
+        super().__init__(address, StubHandler)
+        self.delay = delay
+        self.verbose = verbose
+        # One second's worth of burst, like a typical per-IP limiter
+        self.limiter = TokenBucket(rate_limit, burst=rate_limit) if rate_limit else None
+        self.error_rate = error_rate
+        self.require_cookie = require_cookie
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {"connections": 0, "requests": 0, "served": 0, "throttled": 0, "server_errors": 0, "challenged": 0, "api_served": 0}
+        self._started = time.monotonic()
+        self._pages: Dict[str, bytes] = {}
+        self._default: Optional[bytes] = None
+        self._api: Dict[str, Tuple[int, bytes]] = {}
+        if pages:
+            root = Path(pages)
+            if root.is_dir():
+                for p in root.iterdir():
+                    if p.suffix.lower() in (".htm", ".html"):
+                        self._pages[p.stem] = p.read_bytes()
+            else:
+                self._default = root.read_bytes()
+        if api:
+            for p in sorted(Path(api).glob("*.jsonl")):
+                self._pages[p.stem] = self._load_recording(p)
+
+    def _load_recording(self, path: Path) -> bytes:
+        """Register a wallet's recorded responses by URL path; returns its app-shell page"""
+        paths: List[str] = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            response = json.loads(line)
+            if response.get("body") is None:
+                continue
+            parts = urlsplit(response.get("url") or "")
+            local = parts.path + ("?" + parts.query if parts.query else "")
+            self._api[local] = (response.get("status") or 200, response["body"].encode("utf-8"))
+            paths.append(local)
+        return (APP_SHELL % {"wallet": escape(path.stem), "paths": json.dumps(paths).replace("</", "<\\/")}).encode("utf-8")
+
+    def api_response(self, path: str) -> Optional[Tuple[int, bytes]]:
+        """Recorded (status, body) for a request path; the query string is matched when it was recorded"""
+        return self._api.get(path) or self._api.get(path.split("?", 1)[0])
+
+    def page_for(self, wallet: str) -> Optional[bytes]:
+        return self._pages.get(wallet, self._default)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, Any] = dict(self._counts)
+        counts["uptime_seconds"] = round(time.monotonic() - self._started, 3)
+        return counts
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(pages: Optional[str], host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, rate_limit: float = 0.0, error_rate: float = 0.0, require_cookie: Optional[str] = None, api: Optional[str] = None) -> StubServer:
+    """Start a stub server on a background thread; call .shutdown() when done"""
+    server = StubServer((host, port), pages, delay=delay, rate_limit=rate_limit, error_rate=error_rate, require_cookie=require_cookie, api=api)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve saved wallet pages as a local gmgn.ai stand-in")
+    parser.add_argument("pages", nargs="?", help="Directory of <wallet>.html pages, or one page served for every wallet")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds of simulated latency per page (default: 0)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second allowed before answering 429 (default: unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503 (default: 0)")
+    parser.add_argument("--require-cookie", metavar="NAME=VALUE", help="Answer requests without this cookie with a 403 challenge page (default: off)")
+    parser.add_argument("--api", metavar="DIR", help="Replay recorded API responses (<wallet>.jsonl from --capture-dir) behind client-rendered wallet pages")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    if not args.pages and not args.api:
+        parser.error("give a pages directory/file, --api DIR, or both")
+
+    server = StubServer((args.host, args.port), args.pages, delay=args.delay, verbose=args.verbose, rate_limit=args.rate_limit, error_rate=args.error_rate, require_cookie=args.require_cookie, api=args.api)
+    print(f"Serving {args.pages or args.api} at {server.base_url} (stats at /__stats__)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Long-running watch mode for a fixed wallet list.
+Each wallet is refreshed on its own schedule. A fetched page is fingerprinted
+on the parts that can carry the PnL (markup, visible text and embedded JSON,
+without scripts, styles, nonces or build ids); when the fingerprint matches the
+last poll, extraction and storage are skipped. Only wallets whose PnL figures
+moved are emitted and stored. Reports show how many polls were short-circuited
+and the CPU that saved.
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+
+# Page regions that change between polls without the PnL changing: script code (but not
+# __NEXT_DATA__ / JSON data scripts), styles, comments, CSP nonces, CSRF tokens and the Next.js build id
+VOLATILE_REGEX = re.compile(
+    rb"<script\b(?![^>]*(?:__NEXT_DATA__|application/(?:ld\+)?json))[^>]*>.*?</script\s*>"
+    rb"|<style\b[^>]*>.*?</style\s*>"
+    rb"|<!--.*?-->"
+    rb"|\s(?:nonce|data-csrf|csrf-token)=\"[^\"]*\""
+    rb"|\"buildId\":\"[^\"]*\"",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Fields compared to decide whether a wallet's figures moved
+WATCHED_FIELDS = ("pnl_7d", "pnl_30d", "winrate", "unrealized_pnl", "total_pnl")
+
+ExtractionResult = Tuple[Optional[float], Dict[str, Any]]
+
+
+def page_fingerprint(html: Union[str, bytes]) -> str:
+    """SHA-256 of a page with its volatile regions left out"""
+    raw = html.encode("utf-8") if isinstance(html, str) else html
+    view = memoryview(raw)
+    h = hashlib.sha256()
+    pos = 0
+    for m in VOLATILE_REGEX.finditer(raw):
+        h.update(view[pos : m.start()])
+        pos = m.end()
+    h.update(view[pos:])
+    return h.hexdigest()
+
+
+class ChangeDetector:
+    """
+    Remembers each wallet's last page fingerprint and extraction.
+
+    Pass one as ``change_detector`` to gmgn_scrape's fetch functions: a page
+    whose fingerprint matches the previous poll reuses that poll's extraction
+    (marked ``info["unchanged"] = True``) instead of parsing the page again.
+    CPU is measured per thread, so the figures hold with concurrent fetches.
+    """
+
+    def __init__(self):
+        self._last: Dict[Tuple[str, str], Tuple[str, ExtractionResult, float]] = {}
+        self._lock = threading.Lock()
+        self.counts = {"polls": 0, "unchanged": 0, "extracted": 0}
+        self.cpu = {"fingerprint": 0.0, "extract": 0.0}
+        # Extraction CPU the unchanged polls would have spent, from each wallet's last extraction
+        self.extract_cpu_avoided = 0.0
+
+    def extract(self, wallet_address: str, chain: str, html: Union[str, bytes], extract: Callable[[], ExtractionResult]) -> ExtractionResult:
+        key = (chain, wallet_address)
+        started = time.thread_time()
+        digest = page_fingerprint(html)
+        fingerprint_cpu = time.thread_time() - started
+        with self._lock:
+            last = self._last.get(key)
+        if last is not None and last[0] == digest:
+            value, info = last[1]
+            with self._lock:
+                self.counts["polls"] += 1
+                self.counts["unchanged"] += 1
+                self.cpu["fingerprint"] += fingerprint_cpu
+                self.extract_cpu_avoided += last[2]
+            return value, {**info, "unchanged": True, "page_fingerprint": digest}
+        started = time.thread_time()
+        value, info = extract()
+        extract_cpu = time.thread_time() - started
+        with self._lock:
+            self._last[key] = (digest, (value, info), extract_cpu)
+            self.counts["polls"] += 1
+            self.counts["extracted"] += 1
+            self.cpu["fingerprint"] += fingerprint_cpu
+            self.cpu["extract"] += extract_cpu
+        return value, {**info, "page_fingerprint": digest}
+
+    def forget(self, wallet_address: str, chain: str) -> None:
+        """Drop a wallet's fingerprint so its next poll is extracted again"""
+        with self._lock:
+            self._last.pop((chain, wallet_address), None)
+
+
+class Watcher:
+    """
+    Polls a wallet list forever (or for ``rounds`` passes), emitting changes only.
+
+    Args:
+        addresses: Wallet addresses to watch
+        fetch: fetch(address, change_detector) -> (value, info), e.g. a bound fetch_live_wallet_pnl_simple
+        interval: Seconds between refreshes of the same wallet
+        chain: Blockchain chain (sol, eth, etc.)
+        concurrency: Wallets fetched at once
+        store: Record changed results in profit.jsonl / pnl_history.db; export_excel() refreshes profit.xlsx
+        state_file: JSON file of the last emitted figures, so a restart does not re-emit everything
+        debug: Include debug fields in emitted records
+    """
+
+    def __init__(self, addresses: List[str], fetch: Callable[[str, ChangeDetector], ExtractionResult], interval: float = 60.0, chain: str = "sol", concurrency: int = 4, store: bool = True, state_file: Optional[str] = None, debug: bool = False):
+        self.addresses = addresses
+        self.fetch = fetch
+        self.interval = interval
+        self.chain = chain
+        self.concurrency = concurrency
+        self.store = store
+        self.state_file = state_file
+        self.debug = debug
+        self.detector = ChangeDetector()
+        self.emitted: Dict[str, Dict[str, Any]] = self._load_state()
+        self.counts = {"rounds": 0, "errors": 0, "value_changes": 0, "stored": 0}
+        self.store_cpu = 0.0
+        self._unexported = False
+        self._started = time.monotonic()
+        self._stop = threading.Event()
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self) -> None:
+        if not self.state_file:
+            return
+        tmp = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.emitted, f)
+        os.replace(tmp, self.state_file)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _schedule(self) -> List[Tuple[float, int, str]]:
+        # Spread the first polls over one interval so refreshes do not all land at once
+        now = time.monotonic()
+        step = self.interval / max(1, len(self.addresses))
+        due = [(now + i * step, i, address) for i, address in enumerate(self.addresses)]
+        heapq.heapify(due)
+        return due
+
+    def _changed(self, address: str, result: Dict[str, Any]) -> bool:
+        figures = {field: result.get(field) for field in WATCHED_FIELDS}
+        if self.emitted.get(address) == figures:
+            return False
+        self.emitted[address] = figures
+        return True
+
+    def run(self, rounds: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a result record for every wallet whose figures changed.
+
+        ``rounds`` bounds the run to that many polls per wallet; by default it
+        runs until stop() is called.
+        """
+        from gmgn_scrape import build_result, wallet_label_from_address
+
+        due = self._schedule()
+        polls: Dict[str, int] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="gmgn-watch") as executor:
+            while due and not self._stop.is_set():
+                wait = due[0][0] - time.monotonic()
+                if wait > 0:
+                    self._stop.wait(wait)
+                    continue
+                batch = []
+                while due and due[0][0] <= time.monotonic() and len(batch) < self.concurrency:
+                    batch.append(heapq.heappop(due))
+                fetched = executor.map(lambda item: self.fetch(item[2], self.detector), batch)
+                changed: List[Dict[str, Any]] = []
+                for (at, order, address), (value, info) in zip(batch, fetched):
+                    polls[address] = polls.get(address, 0) + 1
+                    if rounds is None or polls[address] < rounds:
+                        heapq.heappush(due, (max(at + self.interval, time.monotonic()), order, address))
+                    if "error" in info:
+                        self.counts["errors"] += 1
+                        # A failed fetch says nothing about the page; extract the next good one afresh
+                        self.detector.forget(address, self.chain)
+                        print(json.dumps({"wallet": address, "error": info["error"]}), file=sys.stderr)
+                        continue
+                    if info.get("unchanged"):
+                        continue
+                    result = build_result(wallet_label_from_address(address), value, info, url=info.get("url"), debug=self.debug)
+                    if self._changed(address, result):
+                        changed.append(result)
+                if changed:
+                    self.counts["value_changes"] += len(changed)
+                    self._record(changed)
+                    for result in changed:
+                        yield result
+                if len(polls) == len(self.addresses):
+                    self.counts["rounds"] = min(polls.values())
+
+    def _record(self, changed: List[Dict[str, Any]]) -> None:
+        self._save_state()
+        if not self.store:
+            return
+        from pnl_history import record_results
+        from results_store import append_result, utc_timestamp
+
+        # Appends only; rewriting profit.xlsx would reread the whole store on every batch
+        started = time.thread_time()
+        for result in changed:
+            result["captured_at"] = utc_timestamp()
+            append_result(result)
+        record_results(changed)
+        self.store_cpu += time.thread_time() - started
+        self.counts["stored"] += len(changed)
+        self._unexported = True
+
+    def export_excel(self) -> None:
+        """Rebuild profit.xlsx from the store once, if changes were recorded since the last export"""
+        if not self._unexported:
+            return
+        from results_store import export_excel
+
+        export_excel()
+        self._unexported = False
+
+    def stats(self) -> Dict[str, Any]:
+        d = self.detector
+        polls = d.counts["polls"]
+        unchanged = d.counts["unchanged"]
+        # Without watch mode every poll is extracted and stored; estimate what the skipped ones would have cost
+        store_per_result = self.store_cpu / self.counts["stored"] if self.counts["stored"] else 0.0
+        avoided = d.extract_cpu_avoided + store_per_result * (polls - self.counts["stored"])
+        spent = d.cpu["fingerprint"] + d.cpu["extract"] + self.store_cpu
+        return {
+            "wallets": len(self.addresses),
+            "interval": self.interval,
+            "uptime_seconds": round(time.monotonic() - self._started, 3),
+            **self.counts,
+            "polls": polls,
+            "short_circuited": unchanged,
+            "short_circuit_fraction": round(unchanged / polls, 3) if polls else None,
+            "cpu_seconds": {name: round(v, 4) for name, v in (("fingerprint", d.cpu["fingerprint"]), ("extract", d.cpu["extract"]), ("store", self.store_cpu))},
+            "cpu_saved_seconds": round(avoided - d.cpu["fingerprint"], 4),
+            "cpu_saved_fraction": round((avoided - d.cpu["fingerprint"]) / (avoided + spent - d.cpu["fingerprint"]), 3) if avoided + spent else None,
+        }
+
+
+def http_fetcher(chain: str = "sol", concurrency: int = 4, base_url: Optional[str] = None, timeout: float = 30, debug: bool = False, page_cache=None, scheduler=None) -> Callable[[str, ChangeDetector], ExtractionResult]:
+    """fetch() for Watcher over one pooled keep-alive requests session"""
+    from async_fetch import make_session
+    from gmgn_scrape import GMGN_BASE_URL, fetch_live_wallet_pnl_simple
+
+    session = make_session(concurrency)
+
+    def fetch(address: str, detector: ChangeDetector) -> ExtractionResult:
+        return fetch_live_wallet_pnl_simple(
+            address, chain=chain, debug=debug, page_cache=page_cache, session=session,
+            base_url=base_url or GMGN_BASE_URL, timeout=timeout, scheduler=scheduler, change_detector=detector,
+        )
+
+    return fetch
+
+
+def browser_fetcher(pool, chain: str = "sol", debug: bool = False, ready_timeout: float = 5.0, page_cache=None, scheduler=None, base_url: Optional[str] = None) -> Callable[[str, ChangeDetector], ExtractionResult]:
+    """fetch() for Watcher over a driver_pool.DriverPool of warm browser sessions"""
+    from gmgn_scrape import fetch_live_wallet_pnl
+
+    def fetch(address: str, detector: ChangeDetector) -> ExtractionResult:
+        return fetch_live_wallet_pnl(
+            address, chain=chain, debug=debug, pool=pool, ready_timeout=ready_timeout,
+            page_cache=page_cache, scheduler=scheduler, change_detector=detector, base_url=base_url,
+        )
+
+    return fetch
+
+
+def hybrid_fetcher(hybrid, chain: str = "sol") -> Callable[[str, ChangeDetector], ExtractionResult]:
+    """fetch() for Watcher over a hybrid_fetch.HybridFetcher: HTTP with browser cookies, browser fallback"""
+
+    def fetch(address: str, detector: ChangeDetector) -> ExtractionResult:
+        return hybrid.fetch(address, chain=chain, change_detector=detector)
+
+    return fetch
+
+
+def run_watch(watcher: Watcher, rounds: Optional[int] = None, report_every: float = 0) -> Dict[str, Any]:
+    """Print changed results as JSON lines until interrupted; stats go to stderr periodically and at the end.
+    profit.xlsx is exported once, on the way out."""
+    previous = signal.signal(signal.SIGINT, lambda *_: watcher.stop())
+    last_report = time.monotonic()
+    try:
+        for result in watcher.run(rounds=rounds):
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+            if report_every and time.monotonic() - last_report >= report_every:
+                print(json.dumps({"watch": watcher.stats()}), file=sys.stderr)
+                last_report = time.monotonic()
+    finally:
+        signal.signal(signal.SIGINT, previous)
+        watcher.export_excel()
+    stats = watcher.stats()
+    print(json.dumps({"watch": stats}), file=sys.stderr)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Watch a wallet list and emit PnL changes only")
+    parser.add_argument("wallet_list", help="File with one wallet address per line")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between refreshes of each wallet (default: 60)")
+    parser.add_argument("--rounds", type=int, help="Stop after this many polls per wallet (default: run until Ctrl-C)")
+    parser.add_argument("--chain", default="sol", help="Blockchain chain (default: sol)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Wallets fetched at once (default: 4)")
+    parser.add_argument("--selenium", action="store_true", help="Fetch through a pool of warm browser sessions instead of plain HTTP")
+    parser.add_argument("--browser", choices=["firefox", "chrome"], default="firefox")
+    parser.add_argument("--hybrid", action="store_true", help="Fetch over HTTP with the cookies of a browser session (or --cookies), falling back to the browser when a page has no value")
+    parser.add_argument("--cookies", help="Cookies file for --selenium / --hybrid sessions")
+    parser.add_argument("--base-url", help="Site root for every fetch mode (e.g. http://127.0.0.1:8765 for stub_server.py)")
+    parser.add_argument("--no-block-resources", action="store_true", help="With --selenium, let the browser load images, web fonts, media and analytics (blocked by default; see resource_blocking.py)")
+    parser.add_argument("--rate", type=float, help="Max requests per second to the host (default: unlimited)")
+    parser.add_argument("--state", help="JSON file remembering the last emitted figures across restarts")
+    parser.add_argument("--report-every", type=float, default=0, help="Also print stats to stderr this often, in seconds (default: only at exit)")
+    parser.add_argument("--no-excel", action="store_true", help="Do not record changes in profit.jsonl / profit.xlsx (profit.xlsx is otherwise exported at exit)")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.wallet_list, "r", encoding="utf-8") as f:
+        addresses = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    scheduler = None
+    if args.rate:
+        from fetch_scheduler import FetchScheduler
+        scheduler = FetchScheduler(rate=args.rate, concurrency=args.concurrency)
+
+    def watch(fetch: Callable[[str, ChangeDetector], ExtractionResult]) -> None:
+        watcher = Watcher(addresses, fetch, interval=args.interval, chain=args.chain, concurrency=args.concurrency, store=not args.no_excel, state_file=args.state, debug=args.debug)
+        run_watch(watcher, rounds=args.rounds, report_every=args.report_every)
+
+    if args.hybrid:
+        from gmgn_scrape import GMGN_BASE_URL
+        from hybrid_fetch import HybridFetcher
+        with HybridFetcher(cookies_file=args.cookies, chain=args.chain, base_url=args.base_url or GMGN_BASE_URL, concurrency=args.concurrency, browser=args.browser, scheduler=scheduler, debug=args.debug) as hybrid:
+            watch(hybrid_fetcher(hybrid, chain=args.chain))
+    elif args.selenium:
+        from driver_pool import gmgn_driver_pool
+        with gmgn_driver_pool(size=args.concurrency, browser=args.browser, cookies_file=args.cookies, debug=args.debug, scheduler=scheduler, base_url=args.base_url, block_resources=not args.no_block_resources) as pool:
+            watch(browser_fetcher(pool, chain=args.chain, debug=args.debug, scheduler=scheduler, base_url=args.base_url))
+    else:
+        watch(http_fetcher(chain=args.chain, concurrency=args.concurrency, base_url=args.base_url, debug=args.debug, scheduler=scheduler))
+
+
+if __name__ == "__main__":
+    main()